@@ -0,0 +1,49 @@
+"""Report how long each phase of NewsNet startup takes.
+
+Usage: python benchmarks/startup.py [--models]
+
+With --models, also times the first load of every registered model.
+Set QT_QPA_PLATFORM=offscreen to run without a display.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+timings = []
+
+
+def phase(name, func):
+    start = time.perf_counter()
+    result = func()
+    timings.append((name, time.perf_counter() - start))
+    return result
+
+
+def main():
+    phase("import PyQt5", lambda: __import__("PyQt5.QtWidgets"))
+    phase("import QtWebEngine", lambda: __import__("PyQt5.QtWebEngineWidgets"))
+    phase("import matplotlib", lambda: __import__("matplotlib.backends.backend_qt5agg"))
+    codebase = phase("import codebase", lambda: __import__("codebase"))
+
+    from PyQt5.QtWidgets import QApplication
+    app = phase("create QApplication", lambda: QApplication(sys.argv))
+    window = phase("create MainWindow", codebase.MainWindow)
+    phase("show MainWindow", lambda: (window.show(), app.processEvents()))
+    startup_total = sum(seconds for _, seconds in timings)
+
+    if "--models" in sys.argv:
+        from models import registry
+        for name in ["stopwords", "word_tokenize", "spacy", "sentiment", "summarizer"]:
+            phase(f"load model: {name}", lambda name=name: registry.get(name))
+
+    width = max(len(name) for name, _ in timings)
+    for name, seconds in timings:
+        print(f"{name:<{width}}  {seconds * 1000:10.1f} ms")
+    print(f"{'startup total':<{width}}  {startup_total * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Compare LSH story matching against the old pairwise comparison.
+
+Usage: python benchmarks/story_matching.py [--sizes 1000,10000,100000] [--max-pairwise 10000]
+
+Headlines are synthetic: random words plus perturbed copies of shared stories spread
+across six sources. Pairwise timings above --max-pairwise headlines are extrapolated
+quadratically from the largest measured size instead of being run.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stories import find_shared_stories, find_shared_stories_pairwise
+
+SOURCES = ["Fox News", "Philstar", "Manila Times", "Rappler", "GMA News", "CNN News"]
+COMMON_WORDS = ["the", "a", "to", "in", "of", "for", "on", "and", "with", "after"]
+
+
+def make_headlines(total, vocabulary_size=20000, shared_fraction=0.1, seed=7):
+    generator = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(vocabulary_size)]
+
+    def headline():
+        words = generator.sample(vocabulary, generator.randint(6, 10))
+        words += generator.sample(COMMON_WORDS, 3)
+        generator.shuffle(words)
+        return words
+
+    content = {source: [] for source in SOURCES}
+    per_source = total // len(SOURCES)
+    shared_stories = [headline() for _ in range(int(per_source * shared_fraction))]
+    for source in SOURCES:
+        for story in shared_stories:
+            words = list(story)
+            words[generator.randrange(len(words))] = generator.choice(vocabulary)  # Reword slightly
+            content[source].append(" ".join(words))
+        while len(content[source]) < per_source:
+            content[source].append(" ".join(headline()))
+    return content
+
+
+def old_pairwise(content):
+    """The original nested loop with the fixed 4-common-words rule."""
+    sources = list(content)
+    matches = 0
+    for i, source1 in enumerate(sources):
+        for source2 in sources[i + 1:]:
+            for article1 in content[source1]:
+                for article2 in content[source2]:
+                    if len(set(article1.lower().split()) & set(article2.lower().split())) >= 4:
+                        matches += 1
+    return matches
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--max-pairwise", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'headlines':>10} {'old pairwise':>14} {'exact jaccard':>14} {'lsh':>10} {'speed-up':>9} {'recall':>7}")
+    measured = None  # (size, old seconds, exact seconds) of the largest pairwise run
+    for size in [int(value) for value in args.sizes.split(",")]:
+        content = make_headlines(size)
+        lsh_matches, lsh_seconds = timed(find_shared_stories, content)
+
+        if size <= args.max_pairwise:
+            _, old_seconds = timed(old_pairwise, content)
+            exact_matches, exact_seconds = timed(find_shared_stories_pairwise, content)
+            recall = len(set(lsh_matches) & set(exact_matches)) / max(len(exact_matches), 1)
+            measured = (size, old_seconds, exact_seconds)
+            marker, recall_text = "", f"{recall:7.3f}"
+        else:
+            scale = (size / measured[0]) ** 2
+            old_seconds, exact_seconds = measured[1] * scale, measured[2] * scale
+            marker, recall_text = "~", "    n/a"
+
+        old_text = f"{marker}{old_seconds:.2f}s"
+        exact_text = f"{marker}{exact_seconds:.2f}s"
+        print(f"{size:>10} {old_text:>14} {exact_text:>14} {lsh_seconds:>9.2f}s "
+              f"{old_seconds / lsh_seconds:>8.1f}x {recall_text}")
+
+
+if __name__ == "__main__":
+    main()
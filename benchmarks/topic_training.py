@@ -0,0 +1,71 @@
+"""Compare LdaModel with LdaMulticore on headline-sized documents, to place LDA_MULTICORE_MIN_DOCS.
+
+Usage: python benchmarks/topic_training.py [--sizes 200,1000,2000,5000,20000] [--passes 15] [--workers 3]
+
+Documents are synthetic headlines: 6-10 content words drawn from a Zipf-like vocabulary.
+Both backends run every pass (no early stop), so the columns compare the same work.
+LdaMulticore pays a fixed cost to start its worker pool and then splits each pass
+across the workers; the speed-up column shows where that cost is paid back.
+
+LdaMulticore hands each worker whole chunks of 2000 documents (gensim's default
+chunksize), so a corpus of one chunk trains on a single worker whatever the CPU count.
+Results on a 1-CPU machine (3 workers, 15 passes, 5 topics):
+
+     documents   LdaModel  LdaMulticore  speed-up
+           200      1.08s         1.82s     0.59x
+          1000      5.63s         9.33s     0.60x
+          2000     12.01s        19.19s     0.63x
+          5000     17.45s        27.97s     0.62x
+         20000     58.31s       114.33s     0.51x
+
+Up to 2000 documents the multicore run is serial by construction, so its 1.6x cost
+over LdaModel is the pool's overhead on any machine. Larger corpora only parallelise
+with free CPUs, so those rows on a 1-CPU machine show contention, not the speed-up.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gensim.corpora.dictionary import Dictionary
+from gensim.models import LdaModel, LdaMulticore
+
+
+def make_texts(total, vocabulary_size=5000, seed=7):
+    generator = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(vocabulary_size)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary_size)]
+    return [generator.choices(vocabulary, weights, k=generator.randint(6, 10)) for _ in range(total)]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="200,1000,2000,5000,20000")
+    parser.add_argument("--passes", type=int, default=15)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) - 1))
+    parser.add_argument("--topics", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.workers} workers, {args.passes} passes, {args.topics} topics")
+    print(f"{'documents':>10} {'LdaModel':>10} {'LdaMulticore':>13} {'speed-up':>9}")
+    for size in [int(value) for value in args.sizes.split(",")]:
+        texts = make_texts(size)
+        dictionary = Dictionary(texts)
+        corpus = [dictionary.doc2bow(text) for text in texts]
+        single = timed(LdaModel, corpus, num_topics=args.topics, id2word=dictionary, passes=args.passes)
+        multi = timed(LdaMulticore, corpus, num_topics=args.topics, id2word=dictionary, passes=args.passes,
+                      workers=args.workers)
+        print(f"{size:>10} {single:>9.2f}s {multi:>12.2f}s {single / multi:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
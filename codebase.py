@@ -1,174 +1,47 @@
 import sys
-import csv
-import json
-import re
 import time
+from array import array
+from bisect import bisect_left, bisect_right
 import networkx as nx
-import spacy
-import requests
-from datetime import datetime
+import numpy as np
+from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
-from transformers import pipeline
-from bs4 import BeautifulSoup
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QTextEdit, QCheckBox, QLabel, QDialog,
-    QLineEdit, QTabWidget, QGroupBox, QComboBox, QListWidget, QFileDialog, QListWidgetItem, QProgressBar, QApplication
+    QLineEdit, QTabWidget, QGroupBox, QComboBox, QListView, QFileDialog, QProgressBar, QApplication
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QAbstractListModel, QAbstractProxyModel, QModelIndex
+from PyQt5.QtGui import QFont, QBrush
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from datetime import datetime
-from gensim.corpora.dictionary import Dictionary
-from gensim.models import LdaModel
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-import nltk
-
-nltk.download('punkt')
-nltk.download('stopwords')
-nlp = spacy.load("en_core_web_md")
-summarizer = pipeline("summarization", clean_up_tokenization_spaces=True)
-
-# Load topic labels from a JSON file
-with open("topic_labels.json", "r") as file:
-    TOPIC_LABELS = json.load(file)
-     
-SOURCE_COLORS = {
-            "Fox News": "#FF9999",
-            "Philstar": "#99CCFF",
-            "Manila Times": "#99FF99",
-            "Rappler": "#FFCC99",
-            "GMA News": "#FF99FF",
-            "CNN News": "#CC9966"
-        }
-
-def categorize_topic_dynamic(keywords):
-        """Categorize a topic using semantic similarity with spaCy."""
-        best_label = "Miscellaneous"  # Default label if no match is found
-        highest_similarity = 0
-        
-        for label, keyword_list in TOPIC_LABELS.items():
-            label_doc = nlp(" ".join(keyword_list))  # Combine label keywords into a single text
-            for keyword in keywords:
-                keyword_doc = nlp(keyword)
-                similarity = label_doc.similarity(keyword_doc)
-                if similarity > highest_similarity:
-                    highest_similarity = similarity
-                    best_label = label
-        return best_label
-    
-# Scraping functions
-def scrape_foxnews():
-    url = "https://www.foxnews.com/"
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.content, 'html.parser')
-    return [h3.get_text(strip=True) for h3 in soup.find_all('h3')]
-
-def scrape_philstar():
-    url = "https://www.philstar.com/"
-    max_retries = 3  # Maximum number of retries
-    retry_delay = 2  # Delay between retries in seconds
-
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Remove the specific "Forex & Stocks" sections
-            unwanted_sections = soup.find_all("div", class_="ribbon_section news_featured")
-            for section in unwanted_sections:
-                if "Forex" in section.get_text():
-                    # Remove the entire parent ribbon div containing the Forex section
-                    section.find_parent("div", class_="ribbon").decompose()
-
-            # Remove the newsletter signup content section by ID
-            newsletter_signup = soup.find("div", id="newsletter-signup_content")
-            if newsletter_signup:
-                newsletter_signup.decompose()
-
-            lotto = soup.find("div", id="lotto_past")
-            if lotto:
-                lotto.decompose()
-
-            # Extract and return the text of all <h2> elements
-            return [h2.get_text(strip=True) for h2 in soup.find_all('h2')]
-
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                print(f"Attempt {attempt + 1} failed. Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-            else:
-                raise Exception(f"Failed to scrape Philstar after {max_retries} attempts. Error: {e}")
-
-def scrape_manilaTimes():
-    url = "https://www.manilatimes.net"
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.content, 'html.parser')
-    headline_classes = ['article-title-h1', 'article-title-h4', 'article-title-h5']
-    headlines = []
-    for class_name in headline_classes:
-        headlines.extend([div.get_text(strip=True) for div in soup.find_all('div', class_=class_name)])
-    return headlines
-
-def scrape_rappler():
-    url = "https://www.rappler.com"
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.content, 'html.parser')
-    return [h3.get_text(strip=True) for h3 in soup.find_all('h3')]
-
-def scrape_gma():
-    url = "https://www.gmanetwork.com/news/"
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.content, 'html.parser')
-
-    # Locate the JavaScript block containing the JSON data
-    script_tag = soup.find("script", string=re.compile("GLOBAL_SSR_ROBOT_JUST_IN_JSON"))
-    if not script_tag:
-        return []
-
-    # Extract the JSON data using regex
-    json_match = re.search(r"GLOBAL_SSR_ROBOT_JUST_IN_JSON\s*=\s*(\[.*?\]);", script_tag.string)
-    if not json_match:
-        return []
-
-    # Parse the JSON data
-    news_data = json.loads(json_match.group(1))
-
-    # Filter articles for today's date
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    todays_articles = [
-        item["title"]
-        for item in news_data if item["published_date"] == current_date
-    ]
-    
-    if not todays_articles:
-        return f"No articles available for {current_date}. This might happen if the day has just started or no new articles are published yet."
-
-    return todays_articles
-
-def scrape_cnn():
-    url = "https://www.cnn.com/"
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.content, 'html.parser')
-
-    # Find all <span> elements with the class 'container__headline-text'
-    headlines = [
-        span.get_text(strip=True) 
-        for span in soup.find_all('span', class_='container__headline-text')
-        if 'headline' in span.attrs.get('data-editable', '')
-    ]
-
-    return headlines
+from matplotlib.collections import LineCollection
+from scraping import ScrapeEngine
+from sources import SCRAPERS, SOURCE_COLORS
+from models import registry, WARM_UP_MODELS
+from topics import topic_model_cache, label_topics, describe_topic_run
+from sentiment import sentiment_service
+from search import HeadlineIndex, SemanticIndex
+from network import StoryNetwork, PointGrid
+from report import report_builder
+from store import ArticleStore
+from export import EXPORT_FORMATS, export_format, export_rows, export_to_file
+from utils import content_hash
+from tasks import TaskCancelled, task_manager
+from trends import annotate_pending, load_trends
+
+# Analysis windows offered in the main window; None means the latest scrape only
+ANALYSIS_WINDOWS = {
+    "Current Scrape": None,
+    "Last 24 Hours": timedelta(days=1),
+    "Last 7 Days": timedelta(days=7),
+    "Last 30 Days": timedelta(days=30),
+}
+
+SEARCH_DEBOUNCE_MS = 150  # Pause in typing before the search filters run
+SEMANTIC_SEARCH_RESULTS = 100  # Best matches listed per tab when searching by meaning
+TREND_PERIODS = {"Last 7 Days": 7, "Last 30 Days": 30, "Last 90 Days": 90}
+HOVER_RADIUS_PX = 10  # How close (in pixels, on each axis) the mouse must be to a node to show its title
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -250,13 +123,8 @@ class MainWindow(QMainWindow):
         # Website Selection Area
         self.website_groupbox = QGroupBox("Websites to Scrape")
         website_layout = QHBoxLayout()
-        self.checkbox_foxnews = QCheckBox("Fox News")
-        self.checkbox_philstar = QCheckBox("Philstar")
-        self.checkbox_manilaTimes = QCheckBox("Manila Times")
-        self.checkbox_rappler = QCheckBox("Rappler")
-        self.checkbox_gma = QCheckBox("GMA News")
-        self.checkbox_cnn = QCheckBox("CNN News")
-        for checkbox in [self.checkbox_foxnews, self.checkbox_philstar, self.checkbox_manilaTimes, self.checkbox_rappler, self.checkbox_gma, self.checkbox_cnn]:
+        self.source_checkboxes = {name: QCheckBox(name) for name in SCRAPERS}
+        for checkbox in self.source_checkboxes.values():
             checkbox.setStyleSheet("font-size: 14px; color: #333333;")
             website_layout.addWidget(checkbox)
         self.website_groupbox.setLayout(website_layout)
@@ -287,12 +155,20 @@ class MainWindow(QMainWindow):
         self.generate_report_button.clicked.connect(self.generate_report)
         self.export_data_button = QPushButton("💾 Export Data")
         self.export_data_button.clicked.connect(self.export_data)
+        self.show_trends_button = QPushButton("📈 Show Trends")
+        self.show_trends_button.clicked.connect(self.show_trends)
 
         self.analysis_operations_layout.addWidget(self.view_aggregated_button)
         self.analysis_operations_layout.addWidget(self.visualize_network_button)
         self.analysis_operations_layout.addWidget(self.analyze_topics_button)
         self.analysis_operations_layout.addWidget(self.generate_report_button)
         self.analysis_operations_layout.addWidget(self.export_data_button)
+        self.analysis_operations_layout.addWidget(self.show_trends_button)
+
+        # Time window the analyses run over: the latest scrape or the stored history
+        self.analysis_window_dropdown = QComboBox()
+        self.analysis_window_dropdown.addItems(ANALYSIS_WINDOWS.keys())
+        self.analysis_operations_layout.addWidget(self.analysis_window_dropdown)
         self.analysis_operations_group.setLayout(self.analysis_operations_layout)
         self.main_layout.addWidget(self.analysis_operations_group)
 
@@ -305,170 +181,193 @@ class MainWindow(QMainWindow):
         # State tracking
         self.all_selected = False
         self.scraped_content = {}
-        
-    def preprocess_articles(self, articles):
-        """Preprocess articles for topic modeling."""
-        import nltk
-        from nltk.corpus import stopwords
-        from nltk.tokenize import word_tokenize
-
-        # Download necessary NLTK data
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-
-        stop_words = set(stopwords.words('english'))
-        processed_articles = []
-        for article in articles:
-            tokens = word_tokenize(article.lower())  # Tokenize and lowercase
-            tokens = [word for word in tokens if word.isalnum() and word not in stop_words]
-            processed_articles.append(tokens)
-        return processed_articles
-
+        self.scrape_started_at = time.time()
+        self.article_store = ArticleStore()
+        self.story_network = StoryNetwork()
+        self.trend_update_task = None  # Rollup update started after the last scrape, while it runs
 
     def toggle_select_all(self):
         """Toggle all checkboxes."""
         self.all_selected = not self.all_selected
         state = self.all_selected
-        for checkbox in [self.checkbox_foxnews, self.checkbox_philstar, self.checkbox_manilaTimes, self.checkbox_rappler, self.checkbox_gma, self.checkbox_cnn]:
+        for checkbox in self.source_checkboxes.values():
             checkbox.setChecked(state)
         self.check_all_button.setText("Unselect All Websites" if state else "Select All Websites")
 
     def scrape_websites(self):
         """Scrape selected websites and display results."""
         self.results_display.clear()
-        if not any([
-            self.checkbox_foxnews.isChecked(),
-            self.checkbox_philstar.isChecked(),
-            self.checkbox_manilaTimes.isChecked(),
-            self.checkbox_rappler.isChecked(),
-            self.checkbox_gma.isChecked(),
-            self.checkbox_cnn.isChecked()
-        ]):
+        selected = [(name, SCRAPERS[name]) for name, checkbox in self.source_checkboxes.items() if checkbox.isChecked()]
+        if not selected:
             self.results_display.append("<b>Error:</b> No website selected. Please choose a website.")
             return
 
         # Show the loading dialog
-        loading_dialog = LoadingDialog("Scraping websites...", self)
-        loading_dialog.show()
-        QApplication.processEvents()  # Allow the dialog to update
-        
-        self.scraped_content = {}
-        websites = [
-            ("Fox News", self.checkbox_foxnews.isChecked(), scrape_foxnews),
-            ("Philstar", self.checkbox_philstar.isChecked(), scrape_philstar),
-            ("Manila Times", self.checkbox_manilaTimes.isChecked(), scrape_manilaTimes),
-            ("Rappler", self.checkbox_rappler.isChecked(), scrape_rappler),
-            ("GMA News", self.checkbox_gma.isChecked(), scrape_gma),
-            ("CNN News", self.checkbox_cnn.isChecked(), scrape_cnn)
-        ]
+        self.loading_dialog = LoadingDialog("Scraping websites...", self, cancellable=True)
+        self.loading_dialog.set_total(len(selected))
+        self.loading_dialog.show()
 
+        self.scraped_content = {}
+        self.scrape_started_at = time.time()
+        self.scrape_button.setEnabled(False)
         self.results_display.append(f"<b>Scraping articles...</b>")
 
-        try:
-            for name, is_checked, scraper in websites:
-                if is_checked:
-                    # Update the dialog message for each website
-                    loading_dialog.update_message(f"Scraping {name}...")
-                    QApplication.processEvents()  # Update the dialog
-                    
-                    try:
-                        self.scraped_content[name] = scraper()
-                        self.results_display.append(f"{name}: {len(self.scraped_content[name])} articles scraped.")
-                    except Exception as e:
-                        self.results_display.append(f"{name}: Failed to scrape. ({str(e)})")
-        finally:
-            # Close the loading dialog when scraping is complete
-            loading_dialog.close()
-
-        self.results_display.append("\n<b>Scraping complete.</b>")
+        # Fetch all selected sources concurrently, off the GUI thread
+        self.scrape_task = task_manager.submit(
+            scrape_task, selected, self.article_store,
+            on_partial=self.on_source_scraped,
+            on_progress=self.loading_dialog.set_progress,
+            on_result=self.on_scraping_finished,
+            on_failed=self.on_scraping_failed,
+            on_cancelled=self.on_scraping_cancelled
+        )
+        self.loading_dialog.cancelled.connect(self.scrape_task.cancel)
+
+    def on_source_scraped(self, outcome):
+        """Store and report one source's articles (or its error) as soon as it finishes."""
+        name, articles, new_count, error = outcome
+        if error is not None:
+            self.results_display.append(f"{name}: Failed to scrape. ({error})")
+            return
+        self.scraped_content[name] = articles
+        self.results_display.append(f"{name}: {len(articles)} articles scraped ({new_count} new).")
+
+    def on_scraping_finished(self, elapsed):
+        """Close the loading dialog once every selected source has finished."""
+        self.loading_dialog.close()
+        self.scrape_button.setEnabled(True)
+        self.results_display.append(f"\n<b>Scraping complete.</b> ({elapsed:.1f}s)")
+        self.update_trend_rollups()
+
+    def update_trend_rollups(self):
+        """Add the sentiment and topics of newly stored headlines to the trend rollups in the background."""
+        if self.trend_update_task is not None:
+            return  # The running update picks up these headlines too
+        self.trend_update_task = task_manager.submit(
+            annotate_task, self.article_store,
+            on_failed=lambda error: self.results_display.append(f"<b>Error:</b> Failed to update trends. ({error})")
+        )
+        self.trend_update_task.signals.finished.connect(self.on_trend_update_finished)
+
+    def on_trend_update_finished(self):
+        self.trend_update_task = None
+
+    def on_scraping_failed(self, error):
+        self.loading_dialog.close()
+        self.scrape_button.setEnabled(True)
+        self.results_display.append(f"\n<b>Error:</b> Scraping failed. ({error})")
+
+    def on_scraping_cancelled(self):
+        """Restore the window after a cancelled scrape; sources that finished before it stay listed.
+
+        Their new headlines are added to the trend rollups by the next update.
+        """
+        self.loading_dialog.close()
+        self.scrape_button.setEnabled(True)
+        self.results_display.append("\n<b>Scraping canceled.</b>")
+
+    def with_analysis_content(self, action):
+        """Call action({source: [articles]}) with the content of the selected analysis window.
+
+        A stored window is loaded from the article store in the background, behind a loading dialog.
+        """
+        window = ANALYSIS_WINDOWS[self.analysis_window_dropdown.currentText()]
+        if window is None:
+            action(self.scraped_content)
+            return
+
+        self.window_dialog = LoadingDialog("Loading stored headlines...", self)
+        self.window_dialog.show()
+
+        def on_loaded(content):
+            self.window_dialog.close()
+            action(content)
+
+        def on_failed(error):
+            self.window_dialog.close()
+            self.results_display.append(f"<b>Error:</b> Failed to load stored headlines. ({error})")
+
+        self.window_task = task_manager.submit(
+            load_window_task, self.article_store, time.time() - window.total_seconds(),
+            on_result=on_loaded, on_failed=on_failed
+        )
 
     def visualize_network(self):
         """Visualize the network of common articles across news sources."""
-        if not self.scraped_content:
+        self.with_analysis_content(self.open_network_dialog)
+
+    def open_network_dialog(self, content):
+        if not content:
             self.results_display.append("<b>Error:</b> No content to visualize. Scrape websites first.")
             return
 
         # Open the VisualizeNetworkDialog
-        dialog = VisualizeNetworkDialog(self.scraped_content, self)
+        dialog = VisualizeNetworkDialog(content, self, network=self.story_network)
         dialog.exec_()
 
     def analyze_topics(self):
         """Analyze topics from aggregated articles using LDA and dynamic matching."""
-        if not self.scraped_content:
+        self.with_analysis_content(self.open_topic_dialog)
+
+    def open_topic_dialog(self, content):
+        if not content:
             self.results_display.append("<b>Error:</b> No content to analyze. Scrape websites first.")
             return
 
         # Open dynamic dialog for topic analysis
-        dialog = TopicAnalysisDialog(self.scraped_content, self)
+        dialog = TopicAnalysisDialog(content, self)
+        dialog.exec_()
+
+    def show_trends(self):
+        """Chart headline volume, sentiment and topic share over the stored scrape history."""
+        dialog = TrendsDialog(self.article_store, self, pending_update=self.trend_update_task)
         dialog.exec_()
 
     def generate_report(self):
         """Generate a detailed, printable report and preview it in a dialog."""
         self.results_display.clear()
+        self.report_dialog = None
+        self.with_analysis_content(self.start_report)
 
-        if not self.scraped_content:
+    def start_report(self, content):
+        self.report_content = content
+        if not self.report_content:
             self.results_display.append("<b>Error:</b> No content available to generate a report. Scrape websites first.")
             return
 
         self.results_display.append("<b>Generating report...</b>")
 
-        # Create a base HTML template for the report
-        report_html = [
-            "<html>",
-            "<head>",
-            "<style>",
-            "body { font-family: Arial, sans-serif; margin: 20px; }",
-            "h1, h2, h3 { color: #2c3e50; }",
-            "table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }",
-            "table, th, td { border: 1px solid #ddd; }",
-            "th, td { padding: 8px; text-align: left; }",
-            "th { background-color: #f4f4f4; }",
-            ".section { margin-bottom: 30px; }",
-            "</style>",
-            "</head>",
-            "<body>",
-        ]
-
-        # Report Header
-        current_date = datetime.now().strftime("%B %d, %Y")
-        report_html.append(f"<h1>News Analysis Report</h1>")
-        report_html.append(f"<p><b>Date:</b> {current_date}</p>")
-
-        # Aggregated Scrape Count
-        total_articles = sum(len(articles) for articles in self.scraped_content.values())
-        report_html.append(f"<div class='section'><h2>Aggregated Scrape Count</h2>")
-        report_html.append(f"<p>Total Articles Scraped: <b>{total_articles}</b></p></div>")
-
-        # Scraped Content Summary by Source
-        report_html.append("<div class='section'><h2>Scraped Content Summary</h2>")
-        report_html.append("<table><tr><th>Source</th><th>Articles Scraped</th></tr>")
-        for source, articles in self.scraped_content.items():
-            report_html.append(f"<tr><td>{source}</td><td>{len(articles)}</td></tr>")
-        report_html.append("</table></div>")
-
-        # Topic Modeling Summary
-        report_html.append("<div class='section'><h2>Topic Analysis</h2>")
-        combined_articles = [article for articles in self.scraped_content.values() for article in articles]
-        if combined_articles:
-            processed_articles = self.preprocess_articles(combined_articles)
-            dictionary = Dictionary(processed_articles)
-            corpus = [dictionary.doc2bow(text) for text in processed_articles]
-            lda_model = LdaModel(corpus, num_topics=5, id2word=dictionary, passes=15)
-
-            # Include top topics
-            topics = lda_model.show_topics(num_topics=5, num_words=5, formatted=False)
-            report_html.append("<ul>")
-            for idx, topic in topics:
-                keywords = ", ".join([word for word, _ in topic])
-                report_html.append(f"<li><b>Topic {idx + 1}:</b> {keywords}</li>")
-            report_html.append("</ul>")
-        else:
-            report_html.append("<p>No articles available for topic analysis.</p>")
-        report_html.append("</div>")
+        # Build the sections whose inputs changed off the GUI thread; the rest come from the section cache.
+        # The page itself is not cached by key, since it carries the date it was generated on.
+        self.generate_report_button.setEnabled(False)
+        self.report_dialog = LoadingDialog("Generating report...", self, cancellable=True)
+        self.report_dialog.show()
+        self.report_task = task_manager.submit(
+            report_task, self.report_content,
+            on_progress=self.report_dialog.set_progress,
+            on_result=self.build_report,
+            on_failed=self.on_report_failed,
+            on_cancelled=self.on_report_cancelled
+        )
+        self.report_dialog.cancelled.connect(self.report_task.cancel)
+
+    def close_report_dialog(self):
+        self.generate_report_button.setEnabled(True)
+        if self.report_dialog is not None:
+            self.report_dialog.close()
+            self.report_dialog = None
+
+    def on_report_failed(self, error):
+        self.close_report_dialog()
+        self.results_display.append(f"<b>Error:</b> Failed to generate report. ({error})")
+
+    def on_report_cancelled(self):
+        self.close_report_dialog()
+        self.results_display.append("<b>Report canceled.</b>")
 
-        # Close HTML
-        report_html.append("</body></html>")
-        report_html = "\n".join(report_html)
+    def build_report(self, report_html):
+        """Preview the finished report in a dialog."""
+        self.close_report_dialog()
 
         # Open the ReportPreviewDialog
         dialog = ReportPreviewDialog(report_html, self)
@@ -476,10 +375,25 @@ class MainWindow(QMainWindow):
 
         self.results_display.append("<b>Report preview loaded successfully!</b>")
 
+    def export_records(self):
+        """Return (records, total) for the selected analysis window, streamed from the article store.
+
+        Records from the store carry the sentiment and topic stored for them, if any.
+        """
+        window = ANALYSIS_WINDOWS[self.analysis_window_dropdown.currentText()]
+        if window is None:
+            scraped_at = self.scrape_started_at
+            records = (
+                (source, article, content_hash(article), scraped_at, scraped_at, None, None)
+                for source, articles in self.scraped_content.items() for article in articles
+            )
+            return records, sum(len(articles) for articles in self.scraped_content.values())
+        start = time.time() - window.total_seconds()
+        return self.article_store.iter_articles(start=start, annotations=True), self.article_store.count(start=start)
 
     def export_data(self):
-        """Export scraped data to JSON or CSV."""
-        if not self.scraped_content:
+        """Export articles with sentiment, topic and timestamp columns in a background worker."""
+        if not self.scraped_content and ANALYSIS_WINDOWS[self.analysis_window_dropdown.currentText()] is None:
             self.results_display.append("<b>Error:</b> No data available to export. Scrape websites first.")
             return
 
@@ -489,47 +403,185 @@ class MainWindow(QMainWindow):
 
         # Open a file dialog for the user to choose the save location
         options = QFileDialog.Options()
-        file_path, _ = QFileDialog.getSaveFileName(
+        file_filters = {
+            f"{description} (*{extension})": extension for extension, description in EXPORT_FORMATS.items()
+        }
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Export Data",
             default_file_name,  # Set the default file name here
-            "JSON Files (*.json);;CSV Files (*.csv)",
+            ";;".join(file_filters),
             options=options
         )
 
         if not file_path:
             self.results_display.append("<b>Export canceled:</b> No file selected.")
             return
+        if export_format(file_path) is None:
+            file_path += file_filters.get(selected_filter, ".jsonl")
+
+        records, total = self.export_records()
+        self.export_dialog = LoadingDialog("Exporting data...", self, cancellable=True)
+        self.export_dialog.set_total(total)
+        self.export_dialog.show()
+
+        self.export_task = task_manager.submit(
+            export_task, records, file_path, total,
+            on_progress=self.export_dialog.set_progress,
+            on_result=self.on_export_finished,
+            on_failed=self.on_export_failed,
+            on_cancelled=self.on_export_cancelled
+        )
+        self.export_dialog.cancelled.connect(self.export_task.cancel)
 
-        try:
-            if file_path.endswith(".json"):
-                # Save as JSON
-                with open(file_path, "w", encoding="utf-8") as file:
-                    json.dump(self.scraped_content, file, indent=4, ensure_ascii=False)
-                self.results_display.append(f"<b>Success:</b> Data exported to {file_path}")
-            elif file_path.endswith(".csv"):
-                # Save as CSV
-                with open(file_path, "w", newline="", encoding="utf-8") as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["Source", "Article"])
-                    for source, articles in self.scraped_content.items():
-                        for article in articles:
-                            writer.writerow([source, article])
-                self.results_display.append(f"<b>Success:</b> Data exported to {file_path}")
-            else:
-                self.results_display.append("<b>Error:</b> Unsupported file format.")
-        except Exception as e:
-            self.results_display.append(f"<b>Error:</b> Failed to export data. ({str(e)})")
+    def on_export_finished(self, result):
+        file_path, written, cancelled = result
+        self.export_dialog.close()
+        if cancelled:
+            self.results_display.append("<b>Export canceled.</b>")
+        else:
+            self.results_display.append(f"<b>Success:</b> {written} rows exported to {file_path}")
+
+    def on_export_failed(self, error):
+        self.export_dialog.close()
+        self.results_display.append(f"<b>Error:</b> Failed to export data. ({error})")
+
+    def on_export_cancelled(self):
+        self.export_dialog.close()
+        self.results_display.append("<b>Export canceled.</b>")
 
     def view_aggregated_content(self):
             """Display aggregated articles."""
-            if not self.scraped_content:
+            self.with_analysis_content(self.open_aggregated_news)
+
+    def open_aggregated_news(self, content):
+            if not content:
                 self.results_display.append("<b>Error:</b> No content to display. Scrape websites first.")
                 return
 
-            dialog = AggregatedNews("Aggregated Articles", self.scraped_content, self)
+            dialog = AggregatedNews("Aggregated Articles", content, self)
             dialog.exec_()
 
+SENTIMENT_CODES = {"positive": 1, "negative": -1}
+
+class ArticleListModel(QAbstractListModel):
+    """Read-only model over the aggregated headlines and their sentiment codes."""
+    SentimentRole = Qt.UserRole + 1
+
+    def __init__(self, articles, sentiments, parent=None):
+        super().__init__(parent)
+        self.articles = articles
+        # Compact per-row sentiment: 1 positive, -1 negative, 0 unknown
+        self.sentiments = array('b', (SENTIMENT_CODES.get(label, 0) for label in sentiments))
+        self.bold_font = QFont()
+        self.bold_font.setBold(True)
+        self.foregrounds = {1: QBrush(Qt.darkGreen), -1: QBrush(Qt.red)}
+
+    def set_sentiments(self, sentiments):
+        """Replace every row's sentiment label and repaint the rows."""
+        self.sentiments = array('b', (SENTIMENT_CODES.get(label, 0) for label in sentiments))
+        if self.articles:
+            self.dataChanged.emit(self.index(0), self.index(len(self.articles) - 1), [Qt.ForegroundRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.articles)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self.articles[row]
+        if role == Qt.ForegroundRole:
+            return self.foregrounds.get(self.sentiments[row])
+        if role == Qt.FontRole:
+            return self.bold_font
+        if role == self.SentimentRole:
+            return self.sentiments[row]
+        return None
+
+class ArticleFilterProxyModel(QAbstractProxyModel):
+    """Proxy exposing a precomputed subset of the article model's rows, sorted or ranked."""
+    PLACEHOLDER = "No articles match your query."
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = array('l')
+        self.positions = None  # source row -> proxy row, only for ranked rows
+
+    def setSourceModel(self, model):
+        if self.sourceModel() is not None:
+            self.sourceModel().dataChanged.disconnect(self.on_source_data_changed)
+        super().setSourceModel(model)
+        model.dataChanged.connect(self.on_source_data_changed)
+
+    def on_source_data_changed(self, top_left, bottom_right, roles=()):
+        """Repaint the visible rows among the source rows that changed."""
+        top, bottom = top_left.row(), bottom_right.row()
+        if self.positions is not None:
+            changed = [position for row, position in self.positions.items() if top <= row <= bottom]
+            if not changed:
+                return
+            first, last = min(changed), max(changed)
+        else:
+            first, last = bisect_left(self.rows, top), bisect_right(self.rows, bottom) - 1
+            if first > last:
+                return
+        self.dataChanged.emit(self.index(first, 0), self.index(last, 0), roles)
+
+    def set_rows(self, rows, ranked=False):
+        """Replace the visible rows with source row ids, in ascending order unless ranked."""
+        self.beginResetModel()
+        self.rows = array('l', rows)
+        self.positions = {row: position for position, row in enumerate(self.rows)} if ranked else None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows) or 1  # One placeholder row when nothing matches
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or column != 0 or not 0 <= row < self.rowCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or not self.rows:
+            return QModelIndex()
+        return self.sourceModel().index(self.rows[proxy_index.row()], 0)
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if self.positions is not None:
+            position = self.positions.get(source_index.row())
+            return self.index(position, 0) if position is not None else QModelIndex()
+        position = bisect_left(self.rows, source_index.row())
+        if position < len(self.rows) and self.rows[position] == source_index.row():
+            return self.index(position, 0)
+        return QModelIndex()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and not self.rows:
+            if role == Qt.DisplayRole:
+                return self.PLACEHOLDER
+            if role == Qt.ForegroundRole:
+                return QBrush(Qt.gray)
+            return None
+        return super().data(index, role)
+
+    def flags(self, index):
+        if not self.rows:
+            return Qt.NoItemFlags
+        return super().flags(index)
+
 class AggregatedNews(QDialog):
     def __init__(self, title, aggregated_content, parent=None):
         super().__init__(parent)
@@ -540,10 +592,6 @@ class AggregatedNews(QDialog):
         self.aggregated_content = aggregated_content
         self.layout = QVBoxLayout(self)
 
-        # Initialize sentiment analyzer and cache
-        self.sentiment_analyzer = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
-        self.sentiment_cache = {}  # Cache to store precomputed sentiment results
-
         # Store current search query and sentiment filter globally
         self.current_query = ""
         self.current_sentiment = "All"
@@ -552,9 +600,22 @@ class AggregatedNews(QDialog):
         search_layout = QHBoxLayout()
         self.search_field = QLineEdit()
         self.search_field.setPlaceholderText("Type to search articles...")
-        self.search_field.textChanged.connect(self.update_filters)  # Dynamic search
+        # Debounce typing so the filters run once the user pauses, not on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.update_filters)
+        self.search_field.textChanged.connect(self.search_timer.start)  # Dynamic search
         search_layout.addWidget(self.search_field)
+        # Words: every query word starts a headline word. Meaning: best matches by headline vectors.
+        self.search_mode = QComboBox()
+        self.search_mode.addItems(["Words", "Meaning"])
+        self.search_mode.currentTextChanged.connect(self.change_search_mode)
+        search_layout.addWidget(self.search_mode)
         self.layout.addLayout(search_layout)
+        self.search_status = QLabel()
+        self.search_status.hide()
+        self.layout.addWidget(self.search_status)
 
         # Sorting Dropdown
         sort_layout = QHBoxLayout()
@@ -578,127 +639,185 @@ class AggregatedNews(QDialog):
 
         # Tab view for content
         self.tabs = QTabWidget()
-        self.tabs.currentChanged.connect(self.refresh_current_tab)  # Refresh the tab when switching
 
-        # Create "All Articles" tab
-        self.all_articles_tab = QWidget()
-        self.all_articles_layout = QVBoxLayout(self.all_articles_tab)
-        self.all_articles_list = QListWidget()
-
-        # Combine all articles into one list
+        # Combine all articles into one list, remembering where each source's slice starts
         self.combined_articles = []
-        for articles in aggregated_content.values():
+        self.tab_ranges = {}
+        for source, articles in aggregated_content.items():
+            start = len(self.combined_articles)
             self.combined_articles.extend(articles)
+            self.tab_ranges[source] = (start, len(self.combined_articles))
+        self.tab_ranges["All Articles"] = (0, len(self.combined_articles))
+
+        # Token/prefix index for search, built in the background (tokenising a large window takes
+        # seconds); the search box is enabled once it is ready. Tabs are refiltered only once shown.
+        self.search_index = None
+        self.search_field.setEnabled(False)
+        self.search_field.setPlaceholderText("Indexing articles for search...")
+        self.search_index_task = task_manager.submit(
+            search_index_task, self.combined_articles, key=("search_index", articles_key(self.combined_articles)),
+            on_result=self.set_search_index,
+            on_failed=lambda error: self.search_field.setPlaceholderText(f"Search is unavailable. ({error})")
+        )
+        self.semantic_index = None  # Built in the background the first time meaning search is chosen
+        self.semantic_task = None
+        self.stale_tabs = set()
 
-        # Precompute sentiment for all articles
-        self.precompute_sentiments()
+        # One shared model over every article; each tab views it through its own filter proxy.
+        # Sentiment colors are filled in once the background scoring finishes.
+        self.article_model = ArticleListModel(self.combined_articles, [None] * len(self.combined_articles), self)
+        self.sentiment_ids = {"positive": [], "negative": []}
 
-        # Populate the "All Articles" list
-        self.populate_list_widget(self.all_articles_list, self.combined_articles)
+        # Create "All Articles" tab
+        self.all_articles_tab = QWidget()
+        self.all_articles_layout = QVBoxLayout(self.all_articles_tab)
+        self.tab_proxies = {}
+        self.all_articles_list = self.create_article_view("All Articles")
         self.all_articles_layout.addWidget(self.all_articles_list)
         self.tabs.addTab(self.all_articles_tab, "All Articles")
 
         # Add source-specific tabs
         self.source_displays = {}
-        for source, articles in aggregated_content.items():
+        for source in aggregated_content:
             tab = QWidget()
             tab_layout = QVBoxLayout(tab)
-            list_widget = QListWidget()
-            self.populate_list_widget(list_widget, articles)
-            tab_layout.addWidget(list_widget)
+            list_view = self.create_article_view(source)
+            tab_layout.addWidget(list_view)
             self.tabs.addTab(tab, source)
-            self.source_displays[source] = list_widget
+            self.source_displays[source] = list_view
+
+        self.tabs.currentChanged.connect(self.refresh_current_tab)  # Refresh the tab when switching
 
         # Add tabs to layout
         self.layout.addWidget(self.tabs)
 
-    def analyze_sentiment(self, text):
-        """Analyze sentiment using precomputed results."""
-        if text not in self.sentiment_cache:
-            result = self.sentiment_analyzer(text[:512])  # Truncate to DistilBERT max token length
-            label = result[0]['label']  # Positive or Negative
-            self.sentiment_cache[text] = "positive" if label == "POSITIVE" else "negative"
-        return self.sentiment_cache[text]
-
-    def precompute_sentiments(self):
-        """Precompute and cache sentiments for all articles."""
-        for article in self.combined_articles:
-            self.analyze_sentiment(article)
-
-    def populate_list_widget(self, list_widget, articles):
-        """Populate a QListWidget with a list of articles, color-coded by sentiment."""
-        list_widget.clear()
-        if not articles:
-            # Add placeholder for no results
-            placeholder_item = QListWidgetItem("No articles match your query.")
-            placeholder_item.setForeground(Qt.gray)
-            list_widget.addItem(placeholder_item)
-            return
-
-        for article in articles:
-            sentiment = self.analyze_sentiment(article)
-            item = QListWidgetItem(article)
-
-            # Set text color based on sentiment
-            if sentiment == "positive":
-                item.setForeground(Qt.darkGreen)
-            elif sentiment == "negative":
-                item.setForeground(Qt.red)
-
-            # Make text bold
-            font = QFont()
-            font.setBold(True)
-            item.setFont(font)
+        # Score sentiment for all articles in the background
+        self.sentiment_status = QLabel("Scoring sentiment...")
+        self.layout.addWidget(self.sentiment_status)
+        self.sentiment_task = task_manager.submit(
+            sentiment_task, self.combined_articles, key=("sentiment", articles_key(self.combined_articles)),
+            on_progress=lambda done, total, message: self.sentiment_status.setText(f"{message}: {done} of {total}"),
+            on_result=self.apply_sentiments,
+            on_failed=lambda error: self.sentiment_status.setText(f"Sentiment analysis failed. ({error})")
+        )
 
-            list_widget.addItem(item)
+    def done(self, result):
+        """Stop scoring sentiment for a dialog that is closing."""
+        self.sentiment_task.cancel()
+        self.search_index_task.cancel()
+        if self.semantic_task is not None:
+            self.semantic_task.cancel()
+        super().done(result)
+
+    def set_search_index(self, index):
+        self.search_index = index
+        self.search_field.setEnabled(True)
+        self.change_search_mode(self.search_mode.currentText())  # Restores the placeholder
+        self.search_field.setFocus()
+
+    def change_search_mode(self, mode):
+        """Switch between word and meaning search, indexing headline vectors on first use."""
+        if self.search_index is None:
+            return  # Still indexing; set_search_index applies the mode
+        if mode == "Meaning":
+            self.search_field.setPlaceholderText("Describe what you are looking for...")
+            if self.semantic_index is None and self.semantic_task is None:
+                self.search_status.setText("Indexing headlines for meaning search...")
+                self.search_status.show()
+                self.semantic_task = task_manager.submit(
+                    semantic_index_task, self.combined_articles,
+                    key=("semantic_index", articles_key(self.combined_articles)),
+                    on_result=self.set_semantic_index, on_failed=self.on_semantic_index_failed
+                )
+        else:
+            self.search_field.setPlaceholderText("Type to search articles...")
+        self.update_filters()
+
+    def set_semantic_index(self, index):
+        self.semantic_index = index
+        self.search_status.hide()
+        self.update_filters()
+
+    def on_semantic_index_failed(self, error):
+        self.semantic_task = None  # Choosing the mode again retries
+        self.search_status.setText(f"Meaning search is unavailable; searching by words. ({error})")
+
+    def apply_sentiments(self, labels):
+        """Color the articles by sentiment and index them for the sentiment filter."""
+        self.sentiment_status.hide()
+        self.article_model.set_sentiments([labels.get(article) for article in self.combined_articles])
+        # Sorted ids per sentiment, so a sentiment-only filter is a bisect and a slice
+        self.sentiment_ids = {"positive": [], "negative": []}
+        for article_id, code in enumerate(self.article_model.sentiments):
+            if code == SENTIMENT_CODES["positive"]:
+                self.sentiment_ids["positive"].append(article_id)
+            elif code == SENTIMENT_CODES["negative"]:
+                self.sentiment_ids["negative"].append(article_id)
+        if self.current_sentiment.lower() in self.sentiment_ids:
+            self.update_filters()
+
+    def create_article_view(self, tab_name):
+        """Create a list view showing one tab's slice of the shared article model."""
+        proxy = ArticleFilterProxyModel(self)
+        proxy.setSourceModel(self.article_model)
+        start, end = self.tab_ranges[tab_name]
+        proxy.set_rows(range(start, end))
+        self.tab_proxies[tab_name] = proxy
+
+        list_view = QListView()
+        list_view.setUniformItemSizes(True)  # Lets the view lay out rows without asking for each one
+        list_view.setModel(proxy)
+        return list_view
 
     def update_filters(self):
         """Update the search query and sentiment filter dynamically."""
         self.current_query = self.search_field.text().strip().lower()
         self.current_sentiment = self.sort_dropdown.currentText()
-        self.refresh_all_tabs()
+        # Only the visible tab is refiltered now; hidden tabs catch up when activated
+        self.stale_tabs = {self.tabs.tabText(index) for index in range(self.tabs.count())}
+        self.refresh_current_tab()
 
     def refresh_current_tab(self):
-        """Refresh the currently active tab based on the search query and sentiment filter."""
-        current_tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(current_tab_index)
-
-        if tab_name == "All Articles":
-            articles = self.combined_articles
-            list_widget = self.all_articles_list
-        else:
-            articles = self.aggregated_content.get(tab_name, [])
-            list_widget = self.source_displays.get(tab_name)
-
-        self.apply_filters_and_update(list_widget, articles)
-
-    def refresh_all_tabs(self):
-        """Refresh all tabs to reflect the search query and sentiment filter."""
-        for tab_index in range(self.tabs.count()):
-            tab_name = self.tabs.tabText(tab_index)
-            if tab_name == "All Articles":
-                articles = self.combined_articles
-                list_widget = self.all_articles_list
+        """Refresh the currently active tab if the filters changed since it was last shown."""
+        tab_name = self.tabs.tabText(self.tabs.currentIndex())
+        if tab_name not in self.stale_tabs:
+            return
+        self.stale_tabs.discard(tab_name)
+        self.apply_filters_and_update(tab_name)
+
+    def apply_filters_and_update(self, tab_name):
+        """Apply search and sentiment filters to a tab and hand the matching rows to its proxy."""
+        start, end = self.tab_ranges.get(tab_name, (0, 0))
+        sentiment = self.current_sentiment.lower()
+        sentiment_ids = self.sentiment_ids.get(sentiment)  # None for "All"
+
+        if self.current_query and self.search_mode.currentText() == "Meaning" and self.semantic_index is not None:
+            # Ranked matches: restrict the candidates to the tab and sentiment first, then take the best
+            if sentiment_ids is None:
+                candidates = range(start, end)
             else:
-                articles = self.aggregated_content.get(tab_name, [])
-                list_widget = self.source_displays.get(tab_name)
-
-            self.apply_filters_and_update(list_widget, articles)
-
-    def apply_filters_and_update(self, list_widget, articles):
-        """Apply search and sentiment filters to a given list and update the widget."""
-        # Apply sentiment filter
-        if self.current_sentiment != "All":
-            articles = [
-                article for article in articles
-                if self.analyze_sentiment(article) == self.current_sentiment.lower()
-            ]
+                candidates = sentiment_ids[bisect_left(sentiment_ids, start):bisect_left(sentiment_ids, end)]
+            article_ids = self.semantic_index.search(self.current_query, SEMANTIC_SEARCH_RESULTS, candidates)
+            self.tab_proxies[tab_name].set_rows(article_ids, ranked=True)
+            return
 
-        # Apply search query filter
-        if self.current_query:
-            articles = [article for article in articles if self.current_query in article.lower()]
+        # Apply search query filter through the index
+        matches = None
+        if self.current_query and self.search_index is not None:
+            matches = self.search_index.search(self.current_query)
+        if matches is None and sentiment_ids is None:
+            article_ids = range(start, end)
+        elif matches is None:
+            article_ids = sentiment_ids[bisect_left(sentiment_ids, start):bisect_left(sentiment_ids, end)]
+        else:
+            article_ids = [article_id for article_id in sorted(matches) if start <= article_id < end]
+            # Apply sentiment filter
+            if sentiment_ids is not None:
+                code = SENTIMENT_CODES[sentiment]
+                sentiments = self.article_model.sentiments
+                article_ids = [article_id for article_id in article_ids if sentiments[article_id] == code]
 
-        self.populate_list_widget(list_widget, articles)
+        self.tab_proxies[tab_name].set_rows(article_ids)
 
 class TopicAnalysisDialog(QDialog):
     def __init__(self, scraped_content, parent=None):
@@ -740,17 +859,14 @@ class TopicAnalysisDialog(QDialog):
         self.layout.addWidget(self.canvas)
 
         # Initial graph generation
+        self.topic_task = None
         self.update_graph()
 
-    def preprocess_articles(self, articles):
-        """Preprocess articles for topic modeling."""
-        stop_words = set(stopwords.words('english'))
-        processed_articles = []
-        for article in articles:
-            tokens = word_tokenize(article.lower())  # Tokenize and lowercase
-            tokens = [word for word in tokens if word.isalnum() and word not in stop_words]
-            processed_articles.append(tokens)
-        return processed_articles
+    def done(self, result):
+        """Stop any topic model still being trained for this dialog."""
+        if self.topic_task is not None:
+            self.topic_task.cancel()
+        super().done(result)
 
     def update_graph(self):
         """Update the bar graph dynamically based on the selected news source."""
@@ -772,26 +888,37 @@ class TopicAnalysisDialog(QDialog):
             self.canvas.draw()
             return
 
-        # Preprocess articles and perform topic modeling
-        processed_articles = self.preprocess_articles(combined_articles)
-        dictionary = Dictionary(processed_articles)
-        corpus = [dictionary.doc2bow(text) for text in processed_articles]
+        # Perform topic modeling off the GUI thread; cached models come back immediately
+        self.ax.clear()
+        self.ax.set_title(f"Modeling topics for {selected_source}...")
+        self.canvas.draw()
 
-        try:
-            lda_model = LdaModel(corpus, num_topics=5, id2word=dictionary, passes=15)
-        except Exception as e:
-            self.ax.clear()
-            self.ax.set_title(f"Error during topic modeling: {str(e)}")
-            self.canvas.draw()
+        if self.topic_task is not None:
+            self.topic_task.cancel()  # The previous source's model is no longer wanted
+        self.topic_task = task_manager.submit(
+            topic_model_task, combined_articles, key=("topics", articles_key(combined_articles)),
+            on_progress=lambda done, total, message: self.show_topic_progress(selected_source, message),
+            on_result=lambda result: self.draw_topics(selected_source, bar_color, *result),
+            on_failed=lambda error: self.show_topic_error(selected_source, error)
+        )
+
+    def show_topic_progress(self, source, message):
+        if source != self.source_dropdown.currentText():
             return
+        self.ax.set_title(f"Modeling topics for {source}... {message}")
+        self.canvas.draw_idle()
 
-        topics = lda_model.show_topics(num_topics=5, num_words=5, formatted=False)
-        labeled_topics = []
-        for idx, topic in topics:
-            keywords = [word for word, _ in topic]
-            label = categorize_topic_dynamic(keywords)
-            weight_sum = sum(weight for _, weight in topic)
-            labeled_topics.append((label, weight_sum, keywords))
+    def show_topic_error(self, source, error):
+        if source != self.source_dropdown.currentText():
+            return
+        self.ax.clear()
+        self.ax.set_title(f"Error during topic modeling: {error}")
+        self.canvas.draw()
+
+    def draw_topics(self, source, bar_color, labeled_topics, run):
+        """Draw the labelled topics, unless the user has since picked another source."""
+        if source != self.source_dropdown.currentText():
+            return
 
         self.ax.clear()
         topic_labels = [label for label, _, _ in labeled_topics]
@@ -799,19 +926,147 @@ class TopicAnalysisDialog(QDialog):
 
         # Draw the bar graph with the source-specific color
         self.ax.barh(topic_labels, weights, color=bar_color, align="center")
-        self.ax.set_xlabel("Weight")
-        self.ax.set_title(f"Top Topics for {selected_source}")
+        self.ax.set_xlabel(f"Weight\n{describe_topic_run(run)}")
+        self.ax.set_title(f"Top Topics for {source}")
         self.ax.invert_yaxis()
         self.canvas.draw()
 
+class TrendsDialog(QDialog):
+    """Trends over the scrape history, drawn from the article store's hourly or daily rollups."""
+
+    def __init__(self, article_store, parent=None, pending_update=None):
+        super().__init__(parent)
+        self.setWindowTitle("Trends")
+        self.resize(900, 800)
+        self.article_store = article_store
+
+        self.layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.period_dropdown = QComboBox()
+        self.period_dropdown.addItems(TREND_PERIODS.keys())
+        self.period_dropdown.setCurrentText("Last 30 Days")
+        self.granularity_dropdown = QComboBox()
+        self.granularity_dropdown.addItems(["Daily", "Hourly"])
+        self.source_dropdown = QComboBox()
+        self.source_dropdown.addItems(["All Sources", *SCRAPERS])
+        controls.addWidget(QLabel("Period:"))
+        controls.addWidget(self.period_dropdown)
+        controls.addWidget(QLabel("Resolution:"))
+        controls.addWidget(self.granularity_dropdown)
+        controls.addWidget(QLabel("Source:"))
+        controls.addWidget(self.source_dropdown)
+        controls.addStretch()
+        self.layout.addLayout(controls)
+
+        self.figure, self.axes = plt.subplots(3, 1, figsize=(10, 9), sharex=True)
+        self.canvas = FigureCanvas(self.figure)
+        self.layout.addWidget(self.canvas)
+
+        # Count any headlines not yet in the rollups (e.g. history from before they existed), then draw
+        self.trends_task = None
+        self.pending_update = pending_update
+        self.period_dropdown.currentTextChanged.connect(self.update_trends)
+        self.granularity_dropdown.currentTextChanged.connect(self.update_trends)
+        self.source_dropdown.currentTextChanged.connect(self.update_trends)
+        if pending_update is not None:
+            # The rollup update started after the last scrape is still scoring headlines; draw once it is done
+            self.show_status("Waiting for the trend update after the last scrape...")
+            pending_update.signals.progress.connect(self.show_update_progress)
+            pending_update.signals.finished.connect(self.on_pending_update_finished)
+        else:
+            self.update_trends()
+
+    def done(self, result):
+        """Stop scoring pending headlines if the dialog closes first."""
+        if self.trends_task is not None:
+            self.trends_task.cancel()
+        if self.pending_update is not None:
+            self.pending_update.signals.progress.disconnect(self.show_update_progress)
+            self.pending_update.signals.finished.disconnect(self.on_pending_update_finished)
+            self.pending_update = None
+        super().done(result)
+
+    def show_update_progress(self, done, total, message):
+        self.show_status(f"Waiting for the trend update: {done} of {total} headlines scored")
+
+    def on_pending_update_finished(self):
+        self.pending_update = None
+        self.update_trends()
+
+    def show_status(self, message):
+        self.axes[0].set_title(message)
+        self.canvas.draw_idle()
+
+    def update_trends(self):
+        days = TREND_PERIODS[self.period_dropdown.currentText()]
+        granularity = "hour" if self.granularity_dropdown.currentText() == "Hourly" else "day"
+        source = self.source_dropdown.currentText()
+        sources = None if source == "All Sources" else [source]
+        if self.trends_task is not None:
+            self.trends_task.cancel()
+        self.show_status("Loading trends...")
+        self.trends_task = task_manager.submit(
+            trends_task, self.article_store, days, granularity, sources,
+            on_progress=lambda done, total, message: self.show_status(f"{message}: {done} of {total}"),
+            on_result=self.on_trends_loaded,
+            on_failed=lambda error: self.show_status(f"Error loading trends: {error}")
+        )
+
+    def on_trends_loaded(self, result):
+        trends, update_error = result
+        self.draw_trends(trends)
+        if update_error is not None:
+            self.show_status(f"Failed to count new headlines; showing earlier counts. ({update_error})")
+
+    def draw_trends(self, trends):
+        volume_ax, sentiment_ax, topic_ax = self.axes
+        for ax in self.axes:
+            ax.clear()
+        dates = [datetime.fromtimestamp(bucket) for bucket in trends.buckets]
+        per = "Hour" if trends.granularity == "hour" else "Day"
+
+        for source, counts in sorted(trends.volume.items()):
+            volume_ax.plot(dates, counts, color=SOURCE_COLORS.get(source, "#CCCCCC"), label=source)
+        volume_ax.set_title("Headline Volume")
+        volume_ax.set_ylabel(f"New Headlines per {per}")
+
+        for source, share in sorted(trends.positive_share.items()):
+            if source == "All Sources" and len(trends.positive_share) <= 2:
+                continue  # A single source's line already shows the total
+            if source == "All Sources":
+                sentiment_ax.plot(dates, share, color="black", linestyle="--", label=source)
+            else:
+                sentiment_ax.plot(dates, share, color=SOURCE_COLORS.get(source, "#CCCCCC"), label=source)
+        sentiment_ax.set_title("Sentiment")
+        sentiment_ax.set_ylabel("Positive Share")
+        sentiment_ax.set_ylim(0, 1)
+
+        # Restricted to the selected source, "All Sources" holds just that source's topics
+        topic_share = trends.topic_share.get("All Sources", {})
+        if topic_share:
+            topic_ax.stackplot(dates, list(topic_share.values()), labels=list(topic_share))
+        topic_ax.set_title("Topic Share")
+        topic_ax.set_ylim(0, 1)
+
+        for ax in self.axes:
+            if ax.get_legend_handles_labels()[0]:
+                ax.legend(loc="upper left", fontsize=7)
+        if not trends.volume:
+            volume_ax.set_title("No scrape history in this period.")
+        self.figure.autofmt_xdate()
+        self.figure.tight_layout()
+        self.canvas.draw()
+
 class VisualizeNetworkDialog(QDialog):
-    def __init__(self, scraped_content, parent=None):
+    def __init__(self, scraped_content, parent=None, threshold=None, network=None):
         super().__init__(parent)
         self.setWindowTitle("Visualize Network")
         self.resize(900, 900)
 
-        # Save scraped content
+        # Save scraped content; the network (shared between views) keeps the graph and layout across openings.
+        # threshold overrides the matching threshold from settings for a network made here.
         self.scraped_content = scraped_content
+        self.network = network if network is not None else StoryNetwork(threshold)
 
         # Main layout for the dialog
         self.layout = QVBoxLayout(self)
@@ -835,130 +1090,125 @@ class VisualizeNetworkDialog(QDialog):
         self.canvas = FigureCanvas(self.figure)
         self.layout.addWidget(self.canvas)
 
-        # Generate and display the network graph
-        self.G, self.pos, self.labels, self.node_types = self.generate_network_graph()
+        # Cache each full render for blitting the hover label over it
+        self.G, self.pos, self.labels, self.node_types = None, None, None, None
+        self.hover_label = None
+        self.hover_grid = None
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self.on_draw)
 
         # Connect hover event for article nodes
         self.canvas.mpl_connect("motion_notify_event", self.on_hover)
 
+        # Match stories and lay out the network off the GUI thread, then draw it
+        self.network_task = None
+        if self.scraped_content:
+            self.show_status("Building network...")
+            self.network_task = task_manager.submit(
+                network_task, self.network, self.scraped_content,
+                on_progress=lambda done, total, message: self.show_status(f"{message}..."),
+                on_result=lambda _: self.show_network(),
+                on_failed=lambda error: self.show_status(f"Error building the network: {error}")
+            )
+        else:
+            self.show_network()
+
+    def done(self, result):
+        """Stop building the network if the dialog closes first."""
+        if self.network_task is not None:
+            self.network_task.cancel()
+        super().done(result)
+
+    def show_status(self, message):
+        self.ax.set_title(message)
+        self.canvas.draw_idle()
+
+    def show_network(self):
+        """Draw the network and make its article nodes hoverable."""
+        self.hover_label = None
+        self.G, self.pos, self.labels, self.node_types = self.generate_network_graph()
+
+        # Article nodes can be hovered; their data coordinates are fixed while the dialog is open
+        self.hover_nodes = [node for node, node_type in (self.node_types or {}).items() if node_type == "article"]
+        self.hover_points = np.array([self.pos[node] for node in self.hover_nodes], dtype=float).reshape(-1, 2)
+        self.hover_node = None
+        # One label, moved and retexted as the mouse moves, drawn outside the normal render
+        self.hover_label = self.ax.text(
+            0, 0, "", fontsize=8, color="black", weight="bold", zorder=10, visible=False, animated=True
+        )
+
     def generate_network_graph(self):
-        """Create and display a network graph of common articles with improved spacing."""
+        """Draw the shared-story network, already updated and laid out, with improved spacing."""
         if not self.scraped_content:
             self.ax.clear()
             self.ax.set_title("No data available to visualize.")
             self.canvas.draw()
             return None, None, None, None
 
-        # Build the network graph
-        G = nx.Graph()
-        sources = list(self.scraped_content.keys())
-        labels = {}  # Dictionary to map nodes to labels for hover
-        node_types = {}  # Dictionary to distinguish between sources and articles
-
-        # Assign distinct pastel colors to sources
-        source_colors = {
-            source: color for source, color in zip(
-                sources, ['#FF9999', '#99CCFF', '#99FF99', '#FFCC99', '#FF99FF', '#CC9966']
-            )
-        }
-
-        # Add nodes for each source
-        for source in sources:
-            G.add_node(source, type='source', color=source_colors[source])
-            labels[source] = source  # Use source name as its label
-            node_types[source] = "source"
-
-        # Compare articles and add shared articles as nodes and edges
-        for i, source1 in enumerate(sources):
-            for source2 in sources[i + 1:]:
-                for article1 in self.scraped_content[source1]:
-                    for article2 in self.scraped_content[source2]:
-                        if self.has_significant_word_overlap(article1, article2):
-                            truncated_title = self.truncate_text(article1)
-                            G.add_node(truncated_title, type='article', color='#CCCCCC')  # Light grey for shared articles
-                            G.add_edge(source1, truncated_title, color=source_colors[source1])
-                            G.add_edge(source2, truncated_title, color=source_colors[source2])
-                            labels[truncated_title] = article1  # Store full article title for hover
-                            node_types[truncated_title] = "article"
-
-        # Visualization: Extract node and edge colors
-        node_colors = [G.nodes[node].get('color', 'gray') for node in G.nodes]
-        edge_colors = [G[u][v]['color'] for u, v in G.edges]
-
-        # Use spring layout with high repulsion for better spacing
-        pos = nx.spring_layout(G, k=3.0, seed=42)  # Increased `k` for more spacing
+        G = self.network.graph
+        pos = self.network.positions
 
         # Clear the previous graph
         self.ax.clear()
         self.ax.set_title("News Articles Network")
 
         # Draw nodes
+        node_colors = [G.nodes[node].get('color', 'gray') for node in G.nodes]
         nx.draw_networkx_nodes(
             G, pos, nodelist=G.nodes, ax=self.ax,
             node_color=node_colors, node_size=700
         )
 
-        # Draw edges with color matching their sources
-        for (u, v), color in zip(G.edges, edge_colors):
-            x = [pos[u][0], pos[v][0]]
-            y = [pos[u][1], pos[v][1]]
-            self.ax.plot(x, y, color=color, linewidth=2.5)
+        # Draw every edge in one collection, colored to match its source
+        segments, edge_colors = self.network.edge_segments()
+        self.ax.add_collection(LineCollection(segments, colors=edge_colors, linewidths=2.5, zorder=2))
 
         # Draw labels for source nodes
-        source_labels = {node: node for node in G.nodes if node_types.get(node) == "source"}
+        source_labels = {node: node for node, node_type in self.network.node_types.items() if node_type == "source"}
         nx.draw_networkx_labels(G, pos, labels=source_labels, font_size=10, font_weight="bold", ax=self.ax)
 
         # Render the canvas
         self.canvas.draw()
-        return G, pos, labels, node_types
-
-    def has_significant_word_overlap(self, title1, title2):
-        """Check if two article titles have at least 4 words in common."""
-        words1 = set(title1.lower().split())
-        words2 = set(title2.lower().split())
-        common_words = words1 & words2
-        return len(common_words) >= 4
-
-    def truncate_text(self, text, max_length=50):
-        """Truncate long text to fit within the graph."""
-        return text if len(text) <= max_length else text[:max_length] + "..."
+        return G, pos, self.network.labels, self.network.node_types
+
+    def on_draw(self, event):
+        """Keep the rendered graph for blitting; the view may have changed, so node screen positions are stale."""
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.hover_grid = None
+        if self.hover_label is not None and self.hover_label.get_visible():
+            self.ax.draw_artist(self.hover_label)
+
+    def hover_index(self):
+        """Grid index over the article nodes' screen positions, rebuilt only after a redraw."""
+        if self.hover_grid is None:
+            self.hover_screen = self.ax.transData.transform(self.hover_points)  # One vectorised transform
+            self.hover_grid = PointGrid(self.hover_screen, HOVER_RADIUS_PX)
+        return self.hover_grid
 
     def on_hover(self, event):
-        """Display the full title of article nodes near the hovered node on the graph."""
-        if event.inaxes == self.ax:
-            # Remove only dynamic hover labels
-            for text in self.ax.texts:
-                if getattr(text, "is_hover_label", False):  # Only remove hover labels
-                    text.remove()
-
-            for node, (x, y) in self.pos.items():
-                # Map the node's position from data coordinates to display coordinates
-                screen_x, screen_y = self.ax.transData.transform((x, y))
-                canvas_width = self.canvas.width()  # Get the width of the canvas in pixels
-
-                # Check proximity in pixels (tuned to 10-pixel radius)
-                if abs(screen_x - event.x) < 10 and abs(screen_y - event.y) < 10:
-                    node_type = self.node_types.get(node)
-                    if node_type == "article":
-                        full_title = self.labels.get(node, "")
-
-                        # Determine the label's horizontal position based on node's location
-                        if screen_x > canvas_width / 2:  # If node is on the right half
-                            label_x = x - 0.02  # Position label to the left
-                        else:  # If node is on the left half
-                            label_x = x + 0.02  # Position label to the right
-
-                        # Add a dynamic label near the hovered node
-                        hover_label = self.ax.text(
-                            label_x, y, full_title,
-                            fontsize=8, color="black", weight="bold", zorder=10
-                        )
-                        hover_label.is_hover_label = True  # Mark this label as a hover label
-                        self.canvas.draw_idle()
-                        return
-
-            # Redraw the canvas to clear hover labels if no node is hovered
-            self.canvas.draw_idle()
+        """Display the full title of the article node under the mouse."""
+        if event.inaxes != self.ax or self.pos is None or self.hover_label is None or self.background is None:
+            return
+
+        point_id = self.hover_index().nearest(event.x, event.y)
+        node = self.hover_nodes[point_id] if point_id is not None else None
+        if node == self.hover_node:
+            return  # Same node (or still none): nothing to redraw
+        self.hover_node = node
+
+        if node is not None:
+            x, y = self.pos[node]
+            # Put the label on the side of the node facing the center of the canvas
+            label_x = x - 0.02 if self.hover_screen[point_id, 0] > self.figure.bbox.width / 2 else x + 0.02
+            self.hover_label.set_text(self.labels.get(node, ""))
+            self.hover_label.set_position((label_x, y))
+        self.hover_label.set_visible(node is not None)
+
+        # Blit: restore the cached render and draw only the label on top
+        self.canvas.restore_region(self.background)
+        if node is not None:
+            self.ax.draw_artist(self.hover_label)
+        self.canvas.blit(self.figure.bbox)
 
 class ReportPreviewDialog(QDialog):
     def __init__(self, html_content, parent=None):
@@ -979,6 +1229,17 @@ class ReportPreviewDialog(QDialog):
         self.print_button.clicked.connect(self.print_report)
         layout.addWidget(self.print_button)
 
+        self.pdf_button = QPushButton("Save as PDF")
+        self.pdf_button.clicked.connect(self.save_pdf)
+        layout.addWidget(self.pdf_button)
+
+    def save_pdf(self):
+        """Save the rendered report as a PDF file."""
+        default_file_name = f"NewsNet Report - {datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.pdf"
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Report", default_file_name, "PDF Files (*.pdf)")
+        if file_path:
+            self.web_view.page().printToPdf(file_path)
+
     def print_report(self):
         """Print the report."""
         printer = QPrinter()
@@ -990,7 +1251,9 @@ class ReportPreviewDialog(QDialog):
             self.web_view.print(printer)
             
 class LoadingDialog(QDialog):
-    def __init__(self, message="Loading, please wait...", parent=None):
+    cancelled = pyqtSignal()
+
+    def __init__(self, message="Loading, please wait...", parent=None, cancellable=False):
         super().__init__(parent)
         self.setWindowTitle("Please Wait")
         self.setModal(True)
@@ -1007,11 +1270,146 @@ class LoadingDialog(QDialog):
         self.progress.setRange(0, 0)  # Infinite loading effect
         layout.addWidget(self.progress)
 
+        if cancellable:
+            self.cancel_button = QPushButton("Cancel")
+            self.cancel_button.clicked.connect(self.cancel)
+            layout.addWidget(self.cancel_button)
+
+    def cancel(self):
+        self.cancel_button.setEnabled(False)
+        self.update_message("Cancelling...")
+        self.cancelled.emit()
+
     def update_message(self, new_message):
         self.label.setText(new_message)
-        
+
+    def set_total(self, total):
+        """Switch to a determinate progress bar counting finished steps."""
+        self.progress.setRange(0, total)
+        self.progress.setValue(0)
+
+    def set_progress(self, done, total, message=""):
+        """Show how many of total items are done, with an optional description of the last step."""
+        self.progress.setRange(0, total)
+        self.progress.setValue(min(done, total))
+        self.update_message(f"{message} ({done}/{total})" if message else f"{done} of {total} done")
+
+def articles_key(articles):
+    """Cache key for a task's result over a list of articles."""
+    return content_hash("\n".join(articles))
+
+def topic_model_task(task, articles):
+    """Task: fetch or train the topic model for a set of articles.
+
+    Returns (labeled topics, run stats); small enough to keep in the task result cache.
+    """
+    lda_model, run = topic_model_cache.get_model(
+        articles, progress=lambda done, total: task.checkpoint(done, total, f"Topic model pass {done + 1} of {total}")
+    )
+    return label_topics(lda_model), run
+
+def load_window_task(task, article_store, start):
+    """Task: load {source: [headlines]} first seen since start from the article store."""
+    task.report(0, 1, "Loading stored headlines")
+    return article_store.load_window(start=start)
+
+def report_task(task, scraped_content):
+    """Task: build the report HTML, rendering only the sections not already cached."""
+    return report_builder.build(scraped_content, progress=task.checkpoint)
+
+def sentiment_task(task, articles):
+    """Task: score the sentiment of articles, reusing every cached label."""
+    return sentiment_service.analyze_many(
+        articles, progress=lambda done, total: task.checkpoint(done, total, "Scoring sentiment")
+    )
+
+def search_index_task(task, articles):
+    """Task: build the token/prefix search index over the articles."""
+    return HeadlineIndex(articles)
+
+def semantic_index_task(task, articles):
+    """Task: embed any headlines missing from the vector store and build the meaning search index."""
+    task.report(0, 1, "Indexing headlines")
+    return SemanticIndex(articles)
+
+def trends_task(task, article_store, days, granularity, sources=None):
+    """Task: count any pending headlines in the rollups, then load the trends for the period.
+
+    Returns (trends, error), where error describes a failed rollup update (None if it succeeded).
+    """
+    error = None
+    try:
+        annotate_pending(article_store,
+                         progress=lambda done, total: task.checkpoint(done, total, "Scoring new headlines"))
+    except TaskCancelled:
+        raise
+    except Exception as e:
+        # Still chart the counters already in the rollups
+        error = str(e)
+    return load_trends(article_store, days, granularity, sources), error
+
+def network_task(task, network, scraped_content):
+    """Task: apply new and dropped shared stories to the network and lay it out.
+
+    Holds the network's lock throughout, so a task from a dialog that was closed and
+    reopened finishes (or stops at a checkpoint) before this one touches the network.
+    """
+    with network.lock:
+        task.checkpoint(0, 2, "Matching shared stories")
+        network.update(scraped_content)
+        task.checkpoint(1, 2, "Laying out the network")
+        network.layout()
+    return network
+
+def export_task(task, records, file_path, total):
+    """Task: stream export rows to a file. Returns (file path, rows written, cancelled)."""
+    written = export_to_file(
+        export_rows(records), file_path, total=total,
+        progress=task.report, is_cancelled=task.is_cancelled
+    )
+    return file_path, written, task.is_cancelled()
+
+def scrape_task(task, scrapers, article_store):
+    """Task: run the selected scrapers concurrently and record each source in the article store.
+
+    Emits (source, articles, number never seen before, error) as a partial result per source
+    and returns the elapsed time. A cancelled run ends with TaskCancelled once the sources
+    finished so far have been reported.
+    """
+    engine = ScrapeEngine()
+    task.on_cancel(engine.cancel)
+    finished = []
+
+    def on_result(name, articles):
+        new_articles = article_store.record_scrape(name, articles)
+        task.signals.partial.emit((name, articles, len(new_articles), None))
+        finished.append(name)
+        task.report(len(finished), len(scrapers), f"{name} done")
+
+    def on_error(name, error):
+        task.signals.partial.emit((name, None, 0, error))
+        finished.append(name)
+        task.report(len(finished), len(scrapers), f"{name} failed")
+
+    _, _, elapsed = engine.run(scrapers, on_result=on_result, on_error=on_error)
+    if engine.deadline is not None and engine.deadline.cancelled():
+        raise TaskCancelled()
+    return elapsed
+
+def annotate_task(task, article_store):
+    """Task: add the sentiment and topic of headlines not yet in the trend rollups. Returns how many were added.
+
+    A cancelled update leaves the rest pending for the next one.
+    """
+    return annotate_pending(article_store, progress=lambda done, total: task.report(done, total, "Updating trends"),
+                            is_cancelled=task.is_cancelled)
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    # Load NLP models in the background once the window is up
+    QTimer.singleShot(0, lambda: registry.warm_up(WARM_UP_MODELS))
+    # Let running tasks stop at their next checkpoint instead of outliving the window
+    app.aboutToQuit.connect(task_manager.cancel_all)
     sys.exit(app.exec_())
@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
+from models import SPACY_MODEL, get_nlp
+from settings import EMBEDDING_BATCH_SIZE, VECTOR_STORE_DIR
+from utils import atomic_write, content_hash
+
+try:
+    import fcntl  # Cross-process append lock; not available on Windows
+except ImportError:
+    fcntl = None
+
+HASH_BYTES = 16  # content_hash digests are stored raw, one per row
+DIGEST_DTYPE = f"S{HASH_BYTES}"
+
+
+def normalize_rows(matrix):
+    """Scale rows to unit length, leaving all-zero rows (no vector) at zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorStore:
+    """Append-only, memory-mapped matrix of unit-length headline vectors keyed by content hash.
+
+    Rows live in vectors.f32 (raw float32) and their digests, in the same order, in
+    hashes.bin. Readers map the vectors file read-only, so every process shares the
+    same pages, and a cold start only reads the digests into a sorted numpy index
+    (24 bytes a row) searched with np.searchsorted. Writers append vectors before
+    digests under a file lock, so a row exists once its digest does and rows torn by
+    a crashed writer are discarded by the next append.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(VECTOR_STORE_DIR, SPACY_MODEL)
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.hashes_path = os.path.join(self.directory, "hashes.bin")
+        self.meta_path = os.path.join(self.directory, "meta.json")
+        self.dim = None
+        self._digests = np.zeros(0, dtype=DIGEST_DTYPE)  # Sorted digests of every stored row
+        self._digest_rows = np.zeros(0, dtype=np.int64)  # Row of each digest in _digests
+        self._count = 0
+        self._view = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return self._count
+
+    def _refresh(self):
+        """Pick up rows appended since the last call, by this process or another one."""
+        try:
+            count = os.path.getsize(self.hashes_path) // HASH_BYTES
+        except OSError:
+            count = 0
+        if count <= self._count:
+            return
+        if self.dim is None:
+            with open(self.meta_path, encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+        with open(self.hashes_path, "rb") as f:
+            f.seek(self._count * HASH_BYTES)
+            new = np.fromfile(f, dtype=DIGEST_DTYPE, count=count - self._count)
+        # Merge the new digests into the sorted index
+        order = np.argsort(new, kind="stable")
+        positions = np.searchsorted(self._digests, new[order])
+        self._digests = np.insert(self._digests, positions, new[order])
+        self._digest_rows = np.insert(self._digest_rows, positions, order + self._count)
+        self._count = count
+        self._view = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim))
+
+    @contextmanager
+    def _file_lock(self):
+        with open(os.path.join(self.directory, "lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _find(self, digests):
+        """Row of each digest in a DIGEST_DTYPE array, -1 where it is not stored."""
+        if not len(self._digests):
+            return np.full(len(digests), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self._digests, digests), len(self._digests) - 1)
+        return np.where(self._digests[positions] == digests, self._digest_rows[positions], -1)
+
+    def rows(self, hashes):
+        """Return the row of each content hash as an int64 array, -1 where it is not stored."""
+        digests = np.array([bytes.fromhex(h) for h in hashes], dtype=DIGEST_DTYPE)
+        with self._lock:
+            self._refresh()
+            return self._find(digests)
+
+    def vectors(self):
+        """The whole (len, dim) matrix as a read-only memory map; nothing is copied."""
+        with self._lock:
+            self._refresh()
+            if self._view is None:
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            return self._view
+
+    def add(self, hashes, matrix):
+        """Append the rows of matrix under their content hashes, skipping hashes already stored."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock, self._file_lock():
+            self._refresh()
+            if self.dim is None:
+                self.dim = matrix.shape[1]
+                with atomic_write(self.meta_path) as f:
+                    json.dump({"dim": self.dim}, f)
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(f"Vectors have {matrix.shape[1]} dimensions; the store holds {self.dim}.")
+
+            new = {}  # digest -> row of matrix
+            digests = np.array([bytes.fromhex(h) for h in hashes], dtype=DIGEST_DTYPE)
+            for row, (h, stored) in enumerate(zip(hashes, self._find(digests))):
+                if stored < 0:
+                    new.setdefault(bytes.fromhex(h), row)
+            if not new:
+                return
+
+            with open(self.vectors_path, "ab") as f:
+                self._drop_torn_rows(f, self._count * self.dim * 4)
+                f.write(matrix[list(new.values())].tobytes())
+            with open(self.hashes_path, "ab") as f:
+                self._drop_torn_rows(f, self._count * HASH_BYTES)
+                f.write(b"".join(new))
+            self._refresh()
+
+    def _drop_torn_rows(self, f, size):
+        """Cut f back to size bytes if a crashed writer left a partial append behind it.
+
+        Windows refuses to truncate a mapped file, so the view is released first; the
+        next _refresh maps the file again.
+        """
+        if os.fstat(f.fileno()).st_size > size:
+            self._view = None
+            f.truncate(size)
+
+
+class HeadlineEmbedder:
+    """Unit-length float32 headline vectors from the spaCy model's word vectors.
+
+    Headlines only go through the tokenizer, in batches (a Doc vector is the mean of its
+    token vectors, so no pipeline component is needed), and each vector is
+    kept in the VectorStore, so a headline is embedded once across sessions and spaCy
+    is only loaded when a headline has never been seen.
+    """
+
+    def __init__(self, batch_size=EMBEDDING_BATCH_SIZE, store=None):
+        self.batch_size = batch_size
+        self.store = store if store is not None else VectorStore()
+
+    @property
+    def dim(self):
+        if len(self.store):
+            return self.store.dim
+        return get_nlp().vocab.vectors_length
+
+    def _embed(self, texts):
+        nlp = get_nlp()
+        matrix = np.zeros((len(texts), nlp.vocab.vectors_length), dtype=np.float32)
+        # nlp.tokenizer.pipe leaves the shared pipeline alone, unlike select_pipes, which
+        # would disable the tagger and parser for every other thread using nlp meanwhile
+        for row, doc in enumerate(nlp.tokenizer.pipe(texts, batch_size=self.batch_size)):
+            matrix[row] = doc.vector
+        return normalize_rows(matrix)
+
+    def rows(self, headlines):
+        """Return the store rows of headlines, embedding and appending any not stored yet."""
+        hashes = [content_hash(headline) for headline in headlines]
+        rows = self.store.rows(hashes)
+        missing = {}  # content hash -> headline still to embed
+        for h, headline, row in zip(hashes, headlines, rows):
+            if row < 0:
+                missing.setdefault(h, headline)
+        if missing:
+            self.store.add(list(missing), self._embed(list(missing.values())))
+            rows = self.store.rows(hashes)
+        return rows
+
+    def embed_query(self, text):
+        """Unit-length vector of a search query; queries are not added to the store."""
+        return self._embed([text])[0]
+
+    def embed(self, headlines):
+        """Return a (len(headlines), dim) float32 matrix of unit-length headline vectors."""
+        if not headlines:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        rows = self.rows(headlines)
+        return np.asarray(self.store.vectors()[rows])
+
+
+embedder = HeadlineEmbedder()
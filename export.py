@@ -0,0 +1,182 @@
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+from itertools import islice
+from utils import atomic_path
+
+EXPORT_COLUMNS = ["source", "headline", "hash", "first_seen", "last_seen", "sentiment", "topic"]
+EXPORT_FORMATS = {
+    ".jsonl": "JSON Lines",
+    ".csv.gz": "Gzip-compressed CSV",
+    ".csv": "CSV",
+    ".json": "JSON",
+    ".parquet": "Parquet",
+}
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_rows(records, sentiment=True, topics=True, chunk_size=1000):
+    """Turn (source, headline, hash, first_seen, last_seen, sentiment, topic) records into export rows.
+
+    Works chunk by chunk, so memory stays constant however many records there are.
+    Stored sentiment and topic values are used as they are; only a missing sentiment is
+    scored by the shared sentiment service, and only a missing topic is set to the
+    topic_labels.json label closest to the headline's content words.
+    """
+    from preprocessing import preprocessor
+    from sentiment import sentiment_service
+    from topics import label_index
+
+    for chunk in chunked(records, chunk_size):
+        sentiments = {}
+        if sentiment:
+            unscored = [record[1] for record in chunk if record[5] is None]
+            if unscored:
+                sentiments = sentiment_service.analyze_many(unscored)
+        topic_labels = {}
+        if topics:
+            untopiced = [record[1] for record in chunk if record[6] is None]
+            if untopiced:
+                keyword_lists = [preprocessor.words(processed.content_ids)
+                                 for processed in preprocessor.process_many(untopiced)]
+                topic_labels = dict(zip(untopiced, label_index.categorize_many(keyword_lists)))
+
+        for source, headline, article_hash, first_seen, last_seen, stored_sentiment, stored_topic in chunk:
+            yield {
+                "source": source,
+                "headline": headline,
+                "hash": article_hash,
+                "first_seen": datetime.fromtimestamp(first_seen),
+                "last_seen": datetime.fromtimestamp(last_seen),
+                "sentiment": stored_sentiment if stored_sentiment is not None else sentiments.get(headline),
+                "topic": stored_topic if stored_topic is not None else topic_labels.get(headline),
+            }
+
+
+def _text_value(value):
+    return value.isoformat(timespec="seconds") if isinstance(value, datetime) else value
+
+
+def write_jsonl(rows, file):
+    for row in rows:
+        file.write(json.dumps({key: _text_value(value) for key, value in row.items()}, ensure_ascii=False))
+        file.write("\n")
+        yield
+
+
+def write_json(rows, file):
+    """Write a JSON array one element at a time instead of dumping a whole structure."""
+    file.write("[\n")
+    for index, row in enumerate(rows):
+        if index:
+            file.write(",\n")
+        file.write(json.dumps({key: _text_value(value) for key, value in row.items()}, ensure_ascii=False))
+        yield
+    file.write("\n]\n")
+
+
+def write_csv(rows, file):
+    writer = csv.writer(file)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([_text_value(row[column]) for column in EXPORT_COLUMNS])
+        yield
+
+
+def write_parquet(rows, path, batch_size=10000):
+    """Write row groups of batch_size rows through pyarrow's ParquetWriter."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Parquet export requires pyarrow (pip install pyarrow).")
+
+    schema = pa.schema([
+        ("source", pa.string()),
+        ("headline", pa.string()),
+        ("hash", pa.string()),
+        ("first_seen", pa.timestamp("s")),
+        ("last_seen", pa.timestamp("s")),
+        ("sentiment", pa.string()),
+        ("topic", pa.string()),
+    ])
+    with pq.ParquetWriter(path, schema, compression="snappy") as writer:
+        for batch in chunked(rows, batch_size):
+            columns = {column: [row[column] for row in batch] for column in EXPORT_COLUMNS}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            for _ in batch:
+                yield
+
+
+def export_format(path):
+    """Return the extension of a supported export format for path, or None."""
+    for extension in EXPORT_FORMATS:
+        if path.lower().endswith(extension):
+            return extension
+    return None
+
+
+class _ExportCancelled(Exception):
+    def __init__(self, written):
+        super().__init__(written)
+        self.written = written
+
+
+def export_to_file(rows, path, total=None, progress=None, is_cancelled=None, progress_every=1000):
+    """Stream rows to path in the format given by its extension and return the number written.
+
+    progress(written, total) is called every progress_every rows; is_cancelled() is
+    polled at the same points and stops the export. Rows are written to a temporary
+    file that replaces path only once the export finishes, so a failed or cancelled
+    export never leaves a partial file or replaces an existing one.
+    """
+    extension = export_format(path)
+    if extension is None:
+        raise Exception(f"Unsupported file format: {os.path.basename(path)}")
+
+    try:
+        with atomic_path(path) as tmp_path:
+            written = _export(rows, tmp_path, extension, total, progress, is_cancelled, progress_every)
+    except _ExportCancelled as cancelled:
+        return cancelled.written
+    if progress:
+        progress(written, total)
+    return written
+
+
+def _export(rows, path, extension, total, progress, is_cancelled, progress_every):
+    if extension == ".parquet":
+        file = None
+        writes = write_parquet(rows, path)
+    elif extension == ".csv.gz":
+        file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        writes = write_csv(rows, file)
+    else:
+        file = open(path, "w", newline="" if extension == ".csv" else None, encoding="utf-8")
+        writer = {".jsonl": write_jsonl, ".json": write_json, ".csv": write_csv}[extension]
+        writes = writer(rows, file)
+
+    written = 0
+    try:
+        for _ in writes:
+            written += 1
+            if written % progress_every == 0:
+                if progress:
+                    progress(written, total)
+                if is_cancelled and is_cancelled():
+                    raise _ExportCancelled(written)
+    finally:
+        writes.close()
+        if file is not None:
+            file.close()
+    return written
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from settings import CACHE_DIR
+from utils import atomic_write
+
+try:
+    import brotli  # noqa: F401 - urllib3 decodes "br" bodies only when brotli is installed
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+USER_AGENT = "Mozilla/5.0 (compatible; NewsNet/1.0)"
+
+
+class HTTPCache:
+    """On-disk cache of each page's validators (ETag/Last-Modified) and the headlines extracted from it."""
+
+    def __init__(self, directory=HTTP_CACHE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key):
+        """Return the cached entry for a key, or None if missing or unreadable."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, entry):
+        """Store an entry atomically so concurrent scrapers never read a half-written file."""
+        path = self._path(key)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with atomic_write(path) as file:
+                json.dump(entry, file, ensure_ascii=False)
+
+
+class Fetcher:
+    """Shared HTTP layer with keep-alive pooling, compression and conditional GETs."""
+
+    def __init__(self, cache=None, pool_size=10, timeout=10):
+        self.cache = cache if cache is not None else HTTPCache()
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+
+    def get(self, url, **kwargs):
+        """Plain GET over the pooled session."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def fetch_headlines(self, url, parse, key=None, timeout=None):
+        """Fetch a page and return parse(content), reusing cached headlines on 304 Not Modified.
+
+        Cached headlines are stored under key (the URL by default), which must change
+        whenever parse would extract something different from the same page.
+        """
+        key = key or url
+        entry = self.cache.get(key)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.get(url, headers=headers, timeout=timeout or self.timeout)
+        if response.status_code == 304 and entry is not None:
+            # Page unchanged since the last scrape: skip parsing entirely
+            return entry["headlines"]
+        response.raise_for_status()
+
+        headlines = parse(response.content)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.cache.set(key, {
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "headlines": headlines
+            })
+        return headlines
+
+
+# Shared by every scraper so connections are reused across sources and runs
+fetcher = Fetcher()
+
+
+def fetch_headlines(url, parse, key=None, timeout=None):
+    """Fetch and parse a page through the shared fetcher."""
+    return fetcher.fetch_headlines(url, parse, key=key, timeout=timeout)
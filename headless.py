@@ -0,0 +1,202 @@
+"""Run NewsNet scraping and analysis without the GUI.
+
+Usage:
+    python headless.py scrape [--sources "CNN News" "Rappler"] [--annotate]
+    python headless.py analyze [--window-hours 24] [--output results/]
+    python headless.py run [--output results/] [--report html|pdf]
+    python headless.py daemon --interval 30 [--output results/] [--report pdf]
+
+Only the scraping and NLP core is imported: no PyQt, QtWebEngine or matplotlib
+(PDF reports fall back to Qt's offscreen renderer when WeasyPrint is not installed).
+Every scrape is recorded in the article store; analysis results are written as JSON,
+and optionally as the same report the GUI previews. "scrape" only fetches and records
+headlines, so it never loads the NLP models unless --annotate asks it to score them
+for the trend rollups; "run" and "daemon" always do.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from scraping import ScrapeEngine
+from sources import SCRAPERS
+from store import ArticleStore
+
+DEFAULT_WINDOW_HOURS = 24  # History analyzed by the "analyze" command unless --window-hours is given
+
+
+def scrape(store, sources=None):
+    """Scrape the given sources (all by default) concurrently and record them in the store."""
+    scrapers = [(name, scraper) for name, scraper in SCRAPERS.items() if not sources or name in sources]
+    content = {}
+
+    def on_result(name, articles):
+        content[name] = articles
+        new_articles = store.record_scrape(name, articles)
+        print(f"{name}: {len(articles)} articles scraped ({len(new_articles)} new).", flush=True)
+
+    def on_error(name, error):
+        print(f"{name}: Failed to scrape. ({error})", flush=True)
+
+    _, _, elapsed = ScrapeEngine().run(scrapers, on_result=on_result, on_error=on_error)
+    print(f"Scraping complete. ({elapsed:.1f}s)", flush=True)
+    return content
+
+
+def update_trends(store):
+    """Add the sentiment and topic of newly stored headlines to the trend rollups."""
+    from trends import annotate_pending
+    try:
+        annotated = annotate_pending(store)
+        print(f"Trends updated with {annotated} new headlines.", flush=True)
+    except Exception as e:
+        print(f"Failed to update trends: {e}", flush=True)
+
+
+def analyze(content, sentiment=True, topics=True, network=True):
+    """Run the sentiment, topic and shared-story analyses over {source: [articles]}."""
+    results = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "counts": {source: len(articles) for source, articles in content.items()},
+    }
+    combined_articles = [article for articles in content.values() for article in articles]
+
+    if sentiment:
+        from sentiment import sentiment_service
+        labels = sentiment_service.analyze_many(combined_articles)
+        results["sentiment"] = {
+            source: {
+                "positive": sum(1 for article in articles if labels[article] == "positive"),
+                "negative": sum(1 for article in articles if labels[article] == "negative"),
+            }
+            for source, articles in content.items()
+        }
+
+    if topics and combined_articles:
+        from topics import topic_model_cache, label_topics
+        lda_model, run = topic_model_cache.get_model(combined_articles)
+        results["topics"] = [
+            {"label": label, "weight": float(weight), "keywords": keywords}
+            for label, weight, keywords in label_topics(lda_model)
+        ]
+        results["topic_model"] = run
+
+    if network:
+        from stories import find_shared_stories, find_story_clusters
+        results["shared_stories"] = [
+            {"source1": source1, "article1": article1, "source2": source2, "article2": article2}
+            for source1, article1, source2, article2 in find_shared_stories(content)
+        ]
+        results["story_clusters"] = [
+            {"sources": cluster.sources, "headlines": [{"source": source, "headline": headline}
+                                                       for source, headline in cluster.members]}
+            for cluster in find_story_clusters(content)
+        ]
+
+    return results
+
+
+def write_results(results, output_dir):
+    """Write analysis results to a timestamped JSON file and return its path."""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"newsnet-{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=4, ensure_ascii=False)
+    print(f"Results written to {path}", flush=True)
+    return path
+
+
+def write_report(content, output_dir, report_format):
+    """Write the report for {source: [articles]} as HTML or PDF and return its path."""
+    from report import report_builder, write_html, write_pdf
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"newsnet-report-{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.{report_format}")
+    report_html = report_builder.build(content)
+    (write_pdf if report_format == "pdf" else write_html)(report_html, path)
+    print(f"Report written to {path}", flush=True)
+    return path
+
+
+def run_once(store, args):
+    """Scrape, then analyze the fresh scrape (or the requested history window) and save the results."""
+    content = scrape(store, args.sources)
+    update_trends(store)
+    if args.window_hours:
+        content = store.load_window(start=time.time() - args.window_hours * 3600, sources=args.sources)
+    results = analyze(content, not args.no_sentiment, not args.no_topics, not args.no_network)
+    path = write_results(results, args.output)
+    if args.report:
+        write_report(content, args.output, args.report)
+    return path
+
+
+def run_daemon(store, args):
+    """Run a scrape and analysis every --interval minutes until interrupted."""
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    print(f"NewsNet daemon started; running every {args.interval} minutes.", flush=True)
+    while not stop.is_set():
+        started = time.monotonic()
+        try:
+            run_once(store, args)
+        except Exception as e:
+            print(f"Run failed: {e}", flush=True)
+        # Sleep until the next slot, waking immediately on a stop signal
+        stop.wait(max(0.0, args.interval * 60 - (time.monotonic() - started)))
+    print("NewsNet daemon stopped.", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless NewsNet scraping and analysis.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(subparser, analysis=True):
+        subparser.add_argument("--sources", nargs="+", choices=list(SCRAPERS), help="Sources to use (default: all)")
+        if analysis:
+            subparser.add_argument("--window-hours", type=float,
+                                   help="Analyze stored history from the last N hours "
+                                        "(run/daemon default: the fresh scrape; analyze default: 24)")
+            subparser.add_argument("--output", default="results", help="Directory for result files")
+            subparser.add_argument("--no-sentiment", action="store_true")
+            subparser.add_argument("--no-topics", action="store_true")
+            subparser.add_argument("--no-network", action="store_true")
+            subparser.add_argument("--report", choices=["html", "pdf"],
+                                   help="Also write the full report (all sections) in this format")
+
+    scrape_parser = subparsers.add_parser("scrape", help="Scrape and record headlines only")
+    add_common(scrape_parser, analysis=False)
+    scrape_parser.add_argument("--annotate", action="store_true",
+                               help="Also score the new headlines' sentiment and topic for the trend charts")
+    add_common(subparsers.add_parser("analyze", help="Analyze stored headlines without scraping"))
+    add_common(subparsers.add_parser("run", help="Scrape, then analyze"))
+    daemon_parser = subparsers.add_parser("daemon", help="Scrape and analyze on a schedule")
+    add_common(daemon_parser)
+    daemon_parser.add_argument("--interval", type=float, default=60, help="Minutes between runs")
+
+    args = parser.parse_args(argv)
+    store = ArticleStore()
+
+    if args.command == "scrape":
+        scrape(store, args.sources)
+        if args.annotate:
+            update_trends(store)
+    elif args.command == "analyze":
+        hours = args.window_hours or DEFAULT_WINDOW_HOURS
+        content = store.load_window(start=time.time() - hours * 3600, sources=args.sources)
+        write_results(analyze(content, not args.no_sentiment, not args.no_topics, not args.no_network), args.output)
+        if args.report:
+            write_report(content, args.output, args.report)
+    elif args.command == "run":
+        run_once(store, args)
+    else:
+        run_daemon(store, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
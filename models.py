@@ -0,0 +1,99 @@
+import threading
+import time
+
+SPACY_MODEL = "en_core_web_md"  # Also names the on-disk headline vector store, which depends on it
+
+
+class ModelRegistry:
+    """Load heavy NLP models on first use instead of at import time."""
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._locks = {}
+        self.load_times = {}  # Seconds spent loading each model, for benchmarks
+
+    def register(self, name, loader):
+        """Register a zero-argument loader for a model."""
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def get(self, name):
+        """Return a model, loading it on first use (thread-safe, loads at most once)."""
+        if name in self._models:
+            return self._models[name]
+        with self._locks[name]:
+            if name not in self._models:
+                start = time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                self.load_times[name] = time.perf_counter() - start
+        return self._models[name]
+
+    def warm_up(self, names):
+        """Load models on a background thread so the first real use does not stall the UI."""
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"Warm-up of {name} failed: {e}")
+
+        thread = threading.Thread(target=load_all, name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+
+def ensure_nltk_data(resource, package):
+    """Download an NLTK package only if it is not already installed."""
+    import nltk
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(package, quiet=True)
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load(SPACY_MODEL)
+
+
+def _load_summarizer():
+    from transformers import pipeline
+    return pipeline("summarization", clean_up_tokenization_spaces=True)
+
+
+def _load_sentiment():
+    from transformers import pipeline
+    # device=-1 pins inference to the CPU
+    return pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english", device=-1)
+
+
+def _load_stopwords():
+    ensure_nltk_data("corpora/stopwords", "stopwords")
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+
+def _load_word_tokenize():
+    ensure_nltk_data("tokenizers/punkt", "punkt")
+    from nltk.tokenize import word_tokenize
+    return word_tokenize
+
+
+registry = ModelRegistry()
+registry.register("spacy", _load_spacy)
+registry.register("summarizer", _load_summarizer)
+registry.register("sentiment", _load_sentiment)
+registry.register("stopwords", _load_stopwords)
+registry.register("word_tokenize", _load_word_tokenize)
+
+# Models worth loading in the background once the main window is up
+WARM_UP_MODELS = ["stopwords", "word_tokenize", "spacy", "sentiment"]
+
+
+def get_nlp():
+    """Return the shared spaCy pipeline."""
+    return registry.get("spacy")
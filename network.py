@@ -0,0 +1,158 @@
+import random
+import threading
+import networkx as nx
+import numpy as np
+from settings import STORY_MATCHING, STORY_JACCARD_THRESHOLD, STORY_SIMILARITY_THRESHOLD
+from sources import SOURCE_COLORS
+from stories import StoryIndex, StoryClusterIndex
+
+ARTICLE_COLOR = "#CCCCCC"  # Light grey for shared articles
+
+
+class StoryNetwork:
+    """Graph of sources and the stories they share, kept up to date incrementally.
+
+    Each update applies only the matches that appeared or disappeared since the last
+    one. Stories are matched by headline words ("words") or by headline vectors
+    ("embeddings"). Node positions are cached: the spring layout reruns only after the
+    graph changes, warm-started from the previous positions with fewer iterations.
+    update and layout hold the network's lock, so tasks from successive views never
+    mutate it at the same time; hold it across both to apply them as one step.
+    """
+
+    def __init__(self, threshold=None, k=3.0, seed=42, matching=STORY_MATCHING):
+        if matching == "embeddings":
+            self.index = StoryClusterIndex(threshold if threshold is not None else STORY_SIMILARITY_THRESHOLD)
+        else:
+            self.index = StoryIndex(threshold if threshold is not None else STORY_JACCARD_THRESHOLD)
+        self.graph = nx.Graph()
+        self.labels = {}  # node -> full label shown on hover
+        self.node_types = {}  # node -> "source" or "article"
+        self.story_matches = {}  # article node -> set of matches it stands for
+        self.positions = {}
+        self.k = k
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.layout_stale = True
+        self.lock = threading.RLock()
+
+    def update(self, scraped_content):
+        """Bring the graph in line with {source: [articles]}; returns (matches added, matches removed)."""
+        with self.lock:
+            return self._update(scraped_content)
+
+    def _update(self, scraped_content):
+        added, removed = self.index.update(scraped_content)
+
+        for source in scraped_content:
+            if source not in self.graph:
+                self.graph.add_node(source, type="source", color=SOURCE_COLORS.get(source, ARTICLE_COLOR))
+                self.labels[source] = source
+                self.node_types[source] = "source"
+                self.layout_stale = True
+
+        # Each shared story is drawn as one node named after the first source's headline
+        changed_stories = set()
+        for match in removed:
+            self.story_matches.get(match[1], set()).discard(match)
+            changed_stories.add(match[1])
+        for match in added:
+            self.story_matches.setdefault(match[1], set()).add(match)
+            changed_stories.add(match[1])
+        for story in changed_stories:
+            self._refresh_story(story)
+
+        for source in [node for node, node_type in self.node_types.items()
+                       if node_type == "source" and node not in scraped_content]:
+            self._remove_node(source)
+
+        if added or removed:
+            self.layout_stale = True
+        return len(added), len(removed)
+
+    def _remove_node(self, node):
+        self.graph.remove_node(node)
+        self.labels.pop(node, None)
+        self.node_types.pop(node, None)
+        self.positions.pop(node, None)
+        self.layout_stale = True
+
+    def _refresh_story(self, story):
+        """Add, rewire or drop a story node to match the matches it still stands for."""
+        matches = self.story_matches.get(story)
+        if not matches:
+            self.story_matches.pop(story, None)
+            if story in self.graph:
+                self._remove_node(story)
+            return
+
+        if story not in self.graph:
+            self.graph.add_node(story, type="article", color=ARTICLE_COLOR)
+            self.labels[story] = story
+            self.node_types[story] = "article"
+        sources = {source for match in matches for source in (match[0], match[2])}
+        for source in list(self.graph[story]):
+            if source not in sources:
+                self.graph.remove_edge(source, story)
+        for source in sources:
+            if not self.graph.has_edge(source, story):
+                self.graph.add_edge(source, story, color=SOURCE_COLORS.get(source, ARTICLE_COLOR))
+
+    def layout(self, iterations=50, warm_iterations=15):
+        """Return node positions, recomputing them only if the graph changed since the last call."""
+        with self.lock:
+            return self._layout(iterations, warm_iterations)
+
+    def _layout(self, iterations, warm_iterations):
+        if not self.layout_stale:
+            return self.positions
+
+        initial = {node: self.positions[node] for node in self.graph if node in self.positions}
+        if not initial:
+            self.positions = nx.spring_layout(self.graph, k=self.k, seed=self.seed, iterations=iterations)
+            self.layout_stale = False
+            return self.positions
+
+        for node in self.graph:
+            if node in initial:
+                continue
+            # Start new nodes next to the nodes they connect to
+            placed = [initial[neighbour] for neighbour in self.graph[node] if neighbour in initial]
+            x = sum(position[0] for position in placed) / len(placed) if placed else 0.0
+            y = sum(position[1] for position in placed) / len(placed) if placed else 0.0
+            initial[node] = (x + self.random.uniform(-0.1, 0.1), y + self.random.uniform(-0.1, 0.1))
+        self.positions = nx.spring_layout(self.graph, k=self.k, pos=initial, seed=self.seed, iterations=warm_iterations)
+        self.layout_stale = False
+        return self.positions
+
+    def edge_segments(self):
+        """Edge endpoints and colors, ready for a single LineCollection."""
+        segments = [(self.positions[u], self.positions[v]) for u, v in self.graph.edges]
+        colors = [color for _, _, color in self.graph.edges(data="color")]
+        return segments, colors
+
+
+class PointGrid:
+    """Uniform grid over 2-D points for nearest-point lookups within a fixed radius."""
+
+    def __init__(self, points, radius):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.radius = radius
+        self.cells = {}
+        for point_id, cell in enumerate(map(tuple, np.floor(self.points / radius).astype(int))):
+            self.cells.setdefault(cell, []).append(point_id)
+
+    def nearest(self, x, y):
+        """Id of the closest point within radius on both axes of (x, y), or None."""
+        cell_x, cell_y = int(np.floor(x / self.radius)), int(np.floor(y / self.radius))
+        best, best_distance = None, None
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for point_id in self.cells.get((cell_x + dx, cell_y + dy), ()):
+                    offset_x = abs(self.points[point_id, 0] - x)
+                    offset_y = abs(self.points[point_id, 1] - y)
+                    if offset_x < self.radius and offset_y < self.radius:
+                        distance = offset_x * offset_x + offset_y * offset_y
+                        if best is None or distance < best_distance:
+                            best, best_distance = point_id, distance
+        return best
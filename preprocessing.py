@@ -0,0 +1,84 @@
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from models import registry
+from utils import content_hash
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# token_ids: every lowercase word token, in order; content_ids: the alphanumeric ones minus stop words
+ProcessedHeadline = namedtuple("ProcessedHeadline", ["token_ids", "content_ids"])
+
+
+class Preprocessor:
+    """Tokenise each headline once into token ids, memoised by content hash with LRU eviction.
+
+    Topic modelling, the report and story matching all read from this cache,
+    so a headline is never tokenised twice while it stays in the cache.
+    """
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self.token_to_id = {}
+        self.id_to_token = []
+        self._cache = OrderedDict()  # content hash -> ProcessedHeadline
+        self._lock = threading.Lock()
+
+    def _token_id(self, token):
+        token_id = self.token_to_id.get(token)
+        if token_id is None:
+            token_id = len(self.id_to_token)
+            self.token_to_id[token] = token_id
+            self.id_to_token.append(token)
+        return token_id
+
+    def process(self, text):
+        """Return the ProcessedHeadline for text, tokenising it only on a cache miss."""
+        key = content_hash(text)
+        with self._lock:
+            processed = self._cache.get(key)
+            if processed is not None:
+                self._cache.move_to_end(key)
+                return processed
+
+        stop_words = registry.get("stopwords")
+        word_tokenize = registry.get("word_tokenize")
+        tokens = []  # (word, counts for topic modelling)
+        for word in word_tokenize(text.lower()):
+            if word.isalnum():
+                tokens.append((word, word not in stop_words))
+            else:
+                # Keep the word parts of "covid-19" or "u.s." for story matching, but out of topic models as before
+                tokens.extend((piece, False) for piece in WORD_PATTERN.findall(word))
+
+        with self._lock:
+            token_ids = tuple(self._token_id(word) for word, _ in tokens)
+            content_ids = tuple(
+                token_id for (_, is_content), token_id in zip(tokens, token_ids) if is_content
+            )
+            processed = ProcessedHeadline(token_ids, content_ids)
+            self._cache[key] = processed
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return processed
+
+    def process_many(self, texts):
+        return [self.process(text) for text in texts]
+
+    def words(self, token_ids):
+        """Map token ids back to their strings."""
+        return [self.id_to_token[token_id] for token_id in token_ids]
+
+
+preprocessor = Preprocessor()
+
+
+def preprocess_articles(articles):
+    """Preprocess articles for topic modeling."""
+    return [preprocessor.words(processed.content_ids) for processed in preprocessor.process_many(articles)]
+
+
+def headline_tokens(text):
+    """Set of a headline's token ids, used for word-overlap comparisons."""
+    return frozenset(preprocessor.process(text).token_ids)
+
@@ -0,0 +1,261 @@
+"""Build the news analysis report from cached, content-addressed sections.
+
+Each section is keyed by a hash of exactly the inputs it depends on (the article
+counts, the headline hashes, ...) and of the settings that shape it (topic model
+parameters, story similarity threshold), and its rendered HTML is kept in memory and on
+disk. Regenerating a report therefore only recomputes the sections whose inputs
+changed since any earlier report, in this process or a previous one.
+
+No Qt is needed to build a report or write it as HTML; writing a PDF uses WeasyPrint
+when it is installed and falls back to Qt's offscreen text renderer otherwise.
+"""
+import html
+import json
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+from string import Template
+from models import SPACY_MODEL
+from settings import (
+    CACHE_DIR, LDA_NUM_TOPICS, LDA_PASSES, LDA_WORKERS, LDA_CONVERGENCE_TOL, LDA_PERPLEXITY_SAMPLE,
+    LDA_MULTICORE_MIN_DOCS, STORY_SIMILARITY_THRESHOLD
+)
+from utils import atomic_write, content_hash
+
+REPORT_CACHE_DIR = os.path.join(CACHE_DIR, "report_sections")
+REPORT_VERSION = 2  # Bump when a section's markup changes so cached sections are rebuilt
+REPORT_TOP_STORIES = 10  # Shared stories listed in the report
+
+PAGE_TEMPLATE = Template("""<html>
+<head>
+<meta charset="utf-8">
+<style>
+body { font-family: Arial, sans-serif; margin: 20px; }
+h1, h2, h3 { color: #2c3e50; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }
+table, th, td { border: 1px solid #ddd; }
+th, td { padding: 8px; text-align: left; }
+th { background-color: #f4f4f4; }
+.section { margin-bottom: 30px; }
+</style>
+</head>
+<body>
+<h1>News Analysis Report</h1>
+<p><b>Date:</b> $date</p>
+$sections
+</body></html>""")
+SECTION_TEMPLATE = Template("<div class='section'><h2>$title</h2>\n$body\n</div>")
+
+# inputs(hashes) returns what the section depends on; render(content, progress) returns its HTML body;
+# settings holds the configuration values render depends on, so changing one rebuilds the section
+Section = namedtuple("Section", ["name", "title", "inputs", "render", "settings"], defaults=({},))
+
+TOPIC_SETTINGS = {
+    "num_topics": LDA_NUM_TOPICS,
+    "passes": LDA_PASSES,
+    "workers": LDA_WORKERS,
+    "multicore_min_docs": LDA_MULTICORE_MIN_DOCS,
+    "convergence_tol": LDA_CONVERGENCE_TOL,
+    "perplexity_sample": LDA_PERPLEXITY_SAMPLE,
+}
+STORY_SETTINGS = {"similarity_threshold": STORY_SIMILARITY_THRESHOLD, "spacy_model": SPACY_MODEL}
+
+
+def _table(header, rows):
+    cells = "".join(f"<th>{html.escape(str(cell))}</th>" for cell in header)
+    lines = [f"<table><tr>{cells}</tr>"]
+    for row in rows:
+        lines.append("<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>")
+    lines.append("</table>")
+    return "\n".join(lines)
+
+
+def _counts(hashes):
+    return {source: len(source_hashes) for source, source_hashes in hashes.items()}
+
+
+def _headlines(hashes):
+    """Order-insensitive description of which headlines each source has."""
+    return {source: sorted(source_hashes) for source, source_hashes in hashes.items()}
+
+
+def _all_headlines(hashes):
+    return sorted({h for source_hashes in hashes.values() for h in source_hashes})
+
+
+def render_count(content, progress):
+    total = sum(len(articles) for articles in content.values())
+    return f"<p>Total Articles Scraped: <b>{total}</b></p>"
+
+
+def render_sources(content, progress):
+    return _table(["Source", "Articles Scraped"], [(source, len(articles)) for source, articles in content.items()])
+
+
+def render_topics(content, progress):
+    from topics import topic_model_cache, label_topics, describe_topic_run
+    articles = [article for source_articles in content.values() for article in source_articles]
+    if not articles:
+        return "<p>No articles available for topic analysis.</p>"
+    lda_model, run = topic_model_cache.get_model(
+        articles, progress=lambda done, total: progress(done, total, f"Topic model pass {done + 1} of {total}")
+    )
+    lines = [f"<p><i>{html.escape(describe_topic_run(run))}</i></p>", "<ul>"]
+    for idx, (label, _, keywords) in enumerate(label_topics(lda_model)):
+        lines.append(f"<li><b>Topic {idx + 1} ({html.escape(label)}):</b> {html.escape(', '.join(keywords))}</li>")
+    lines.append("</ul>")
+    return "\n".join(lines)
+
+
+def render_sentiment(content, progress):
+    from sentiment import sentiment_service
+    articles = [article for source_articles in content.values() for article in source_articles]
+    labels = sentiment_service.analyze_many(
+        articles, progress=lambda done, total: progress(done, total, "Scoring sentiment")
+    )
+    rows, positive_total = [], 0
+    for source, source_articles in content.items():
+        positive = sum(1 for article in source_articles if labels[article] == "positive")
+        positive_total += positive
+        share = f"{positive / len(source_articles):.0%}" if source_articles else "-"
+        rows.append((source, positive, len(source_articles) - positive, share))
+    share = f"{positive_total / len(articles):.0%}" if articles else "-"
+    rows.append(("All Sources", positive_total, len(articles) - positive_total, share))
+    return _table(["Source", "Positive", "Negative", "Positive Share"], rows)
+
+
+def render_stories(content, progress):
+    from stories import find_story_clusters
+    clusters = find_story_clusters(content)
+    body = f"<p>Stories covered by more than one source: <b>{len(clusters)}</b></p>"
+    if clusters:
+        body += "\n" + _table(["Story", "Sources"], [
+            (cluster.members[0][1], ", ".join(cluster.sources)) for cluster in clusters[:REPORT_TOP_STORIES]
+        ])
+    return body
+
+
+SECTIONS = [
+    Section("count", "Aggregated Scrape Count", _counts, render_count),
+    Section("sources", "Scraped Content Summary", _counts, render_sources),
+    Section("topics", "Topic Analysis", _all_headlines, render_topics, TOPIC_SETTINGS),
+    Section("sentiment", "Sentiment Breakdown", _headlines, render_sentiment),
+    Section("stories", "Shared Stories", _headlines, render_stories, STORY_SETTINGS),
+]
+
+
+class ReportBuilder:
+    """Renders reports, reusing every section whose inputs are unchanged.
+
+    Rendered sections are cached in memory (LRU) and as small HTML files on disk,
+    at most max_files per section, so the GUI and scheduled headless runs share them.
+    """
+
+    def __init__(self, sections=SECTIONS, cache_dir=REPORT_CACHE_DIR, max_cached=64, max_files=32):
+        self.sections = sections
+        self.cache_dir = cache_dir
+        self.max_cached = max_cached
+        self.max_files = max_files
+        self._memory = OrderedDict()  # (section name, key) -> HTML
+        self._lock = threading.Lock()
+
+    def section_key(self, section, hashes):
+        inputs = json.dumps([REPORT_VERSION, section.name, section.inputs(hashes), section.settings],
+                            ensure_ascii=False, sort_keys=True)
+        return content_hash(inputs)
+
+    def _path(self, name, key):
+        return os.path.join(self.cache_dir, f"{name}-{key}.html")
+
+    def _load(self, name, key):
+        with self._lock:
+            if (name, key) in self._memory:
+                self._memory.move_to_end((name, key))
+                return self._memory[(name, key)]
+        try:
+            with open(self._path(name, key), encoding="utf-8") as file:
+                body = file.read()
+        except OSError:
+            return None
+        self._remember(name, key, body)
+        return body
+
+    def _remember(self, name, key, body):
+        with self._lock:
+            self._memory[(name, key)] = body
+            self._memory.move_to_end((name, key))
+            while len(self._memory) > self.max_cached:
+                self._memory.popitem(last=False)
+
+    def _save(self, name, key, body):
+        self._remember(name, key, body)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with atomic_write(self._path(name, key)) as file:
+            file.write(body)
+
+        # Keep only the newest files of this section
+        prefix = f"{name}-"
+        files = [entry for entry in os.scandir(self.cache_dir)
+                 if entry.name.startswith(prefix) and entry.name.endswith(".html")]
+        if len(files) > self.max_files:
+            files.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in files[:len(files) - self.max_files]:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def build(self, content, progress=None, date=None):
+        """Return the report HTML for {source: [articles]}.
+
+        progress(done, total, message) is called before each section that has to be
+        rendered and is passed on to the slow ones (topic model passes, sentiment
+        batches); it may raise to abandon the report.
+        """
+        progress = progress or (lambda done, total, message="": None)
+        hashes = {source: [content_hash(article) for article in articles] for source, articles in content.items()}
+        parts = []
+        for done, section in enumerate(self.sections):
+            key = self.section_key(section, hashes)
+            body = self._load(section.name, key)
+            if body is None:
+                progress(done, len(self.sections), f"Building {section.title.lower()}")
+                body = section.render(content, progress)
+                self._save(section.name, key, body)
+            parts.append(SECTION_TEMPLATE.substitute(title=html.escape(section.title), body=body))
+        date = date or datetime.now()
+        return PAGE_TEMPLATE.substitute(date=date.strftime("%B %d, %Y"), sections="\n".join(parts))
+
+
+def write_html(report_html, path):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(report_html)
+    return path
+
+
+def write_pdf(report_html, path):
+    """Render the report to an A4 PDF without a display."""
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        HTML = None
+    if HTML is not None:
+        HTML(string=report_html).write_pdf(path)
+        return path
+
+    # Qt's rich-text renderer handles the report's simple markup and needs no window or WebEngine
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtGui import QGuiApplication, QPageSize, QPdfWriter, QTextDocument
+    app = QGuiApplication.instance() or QGuiApplication([])
+    writer = QPdfWriter(path)
+    writer.setPageSize(QPageSize(QPageSize.A4))
+    document = QTextDocument()
+    document.setHtml(report_html)
+    document.print_(writer)
+    app.processEvents()
+    return path
+
+
+# Shared so the GUI reuses sections across reports
+report_builder = ReportBuilder()
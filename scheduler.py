@@ -0,0 +1,201 @@
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from settings import (
+    SCRAPE_MAX_ATTEMPTS, SCRAPE_BACKOFF_BASE, SCRAPE_BACKOFF_MAX, SCRAPE_HOST_CONCURRENCY,
+    SCRAPE_HOST_MIN_INTERVAL, SCRAPE_BREAKER_THRESHOLD, SCRAPE_BREAKER_COOLDOWN
+)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class Deadline:
+    """Time budget shared by every fetch of one scrape run; can also be cancelled early."""
+
+    def __init__(self, timeout=None):
+        self.expires_at = None if timeout is None else time.monotonic() + timeout
+        self._cancelled = threading.Event()
+
+    def remaining(self):
+        """Seconds left (None means unlimited); 0 once expired or cancelled."""
+        if self._cancelled.is_set():
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() == 0.0
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def wait(self, seconds):
+        """Sleep up to seconds, waking early on cancellation. Returns False if the run is over."""
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        if seconds > 0:
+            self._cancelled.wait(seconds)
+        return not self.expired()
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n waits uniform(0, min(max_delay, base * 2**n)).
+
+    max_attempts counts every request made, the first one included.
+    """
+
+    def __init__(self, max_attempts=SCRAPE_MAX_ATTEMPTS, base_delay=SCRAPE_BACKOFF_BASE, max_delay=SCRAPE_BACKOFF_MAX):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            # Never retry sooner than the server asked, but still respect the cap
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class HostState:
+    """Concurrency slots, request pacing and circuit breaker for one host."""
+
+    def __init__(self, concurrency, min_interval):
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.min_interval = min_interval
+        self.next_request_at = 0.0
+        self.failures = 0  # Consecutive failures
+        self.open_until = 0.0  # Circuit is open (requests fail fast) until this time
+        self.probing = False  # Half-open: one trial request is in flight
+        self.lock = threading.Lock()
+
+
+class FetchScheduler:
+    """Run fetches with retries, backoff, per-host limits and circuit breakers.
+
+    Every wait happens in the calling worker thread and is bounded by the run's
+    Deadline, so a slow or failing host never holds up the rest of a batch.
+    """
+
+    def __init__(self, concurrency=SCRAPE_HOST_CONCURRENCY, min_interval=SCRAPE_HOST_MIN_INTERVAL,
+                 breaker_threshold=SCRAPE_BREAKER_THRESHOLD, breaker_cooldown=SCRAPE_BREAKER_COOLDOWN):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, url):
+        name = urlsplit(url).netloc.lower()
+        with self._lock:
+            if name not in self.hosts:
+                self.hosts[name] = HostState(self.concurrency, self.min_interval)
+            return name, self.hosts[name]
+
+    def _check_circuit(self, name, state):
+        """Fail fast while a host's circuit is open; after the cooldown let a single probe through."""
+        with state.lock:
+            if state.failures < self.breaker_threshold:
+                return
+            if time.monotonic() < state.open_until or state.probing:
+                raise Exception(f"{name} is failing repeatedly; skipping it for now (circuit open).")
+            state.probing = True
+
+    def _acquire(self, name, state, deadline):
+        """Take a concurrency slot and the host's next request slot, within the deadline."""
+        # remaining() is None without a deadline, which makes acquire block until a slot frees up
+        if not state.slots.acquire(timeout=deadline.remaining()):
+            raise Exception(f"Run deadline reached while waiting for {name}.")
+        with state.lock:
+            start_at = max(time.monotonic(), state.next_request_at)
+            state.next_request_at = start_at + state.min_interval
+        if not deadline.wait(start_at - time.monotonic()):
+            state.slots.release()
+            raise Exception(f"Run deadline reached while waiting for {name}.")
+
+    def _record(self, state, success):
+        with state.lock:
+            state.probing = False
+            if success:
+                state.failures = 0
+            else:
+                state.failures += 1
+                if state.failures >= self.breaker_threshold:
+                    state.open_until = time.monotonic() + self.breaker_cooldown
+
+    def call(self, url, fetch, policy=None, deadline=None, timeout=10):
+        """Return fetch(timeout) for url, retrying transient failures with backoff.
+
+        Connection errors, timeouts and 429/5xx responses are retried; other HTTP
+        errors are raised at once. The per-request timeout is capped by what is
+        left of the deadline.
+        """
+        policy = policy or RetryPolicy()
+        deadline = deadline or Deadline()
+        name, state = self.host(url)
+
+        for attempt in range(max(1, policy.max_attempts)):
+            self._check_circuit(name, state)
+            try:
+                self._acquire(name, state, deadline)
+            except Exception:
+                with state.lock:
+                    state.probing = False
+                raise
+            remaining = deadline.remaining()
+            try:
+                result = fetch(timeout if remaining is None else min(timeout, remaining))
+            except requests.exceptions.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                retryable = status is None or status in RETRY_STATUS_CODES
+                # A plain 4xx means the host is up; only transient failures count against it
+                self._record(state, success=not retryable)
+                if not retryable:
+                    raise
+                error = e
+                retry_after = _retry_after(e.response)
+            except Exception:
+                # The host answered but the page could not be parsed; retrying will not help
+                self._record(state, success=True)
+                raise
+            else:
+                self._record(state, success=True)
+                return result
+            finally:
+                state.slots.release()
+
+            if attempt < policy.max_attempts - 1:
+                delay = policy.delay(attempt, retry_after)
+                remaining = deadline.remaining()
+                if remaining is not None and delay >= remaining:
+                    break
+                print(f"{name}: attempt {attempt + 1} failed. Retrying in {delay:.1f} seconds...")
+                if not deadline.wait(delay):
+                    break
+        raise Exception(f"Failed to fetch {url} after {attempt + 1} attempts. Error: {error}")
+
+
+def _retry_after(response):
+    """Seconds requested by a Retry-After header, if any."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Shared by every scraper so host limits and circuit breakers hold across runs
+scheduler = FetchScheduler()
@@ -0,0 +1,90 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
+from scheduler import Deadline
+from settings import SCRAPE_RUN_TIMEOUT
+
+
+class ScrapeEngine:
+    """Run several scrapers at once so a full run costs about as much as the slowest source."""
+
+    def __init__(self, max_workers=6, run_timeout=SCRAPE_RUN_TIMEOUT):
+        self.max_workers = max_workers
+        self.run_timeout = run_timeout
+        self.deadline = None
+
+    def cancel(self):
+        """Stop the current run: pending retries are abandoned and unfinished sources reported as failed."""
+        if self.deadline is not None:
+            self.deadline.cancel()
+
+    def run(self, scrapers, on_started=None, on_result=None, on_error=None):
+        """Run (name, scraper) pairs concurrently and report each source as it finishes.
+
+        Each scraper is called with the run's Deadline. Callbacks are invoked from the
+        calling thread, in completion order; sources unfinished when the deadline
+        passes, or whose on_result raises, are reported through on_error instead.
+        Returns a tuple of ({name: articles}, {name: error message}, elapsed seconds).
+        """
+        results = {}
+        errors = {}
+        start = time.perf_counter()
+        if not scrapers:
+            return results, errors, 0.0
+
+        self.deadline = deadline = Deadline(self.run_timeout)
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(scrapers)))
+        futures = {}
+        for name, scraper in scrapers:
+            if on_started:
+                on_started(name)
+            futures[executor.submit(scraper, deadline)] = name
+
+        try:
+            for future in _completed(futures, deadline):
+                name = futures.pop(future)
+                try:
+                    articles = future.result()
+                except Exception as e:
+                    errors[name] = str(e)
+                    if on_error:
+                        on_error(name, str(e))
+                else:
+                    try:
+                        if on_result:
+                            on_result(name, articles)
+                    except Exception as e:
+                        # e.g. recording the source failed; the other sources still get reported
+                        errors[name] = str(e)
+                        if on_error:
+                            on_error(name, str(e))
+                    else:
+                        results[name] = articles
+        except TimeoutError:
+            pass
+        finally:
+            # Stragglers finish in the background; their results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for name in futures.values():
+            message = "Scrape cancelled." if deadline.cancelled() else "Run deadline reached before this source finished."
+            errors[name] = message
+            if on_error:
+                on_error(name, message)
+
+        return results, errors, time.perf_counter() - start
+
+
+def _completed(futures, deadline):
+    """as_completed that also gives up when the deadline expires or the run is cancelled."""
+    pending = set(futures)
+    while pending:
+        remaining = deadline.remaining()
+        if remaining == 0.0:
+            raise TimeoutError()
+        try:
+            # Poll so a cancellation is noticed even without a time budget
+            for future in as_completed(pending, timeout=0.5 if remaining is None else min(0.5, remaining)):
+                pending.discard(future)
+                yield future
+        except TimeoutError:
+            continue
@@ -0,0 +1,146 @@
+import re
+import sys
+from bisect import bisect_left
+import numpy as np
+from embeddings import embedder as default_embedder
+
+# A word with any inner apostrophes, e.g. "can't" or "Duterte’s"
+WORD_PATTERN = re.compile(r"\w+(?:['\u2019]\w+)*")
+APOSTROPHES = re.compile(r"['\u2019]")
+
+
+def search_tokens(text):
+    """Lowercase search tokens of a headline or query, in order.
+
+    Headlines and queries go through the same tokeniser so that they always agree.
+    A word with apostrophes gives its parts and the word without apostrophes, so
+    "can't" is found by "can't", "can" and "cant".
+    """
+    tokens = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        parts = APOSTROPHES.split(word)
+        tokens.extend(parts)
+        if len(parts) > 1:
+            tokens.append("".join(parts))
+    return tokens
+
+
+class HeadlineIndex:
+    """In-memory token and prefix index over headlines.
+
+    A headline matches a query when every query word is a prefix of one of its
+    words, so results narrow as the user types. Results for a query that extends
+    the previous one are computed from the previous results instead of from scratch.
+    """
+
+    def __init__(self, articles, max_cached_prefixes=2048):
+        self.articles = list(articles)
+        self.postings = {}  # token -> set of article ids
+        for article_id, article in enumerate(self.articles):
+            for token in search_tokens(article):
+                self.postings.setdefault(token, set()).add(article_id)
+        self.sorted_tokens = sorted(self.postings)
+        self.max_cached_prefixes = max_cached_prefixes
+        self._prefix_cache = {}
+        self._last_query = None
+        self._last_result = None
+
+    def approximate_size(self):
+        """Rough number of bytes held by the headlines and postings, for the task result cache."""
+        size = sum(sys.getsizeof(article) for article in self.articles) + sys.getsizeof(self.sorted_tokens)
+        for token, ids in self.postings.items():
+            size += sys.getsizeof(token) + sys.getsizeof(ids)
+        return size
+
+    def prefix_ids(self, prefix):
+        """Ids of articles containing a word that starts with prefix."""
+        if prefix in self._prefix_cache:
+            return self._prefix_cache[prefix]
+        ids = set()
+        position = bisect_left(self.sorted_tokens, prefix)
+        while position < len(self.sorted_tokens) and self.sorted_tokens[position].startswith(prefix):
+            ids |= self.postings[self.sorted_tokens[position]]
+            position += 1
+        if len(self._prefix_cache) >= self.max_cached_prefixes:
+            self._prefix_cache.clear()
+        self._prefix_cache[prefix] = ids
+        return ids
+
+    def search(self, query):
+        """Return the set of article ids matching query (None means no filtering)."""
+        words = search_tokens(query)
+        if not words:
+            return None
+
+        if self._last_query is not None and query.startswith(self._last_query):
+            # Refinement: a longer query can only match a subset of the previous results,
+            # which already satisfy every word the previous query had
+            previous_words = set(search_tokens(self._last_query))
+            result = set(self._last_result)
+            for word in words:
+                if word not in previous_words:
+                    result &= self.prefix_ids(word)
+        else:
+            # Intersect the rarest words first to keep the working set small
+            word_ids = sorted((self.prefix_ids(word) for word in words), key=len)
+            result = set(word_ids[0])
+            for ids in word_ids[1:]:
+                result &= ids
+
+        self._last_query, self._last_result = query, result
+        return result
+
+
+class SemanticIndex:
+    """Ranks headlines by meaning: cosine similarity of their vectors to the query's.
+
+    Headline vectors come from the memory-mapped VectorStore, so building the index
+    only embeds headlines never seen before; a query is embedded once and scored
+    against every headline with a single matrix-vector product over the mapped store.
+    """
+
+    def __init__(self, articles, embedder=default_embedder):
+        self.embedder = embedder
+        self.rows = embedder.rows(list(articles))  # Store row of each article
+        self.matrix = embedder.store.vectors()
+        if len(self.rows) * 2 < len(self.matrix):
+            # Much smaller than the store: score a private copy of just these rows
+            self.matrix = self.matrix[self.rows]
+            self.rows = None
+        self._last_query = None
+        self._last_scores = None
+
+    def approximate_size(self):
+        """Bytes of the private row copy or row numbers; the mapped store itself is shared, not counted."""
+        return self.matrix.nbytes if self.rows is None else self.rows.nbytes
+
+    def scores(self, query):
+        """Similarity of every article to query, or None if no query word has a vector."""
+        if query == self._last_query:
+            return self._last_scores
+        vector = self.embedder.embed_query(query)
+        scores = None
+        if vector.any():
+            scores = self.matrix @ vector
+            if self.rows is not None:
+                scores = scores[self.rows]
+        self._last_query, self._last_scores = query, scores
+        return scores
+
+    def search(self, query, k, candidates=None):
+        """Return up to k article ids, best match first, chosen among candidates (all articles if None)."""
+        scores = self.scores(query)
+        if scores is None:
+            return []
+        if candidates is None:
+            candidates = np.arange(len(scores))
+        else:
+            candidates = np.asarray(candidates, dtype=np.int64)
+            scores = scores[candidates]
+        if len(candidates) > k:
+            # Select the k best without sorting the rest, then order just those
+            best = np.argpartition(-scores, k)[:k]
+        else:
+            best = np.arange(len(candidates))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return candidates[best].tolist()
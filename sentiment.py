@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from models import registry
+from settings import CACHE_DIR, SENTIMENT_BATCH_SIZE, SQLITE_MAX_PARAMS
+from utils import content_hash
+
+SENTIMENT_DB_PATH = os.path.join(CACHE_DIR, "sentiment.sqlite3")
+
+
+class SentimentService:
+    """Process-wide sentiment scoring with batched inference and a persistent SQLite cache.
+
+    Results are keyed by the content hash of each headline, so anything scored in an
+    earlier scrape (or an earlier session) is never sent through the model again.
+    The most recently used labels are also kept in memory, up to max_memory of them.
+    """
+
+    def __init__(self, db_path=SENTIMENT_DB_PATH, batch_size=SENTIMENT_BATCH_SIZE, max_memory=100000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.max_memory = max_memory
+        self._memory = OrderedDict()  # content hash -> "positive" / "negative", least recently used first
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment (hash TEXT PRIMARY KEY, label TEXT NOT NULL)"
+            )
+        return self._connection
+
+    def _load_cached(self, hashes):
+        """Return {hash: label} for the given hashes that are on disk."""
+        connection = self._connect()
+        labels = {}
+        for start in range(0, len(hashes), SQLITE_MAX_PARAMS):
+            chunk = hashes[start:start + SQLITE_MAX_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = connection.execute(
+                f"SELECT hash, label FROM sentiment WHERE hash IN ({placeholders})", chunk
+            )
+            labels.update(rows)
+        return labels
+
+    def _remember(self, labels):
+        for h, label in labels.items():
+            self._memory[h] = label
+            self._memory.move_to_end(h)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    def _infer(self, texts, progress=None):
+        """Run the model over texts in batches and return their labels in order."""
+        analyzer = registry.get("sentiment")
+        labels = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = [text[:512] for text in texts[start:start + self.batch_size]]  # DistilBERT max length
+            results = analyzer(batch, batch_size=self.batch_size, truncation=True)
+            labels.extend("positive" if result['label'] == "POSITIVE" else "negative" for result in results)
+            if progress:
+                progress(len(labels), len(texts))
+        return labels
+
+    def analyze_many(self, texts, progress=None):
+        """Return {text: label} for texts, scoring only those never seen before.
+
+        progress(scored, to_score) is called after each inference batch.
+        """
+        hashes = {text: content_hash(text) for text in texts}
+        with self._lock:
+            # Labels are collected here rather than read back from the bounded memory,
+            # which may evict some of them when texts is larger than max_memory
+            labels = {h: self._memory[h] for h in set(hashes.values()) if h in self._memory}
+            unknown = [h for h in set(hashes.values()) if h not in labels]
+            if unknown:
+                labels.update(self._load_cached(unknown))
+
+            pending = {}
+            for text, h in hashes.items():
+                if h not in labels and h not in pending:
+                    pending[h] = text
+            if pending:
+                scored = list(zip(pending.keys(), self._infer(list(pending.values()), progress)))
+                labels.update(scored)
+                connection = self._connect()
+                with connection:
+                    connection.executemany("INSERT OR REPLACE INTO sentiment VALUES (?, ?)", scored)
+
+            self._remember(labels)
+            return {text: labels[h] for text, h in hashes.items()}
+
+    def analyze(self, text):
+        """Return the sentiment label of a single headline."""
+        return self.analyze_many([text])[text]
+
+
+sentiment_service = SentimentService()
@@ -0,0 +1,54 @@
+import os
+
+# Directory for on-disk caches (HTTP responses, model indexes, article history)
+CACHE_DIR = os.environ.get("NEWSNET_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".newsnet"))
+
+# Number of headlines sent through the sentiment model per inference call
+SENTIMENT_BATCH_SIZE = int(os.environ.get("NEWSNET_SENTIMENT_BATCH_SIZE", "32"))
+
+# Minimum Jaccard similarity of two headlines' word sets to count as the same story
+STORY_JACCARD_THRESHOLD = float(os.environ.get("NEWSNET_STORY_JACCARD_THRESHOLD", "0.25"))
+
+# Topic modelling (LDA) parameters; workers > 1 trains corpora of at least
+# LDA_MULTICORE_MIN_DOCS documents with LdaMulticore
+LDA_NUM_TOPICS = int(os.environ.get("NEWSNET_LDA_NUM_TOPICS", "5"))
+LDA_PASSES = int(os.environ.get("NEWSNET_LDA_PASSES", "15"))
+LDA_WORKERS = int(os.environ.get("NEWSNET_LDA_WORKERS", str(max(1, (os.cpu_count() or 1) - 1))))
+# LdaMulticore hands out chunks of 2000 documents, so a smaller corpus trains on one worker at
+# about 1.6x the cost of LdaModel (benchmarks/topic_training.py); from two chunks the work is split
+LDA_MULTICORE_MIN_DOCS = int(os.environ.get("NEWSNET_LDA_MULTICORE_MIN_DOCS", "4000"))
+# Stop training early once a pass improves perplexity by less than this fraction
+LDA_CONVERGENCE_TOL = float(os.environ.get("NEWSNET_LDA_CONVERGENCE_TOL", "0.001"))
+# Documents the convergence check measures perplexity on; the full corpus costs as much as a pass
+LDA_PERPLEXITY_SAMPLE = int(os.environ.get("NEWSNET_LDA_PERPLEXITY_SAMPLE", "500"))
+
+# SQLite database holding every scraped headline with its first/last-seen times
+ARTICLE_DB_PATH = os.environ.get("NEWSNET_ARTICLE_DB", os.path.join(CACHE_DIR, "articles.sqlite3"))
+# Largest number of "?" placeholders per query, below SQLite's default host-parameter limit
+SQLITE_MAX_PARAMS = 900
+
+# Scrape scheduling: retries with exponential backoff, per-host limits and circuit breakers
+SCRAPE_MAX_ATTEMPTS = int(os.environ.get("NEWSNET_SCRAPE_MAX_ATTEMPTS", "3"))  # First request included
+SCRAPE_BACKOFF_BASE = float(os.environ.get("NEWSNET_SCRAPE_BACKOFF_BASE", "1.0"))  # Seconds
+SCRAPE_BACKOFF_MAX = float(os.environ.get("NEWSNET_SCRAPE_BACKOFF_MAX", "30"))
+SCRAPE_HOST_CONCURRENCY = int(os.environ.get("NEWSNET_SCRAPE_HOST_CONCURRENCY", "2"))
+SCRAPE_HOST_MIN_INTERVAL = float(os.environ.get("NEWSNET_SCRAPE_HOST_MIN_INTERVAL", "1.0"))  # Seconds between requests to a host
+# Consecutive failures after which a host is skipped for the cooldown (seconds)
+SCRAPE_BREAKER_THRESHOLD = int(os.environ.get("NEWSNET_SCRAPE_BREAKER_THRESHOLD", "5"))
+SCRAPE_BREAKER_COOLDOWN = float(os.environ.get("NEWSNET_SCRAPE_BREAKER_COOLDOWN", "300"))
+# Time budget for a whole scrape run; sources still pending when it runs out are reported as failed
+SCRAPE_RUN_TIMEOUT = float(os.environ.get("NEWSNET_SCRAPE_RUN_TIMEOUT", "60"))
+
+# Story matching for the network view: "words" (Jaccard over headline words) or "embeddings"
+# (cosine similarity of headline vectors, which also catches paraphrases)
+STORY_MATCHING = os.environ.get("NEWSNET_STORY_MATCHING", "words")
+# Minimum cosine similarity of two headline vectors to count as the same story
+STORY_SIMILARITY_THRESHOLD = float(os.environ.get("NEWSNET_STORY_SIMILARITY_THRESHOLD", "0.9"))
+# Number of headlines sent through the spaCy tokenizer per batch when embedding
+EMBEDDING_BATCH_SIZE = int(os.environ.get("NEWSNET_EMBEDDING_BATCH_SIZE", "256"))
+
+# Approximate memory (bytes) the GUI may spend keeping finished task results for reuse
+TASK_CACHE_MAX_BYTES = int(os.environ.get("NEWSNET_TASK_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Memory-mapped store of headline vectors, shared by every process using the same cache directory
+VECTOR_STORE_DIR = os.environ.get("NEWSNET_VECTOR_STORE_DIR", os.path.join(CACHE_DIR, "vectors"))
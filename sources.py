@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from fetching import fetcher
+from scheduler import scheduler, RetryPolicy
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+SOURCES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sources.json")
+DEFAULT_COLOR = "#CCCCCC"
+WHITESPACE = re.compile(r"\s*")
+SIMPLE_SELECTOR = re.compile(r"^[\w-]+(?:[.#][\w-]+|\[[^\]]+\])*$")  # One compound selector, no combinators
+# Fields each extraction type needs, and the settings a retry policy accepts
+EXTRACT_FIELDS = {"css": ("selectors",), "json_script": ("marker", "title_field", "date_field")}
+RETRY_FIELDS = ("max_attempts", "base_delay", "max_delay")
+
+
+class Source:
+    """A news source described declaratively in sources.json."""
+
+    def __init__(self, name, config):
+        check_config(name, config)
+        self.name = name
+        self.url = config["url"]
+        self.color = config.get("color", DEFAULT_COLOR)
+        self.extract = config["extract"]
+        self.cache_key = rule_cache_key(self.url, self.extract)
+        retry = config.get("retry", {})
+        self.retry_policy = RetryPolicy(**retry)
+
+    def parse(self, content):
+        """Extract headlines (or, for JSON rules, today's items with their dates) from a fetched page."""
+        if self.extract["type"] == "css":
+            return extract_css(content, self.extract)
+        if self.extract["type"] == "json_script":
+            return extract_json_script(content, self.extract)
+        raise Exception(f"Unknown extraction type for {self.name}: {self.extract['type']}")
+
+    def scrape(self, deadline=None):
+        """Fetch and extract this source's headlines through the shared fetch scheduler."""
+        result = scheduler.call(
+            self.url,
+            lambda timeout: fetcher.fetch_headlines(self.url, self.parse, key=self.cache_key, timeout=timeout),
+            policy=self.retry_policy,
+            deadline=deadline,
+            timeout=fetcher.timeout
+        )
+        if self.extract["type"] == "json_script":
+            # Filter again: a 304 can hand back items cached on an earlier day
+            return filter_todays_items(result, self.extract)
+        return result
+
+
+def check_config(name, config):
+    """Raise an Exception naming the source if its sources.json entry is incomplete or unknown."""
+    for field in ("url", "extract"):
+        if field not in config:
+            raise Exception(f"Source {name} in sources.json has no \"{field}\".")
+    extract_type = config["extract"].get("type")
+    if extract_type not in EXTRACT_FIELDS:
+        raise Exception(f"Source {name} in sources.json has an unknown extraction type: {extract_type}")
+    for field in EXTRACT_FIELDS[extract_type]:
+        if not config["extract"].get(field):
+            raise Exception(f"Source {name} in sources.json needs \"{field}\" for {extract_type} extraction.")
+    for exclusion in config["extract"].get("exclude", []):
+        if "selector" not in exclusion:
+            raise Exception(f"Source {name} in sources.json has an exclusion without a \"selector\".")
+    unknown = set(config.get("retry", {})) - set(RETRY_FIELDS)
+    if unknown:
+        raise Exception(f"Source {name} in sources.json has unknown retry settings: {', '.join(sorted(unknown))}")
+
+
+def rule_cache_key(url, rule):
+    """HTTP cache key of a page extracted with rule.
+
+    The cache keeps extracted headlines, so they are keyed by the rule as well as the
+    URL: after the rule is edited, a 304 for the page no longer returns headlines the
+    old rule extracted.
+    """
+    digest = hashlib.sha1(json.dumps(rule, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{url}#{digest[:16]}"
+
+
+def _strainer_names(rule):
+    """Tag names to keep when every selector is a simple compound and nothing needs excluding."""
+    if rule.get("exclude") or not all(SIMPLE_SELECTOR.match(selector) for selector in rule["selectors"]):
+        return None
+    return {re.match(r"[\w-]+", selector).group(0) for selector in rule["selectors"]}
+
+
+def extract_css(content, rule):
+    """Return the text of nodes matching rule["selectors"], in selector order.
+
+    Uses selectolax when it is installed. Otherwise BeautifulSoup with lxml, parsing only the
+    tags the selectors need (SoupStrainer) when the rule allows it.
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(content)
+        for exclusion in rule.get("exclude", []):
+            for node in tree.css(exclusion["selector"]):
+                if exclusion.get("if_text") and exclusion["if_text"] not in node.text():
+                    continue
+                target = node
+                if exclusion.get("remove_closest"):
+                    target = node.parent
+                    while target is not None and not target.css_matches(exclusion["remove_closest"]):
+                        target = target.parent
+                if target is not None:
+                    target.decompose()
+        return [node.text(strip=True) for selector in rule["selectors"] for node in tree.css(selector)]
+
+    from bs4 import BeautifulSoup, SoupStrainer
+    import soupsieve
+    try:
+        import lxml  # noqa: F401
+        features = "lxml"
+    except ImportError:
+        features = "html.parser"
+
+    names = _strainer_names(rule)
+    soup = BeautifulSoup(content, features, parse_only=SoupStrainer(list(names)) if names else None)
+    for exclusion in rule.get("exclude", []):
+        for node in soup.select(exclusion["selector"]):
+            if exclusion.get("if_text") and exclusion["if_text"] not in node.get_text():
+                continue
+            target = node
+            if exclusion.get("remove_closest"):
+                target = next(
+                    (parent for parent in node.parents if soupsieve.match(exclusion["remove_closest"], parent)), None
+                )
+            if target is not None:
+                target.decompose()
+    return [node.get_text(strip=True) for selector in rule["selectors"] for node in soup.select(selector)]
+
+
+def iter_json_array(text, start=0):
+    """Yield the elements of the JSON array beginning at text[start], one at a time.
+
+    Each element is decoded only when requested, so callers that stop early never
+    pay for the rest of the array.
+    """
+    decoder = json.JSONDecoder()
+    position = WHITESPACE.match(text, start + 1).end()
+    if text.startswith("]", position):
+        return
+    while True:
+        item, position = decoder.raw_decode(text, position)
+        yield item
+        position = WHITESPACE.match(text, position).end()
+        if text.startswith("]", position):
+            return
+        if not text.startswith(",", position):
+            raise ValueError(f"Malformed JSON array at offset {position}")
+        position = WHITESPACE.match(text, position + 1).end()
+
+
+def extract_json_script(content, rule):
+    """Return the items published today from the JSON array assigned to rule["marker"].
+
+    The marker is found by scanning the raw page bytes; only the inline script that
+    holds it is decoded, and items are parsed one by one. The feed is newest first,
+    so parsing stops at the first item older than today. Items without a title are skipped.
+    """
+    marker = content.find(rule["marker"].encode("utf-8"))
+    if marker == -1:
+        return []
+    equals = content.find(b"=", marker)
+    start = content.find(b"[", equals) if equals != -1 else -1
+    if start == -1:
+        return []
+    end = content.find(b"</script>", start)
+    text = content[start:end if end != -1 else len(content)].decode("utf-8", errors="replace")
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    items = []
+    for item in iter_json_array(text):
+        if not isinstance(item, dict):
+            continue
+        published = item.get(rule["date_field"])
+        if published is not None and published < current_date:
+            break
+        title = item.get(rule["title_field"])
+        if isinstance(title, str) and title.strip():
+            items.append({rule["title_field"]: title, rule["date_field"]: published})
+    return items
+
+
+def filter_todays_items(items, rule):
+    """Keep the titles of items published today (an empty list if there are none yet)."""
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    return [item[rule["title_field"]] for item in items
+            if item.get(rule["date_field"]) == current_date and item.get(rule["title_field"])]
+
+
+def load_sources(path=SOURCES_PATH):
+    """Load the source registry, in the order the sources are listed in the file."""
+    with open(path, "r", encoding="utf-8") as file:
+        return {name: Source(name, config) for name, config in json.load(file).items()}
+
+
+SOURCES = load_sources()
+SOURCE_COLORS = {name: source.color for name, source in SOURCES.items()}
+SCRAPERS = {name: source.scrape for name, source in SOURCES.items()}
@@ -0,0 +1,254 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from settings import ARTICLE_DB_PATH, SQLITE_MAX_PARAMS
+from utils import content_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    headline TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    UNIQUE (source, hash)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_source_first_seen ON articles (source, first_seen);
+CREATE INDEX IF NOT EXISTS idx_articles_first_seen ON articles (first_seen);
+CREATE INDEX IF NOT EXISTS idx_articles_hash ON articles (hash);
+"""
+
+# Counters per (bucket start, source, metric). Metrics: "headlines", "sentiment:<label>", "topic:<label>"
+ROLLUP_TABLES = {"hour": "rollups_hourly", "day": "rollups_daily"}
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups_hourly (
+    bucket INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bucket, source, metric)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups_daily (
+    bucket INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bucket, source, metric)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_articles_unannotated ON articles (id) WHERE sentiment IS NULL;
+"""
+SCHEMA_VERSION = 1  # Stored in PRAGMA user_version
+
+
+def bucket_start(timestamp, granularity):
+    """Unix time of the start of the local hour or day ("hour" / "day") containing timestamp."""
+    moment = datetime.fromtimestamp(timestamp).replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        moment = moment.replace(hour=0)
+    return int(moment.timestamp())
+
+
+def next_bucket(bucket, granularity):
+    """Start of the bucket after the one starting at bucket (days are 23 to 25 hours long around DST changes)."""
+    step = 86400 if granularity == "day" else 3600
+    return bucket_start(bucket + step + step // 12, granularity)
+
+
+class ArticleStore:
+    """Persistent history of scraped headlines in SQLite.
+
+    Each (source, headline) pair is stored once with the first and last time it was
+    seen (Unix timestamps), so repeated scrapes only append headlines never seen before.
+    Hourly and daily rollups count new headlines per source as they are recorded, and
+    their sentiment and topic once annotated, so trends never rescan the headlines.
+    """
+
+    def __init__(self, db_path=ARTICLE_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._migrate()
+
+    def _migrate(self):
+        """Add the annotation columns and rollup tables, counting the headlines already stored."""
+        with self._lock, self._connection:
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(articles)")}
+            for column in ("sentiment", "topic"):
+                if column not in columns:
+                    self._connection.execute(f"ALTER TABLE articles ADD COLUMN {column} TEXT")
+            for statement in ROLLUP_SCHEMA.split(";"):
+                if statement.strip():
+                    self._connection.execute(statement)
+            # Quarter hours, so every local hour (whatever the time zone offset) gets the right rows
+            rows = self._connection.execute(
+                "SELECT source, CAST(first_seen / 900 AS INTEGER) * 900, COUNT(*) FROM articles GROUP BY 1, 2"
+            )
+            self._add_to_rollups([(source, start, "headlines", count) for source, start, count in rows])
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _add_to_rollups(self, events):
+        """Add (source, timestamp, metric, count) events to the hourly and daily counters.
+
+        Must be called inside the caller's transaction.
+        """
+        for granularity, table in ROLLUP_TABLES.items():
+            counts = Counter()
+            for source, timestamp, metric, count in events:
+                counts[bucket_start(timestamp, granularity), source, metric] += count
+            self._connection.executemany(
+                f"INSERT INTO {table} (bucket, source, metric, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (bucket, source, metric) DO UPDATE SET count = count + excluded.count",
+                [(*key, count) for key, count in counts.items()]
+            )
+
+    def _reader(self):
+        """A separate connection for long streaming reads, so writers are not blocked behind them."""
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("PRAGMA query_only=ON")
+        return connection
+
+    def record_scrape(self, source, headlines, scraped_at=None):
+        """Store a scrape of one source and return the headlines that were never seen before."""
+        scraped_at = scraped_at or time.time()
+        hashes = {}
+        for headline in headlines:
+            hashes.setdefault(content_hash(headline), headline)
+
+        with self._lock, self._connection:
+            known = set()
+            hash_list = list(hashes)
+            for start in range(0, len(hash_list), SQLITE_MAX_PARAMS):
+                chunk = hash_list[start:start + SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT hash FROM articles WHERE source = ? AND hash IN ({placeholders})", [source, *chunk]
+                )
+                known.update(row[0] for row in rows)
+
+            new = [(h, headline) for h, headline in hashes.items() if h not in known]
+            self._connection.executemany(
+                "INSERT INTO articles (source, headline, hash, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)",
+                [(source, headline, h, scraped_at, scraped_at) for h, headline in new]
+            )
+            self._connection.executemany(
+                "UPDATE articles SET last_seen = ? WHERE source = ? AND hash = ?",
+                [(scraped_at, source, h) for h in known]
+            )
+            if new:
+                self._add_to_rollups([(source, scraped_at, "headlines", len(new))])
+        return [headline for _, headline in new]
+
+    def unannotated(self, limit=500):
+        """Return up to limit (id, source, headline, first_seen) rows whose sentiment and topic are not counted yet."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, source, headline, first_seen FROM articles WHERE sentiment IS NULL ORDER BY id LIMIT ?",
+                (limit,)
+            ).fetchall()
+
+    def count_unannotated(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM articles WHERE sentiment IS NULL").fetchone()[0]
+
+    def record_annotations(self, annotations):
+        """Store (id, source, first_seen, sentiment, topic) annotations and count them in the rollups.
+
+        Articles annotated in the meantime (e.g. by another process) are skipped, so nothing is counted twice.
+        """
+        with self._lock, self._connection:
+            events = []
+            for article_id, source, first_seen, sentiment, topic in annotations:
+                cursor = self._connection.execute(
+                    "UPDATE articles SET sentiment = ?, topic = ? WHERE id = ? AND sentiment IS NULL",
+                    (sentiment, topic, article_id)
+                )
+                if cursor.rowcount:
+                    events.append((source, first_seen, f"sentiment:{sentiment}", 1))
+                    events.append((source, first_seen, f"topic:{topic}", 1))
+            self._add_to_rollups(events)
+
+    def rollups(self, granularity, start=None, end=None, sources=None):
+        """Return (bucket, source, metric, count) counters for buckets starting in [start, end), by bucket."""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("bucket >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("bucket < ?")
+            params.append(end)
+        if sources:
+            clauses.append(f"source IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        connection = self._reader()
+        try:
+            return connection.execute(
+                f"SELECT bucket, source, metric, count FROM {ROLLUP_TABLES[granularity]}{where} ORDER BY bucket", params
+            ).fetchall()
+        finally:
+            connection.close()
+
+    def _window_query(self, columns, start=None, end=None, sources=None, ordered=True):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("first_seen >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("first_seen < ?")
+            params.append(end)
+        if sources:
+            clauses.append(f"source IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = " ORDER BY first_seen, id" if ordered else ""
+        return f"SELECT {columns} FROM articles{where}{order}", params
+
+    def iter_articles(self, start=None, end=None, sources=None, batch_size=1000, annotations=False):
+        """Yield (source, headline, hash, first_seen, last_seen) rows first seen in [start, end).
+
+        With annotations, rows also end with the stored sentiment and topic (None until annotated).
+        Rows are streamed from a cursor in batches, so the history is never loaded whole.
+        """
+        columns = "source, headline, hash, first_seen, last_seen"
+        if annotations:
+            columns += ", sentiment, topic"
+        query, params = self._window_query(columns, start, end, sources)
+        connection = self._reader()
+        try:
+            cursor = connection.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            connection.close()
+
+    def load_window(self, start=None, end=None, sources=None):
+        """Return {source: [headlines]} for a time window, shaped like MainWindow.scraped_content."""
+        content = {}
+        for source, headline, _, _, _ in self.iter_articles(start, end, sources):
+            content.setdefault(source, []).append(headline)
+        return content
+
+    def count(self, start=None, end=None, sources=None):
+        query, params = self._window_query("COUNT(*)", start, end, sources, ordered=False)
+        connection = self._reader()
+        try:
+            return connection.execute(query, params).fetchone()[0]
+        finally:
+            connection.close()
+
+    def sources(self):
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT DISTINCT source FROM articles ORDER BY source")]
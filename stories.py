@@ -0,0 +1,368 @@
+from collections import Counter, namedtuple
+import numpy as np
+from embeddings import embedder, normalize_rows
+from preprocessing import headline_tokens
+from settings import STORY_JACCARD_THRESHOLD, STORY_SIMILARITY_THRESHOLD
+
+# A story covered by several sources: members are (source, headline) pairs, sources are distinct
+StoryCluster = namedtuple("StoryCluster", ["members", "sources"])
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def jaccard(tokens1, tokens2):
+    if not tokens1 or not tokens2:
+        return 0.0
+    common = len(tokens1 & tokens2)
+    return common / (len(tokens1) + len(tokens2) - common)
+
+
+def _probability(jaccard_value, bands, rows):
+    """Chance that two documents with the given Jaccard similarity share an LSH bucket."""
+    return 1.0 - (1.0 - jaccard_value ** rows) ** bands
+
+
+def lsh_parameters(num_perm, threshold, false_negative_weight=0.7, steps=100):
+    """Pick (bands, rows) minimising the weighted false positive/negative areas of the LSH S-curve.
+
+    False negatives are weighted higher to keep recall; false candidates are removed
+    by exact verification afterwards.
+    """
+    below = np.linspace(0.0, threshold, steps)
+    above = np.linspace(threshold, 1.0, steps)
+    best, best_error = (num_perm, 1), float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        false_positive = _probability(below, bands, rows).mean() * threshold
+        false_negative = (1.0 - _probability(above, bands, rows)).mean() * (1.0 - threshold)
+        error = (1.0 - false_negative_weight) * false_positive + false_negative_weight * false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """Vectorised MinHash signatures over integer token ids."""
+
+    def __init__(self, num_perm=128, seed=42):
+        generator = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = generator.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = generator.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, tokens):
+        token_ids = np.fromiter(tokens, dtype=np.uint64, count=len(tokens))
+        permuted = (np.outer(token_ids, self.a) + self.b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def frequent_tokens(token_sets, max_document_fraction=0.01, min_document_count=50):
+    """Tokens found in so many headlines ("the", "to", ...) that they only create false candidates."""
+    document_counts = Counter(token for tokens in token_sets for token in tokens)
+    limit = max(min_document_count, max_document_fraction * len(token_sets))
+    return {token for token, count in document_counts.items() if count > limit}
+
+
+def candidate_pairs(token_sets, groups, threshold, num_perm=128):
+    """Yield (i, j) pairs from different groups that share at least one LSH band bucket."""
+    bands, rows = lsh_parameters(num_perm, threshold)
+    hasher = MinHasher(num_perm)
+    # Signatures skip very common words; candidates are still verified on the full word sets
+    frequent = frequent_tokens(token_sets)
+    buckets = {}
+    for doc_id, tokens in enumerate(token_sets):
+        if not tokens:
+            continue
+        signature = hasher.signature((tokens - frequent) or tokens)
+        for band in range(bands):
+            key = (band, signature[band * rows:(band + 1) * rows].tobytes())
+            buckets.setdefault(key, []).append(doc_id)
+
+    seen = set()
+    for doc_ids in buckets.values():
+        if len(doc_ids) < 2:
+            continue
+        for position, i in enumerate(doc_ids):
+            for j in doc_ids[position + 1:]:
+                if groups[i] != groups[j] and (i, j) not in seen:
+                    seen.add((i, j))
+                    yield i, j
+
+
+def find_shared_stories(scraped_content, threshold=STORY_JACCARD_THRESHOLD, num_perm=128):
+    """Find cross-source headline pairs whose word sets have Jaccard similarity >= threshold.
+
+    Each headline is tokenised once, candidates come from MinHash/LSH in roughly
+    linear time, and every candidate is verified with the exact Jaccard score.
+    Returns (source1, article1, source2, article2) tuples with source1 listed before source2.
+    """
+    sources = list(scraped_content)
+    articles, groups = [], []
+    for source_index, source in enumerate(sources):
+        for article in scraped_content[source]:
+            articles.append(article)
+            groups.append(source_index)
+    token_sets = [headline_tokens(article) for article in articles]
+
+    matches = []
+    for i, j in candidate_pairs(token_sets, groups, threshold, num_perm):
+        if jaccard(token_sets[i], token_sets[j]) >= threshold:
+            if groups[i] > groups[j]:
+                i, j = j, i
+            matches.append((sources[groups[i]], articles[i], sources[groups[j]], articles[j]))
+    return matches
+
+
+def find_shared_stories_pairwise(scraped_content, threshold=STORY_JACCARD_THRESHOLD):
+    """Exact all-pairs reference implementation, kept for benchmarks and checking recall."""
+    sources = list(scraped_content)
+    tokenised = {source: [(article, headline_tokens(article)) for article in scraped_content[source]]
+                 for source in sources}
+    matches = []
+    for i, source1 in enumerate(sources):
+        for source2 in sources[i + 1:]:
+            for article1, tokens1 in tokenised[source1]:
+                for article2, tokens2 in tokenised[source2]:
+                    if jaccard(tokens1, tokens2) >= threshold:
+                        matches.append((source1, article1, source2, article2))
+    return matches
+
+
+class StoryIndex:
+    """Incremental find_shared_stories: headlines are added and removed as the content changes.
+
+    Only headlines not seen before are hashed and looked up in the LSH buckets, so an
+    update costs time proportional to what changed. The frequent-word filter is
+    recomputed, and the buckets rebuilt, whenever the number of headlines doubles,
+    which keeps the amortised cost per headline constant.
+    """
+
+    def __init__(self, threshold=STORY_JACCARD_THRESHOLD, num_perm=128, min_rebuild_size=64):
+        self.threshold = threshold
+        self.bands, self.rows = lsh_parameters(num_perm, threshold)
+        self.hasher = MinHasher(num_perm)
+        self.min_rebuild_size = min_rebuild_size
+        self.sources = []  # In order of first appearance; matches list the earlier source first
+        self.docs = {}  # (source, article) -> (token set, bucket keys)
+        self.buckets = {}  # bucket key -> set of (source, article)
+        self.neighbours = {}  # (source, article) -> set of matching (source, article)
+        self.frequent = frozenset()
+        self.rebuilt_size = 0
+
+    def _match(self, doc1, doc2):
+        """The (source1, article1, source2, article2) tuple for a pair, earlier source first."""
+        if self.sources.index(doc1[0]) > self.sources.index(doc2[0]):
+            doc1, doc2 = doc2, doc1
+        return doc1 + doc2
+
+    def _insert(self, doc, tokens):
+        """Add a headline to the buckets and return the matches it makes with indexed headlines."""
+        keys = []
+        candidates = set()
+        if tokens:
+            signature = self.hasher.signature((tokens - self.frequent) or tokens)
+            for band in range(self.bands):
+                key = (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                bucket = self.buckets.setdefault(key, set())
+                candidates |= bucket
+                bucket.add(doc)
+                keys.append(key)
+        self.docs[doc] = (tokens, keys)
+
+        added = []
+        neighbours = self.neighbours.setdefault(doc, set())
+        for other in candidates:
+            if other[0] != doc[0] and other not in neighbours and jaccard(tokens, self.docs[other][0]) >= self.threshold:
+                neighbours.add(other)
+                self.neighbours.setdefault(other, set()).add(doc)
+                added.append(self._match(doc, other))
+        return added
+
+    def _remove(self, doc):
+        """Drop a headline and return the matches that went with it."""
+        _, keys = self.docs.pop(doc)
+        for key in keys:
+            bucket = self.buckets[key]
+            bucket.discard(doc)
+            if not bucket:
+                del self.buckets[key]
+        removed = []
+        for other in self.neighbours.pop(doc, ()):
+            self.neighbours[other].discard(doc)
+            removed.append(self._match(doc, other))
+        return removed
+
+    def update(self, scraped_content):
+        """Sync the index with {source: [articles]} and return (added matches, removed matches)."""
+        for source in scraped_content:
+            if source not in self.sources:
+                self.sources.append(source)
+        current = {(source, article): None for source, articles in scraped_content.items() for article in articles}
+
+        removed = []
+        for doc in [doc for doc in self.docs if doc not in current]:
+            removed.extend(self._remove(doc))
+
+        new_docs = [doc for doc in current if doc not in self.docs]
+        new_tokens = [headline_tokens(doc[1]) for doc in new_docs]
+        added = []
+        if len(self.docs) + len(new_docs) >= max(2 * self.rebuilt_size, self.min_rebuild_size):
+            # Recompute the frequent-word filter and re-bucket everything under it
+            indexed = [(doc, tokens) for doc, (tokens, _) in self.docs.items()]
+            self.frequent = frequent_tokens([tokens for _, tokens in indexed] + new_tokens)
+            self.docs, self.buckets = {}, {}
+            self.rebuilt_size = len(indexed) + len(new_docs)
+            for doc, tokens in indexed:
+                added.extend(self._insert(doc, tokens))
+        for doc, tokens in zip(new_docs, new_tokens):
+            added.extend(self._insert(doc, tokens))
+        return added, removed
+
+    def matches(self):
+        """Every current match, as (source1, article1, source2, article2) tuples."""
+        return [self._match(doc, other) for doc, others in self.neighbours.items() for other in others
+                if self.sources.index(doc[0]) < self.sources.index(other[0])]
+
+
+def _exact_similar_pairs(matrix, groups, threshold, max_block_cells=1 << 24):
+    """All cross-group pairs (i < j) with cosine similarity >= threshold, by blocked matrix products."""
+    n = len(matrix)
+    if n == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    block_size = max(1, max_block_cells // n)  # Keep each similarity block around 64 MB
+    found_i, found_j = [], []
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        similarities = matrix[start:end] @ matrix[start:].T  # Only columns at or after the block's rows
+        rows, cols = np.nonzero(similarities >= threshold)
+        rows += start
+        cols += start
+        keep = (cols > rows) & (groups[rows] != groups[cols])
+        found_i.append(rows[keep])
+        found_j.append(cols[keep])
+    return np.concatenate(found_i), np.concatenate(found_j)
+
+
+def _ivf_similar_pairs(matrix, groups, threshold, probes=3, iterations=8, seed=42):
+    """Cross-group pairs (i < j) with cosine similarity >= threshold, via an inverted-file index.
+
+    Spherical k-means on a sample splits the vectors into about sqrt(n) cells; every
+    vector joins its `probes` nearest cells and pairs are compared exactly within each
+    cell. Unlike random hyperplanes, the cells follow the data, so the large shared
+    component of averaged word vectors does not flood the candidates.
+    """
+    n = len(matrix)
+    num_cells = max(1, int(np.sqrt(n)))
+    probes = min(probes, num_cells)
+    generator = np.random.RandomState(seed)
+    centroids = matrix[generator.choice(n, num_cells, replace=False)].copy()
+    sample = matrix[generator.choice(n, min(n, 50 * num_cells), replace=False)]
+    for _ in range(iterations):
+        assignment = (sample @ centroids.T).argmax(axis=1)
+        for cell in range(num_cells):
+            members = sample[assignment == cell]
+            if len(members):
+                centroids[cell] = members.sum(axis=0)
+        centroids = normalize_rows(centroids)
+
+    nearest = np.argpartition(-(matrix @ centroids.T), probes - 1, axis=1)[:, :probes].ravel()
+    order = np.argsort(nearest, kind="stable")  # Stable, so each cell's members stay in ascending order
+    owners = np.repeat(np.arange(n), probes)[order]
+    boundaries = np.flatnonzero(np.diff(nearest[order])) + 1
+
+    found = []
+    for members in np.split(owners, boundaries):
+        if len(members) > 1:
+            first, second = _exact_similar_pairs(matrix[members], groups[members], threshold)
+            found.append(members[first].astype(np.int64) * n + members[second])
+    if not found:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    pairs = np.unique(np.concatenate(found))
+    return pairs // n, pairs % n
+
+
+def similar_pairs(matrix, groups, threshold, exact_limit=20000):
+    """Cross-group row pairs of a unit-row matrix with cosine similarity >= threshold.
+
+    Exact blocked products up to exact_limit rows, an inverted-file index beyond.
+    Returns two index arrays (i < j).
+    """
+    groups = np.asarray(groups)
+    if len(matrix) <= exact_limit:
+        return _exact_similar_pairs(matrix, groups, threshold)
+    return _ivf_similar_pairs(matrix, groups, threshold)
+
+
+def find_story_clusters(scraped_content, threshold=STORY_SIMILARITY_THRESHOLD):
+    """Group headlines from different sources into stories by the cosine similarity of their vectors.
+
+    Every headline is embedded once (batched through nlp.pipe, memoised by content hash);
+    similar cross-source pairs are linked and the connected groups become StoryClusters,
+    largest coverage first. Unlike word overlap this also matches paraphrased headlines.
+    """
+    sources = list(scraped_content)
+    members, groups = [], []
+    for source_index, source in enumerate(sources):
+        for article in scraped_content[source]:
+            members.append((source, article))
+            groups.append(source_index)
+    if not members:
+        return []
+
+    matrix = embedder.embed([article for _, article in members])
+    has_vector = np.flatnonzero(matrix.any(axis=1))  # Headlines without known words cannot match
+    first, second = similar_pairs(matrix[has_vector], np.asarray(groups)[has_vector], threshold)
+
+    # Union-find over the matched pairs
+    parent = list(range(len(members)))
+
+    def find(member):
+        while parent[member] != member:
+            parent[member] = parent[parent[member]]
+            member = parent[member]
+        return member
+
+    for i, j in zip(has_vector[first].tolist(), has_vector[second].tolist()):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clustered = {}
+    for member in sorted(set(has_vector[first].tolist()) | set(has_vector[second].tolist())):
+        clustered.setdefault(find(member), []).append(members[member])
+    clusters = [
+        StoryCluster(cluster_members, list(dict.fromkeys(source for source, _ in cluster_members)))
+        for cluster_members in clustered.values()
+    ]
+    clusters.sort(key=lambda cluster: (-len(cluster.sources), -len(cluster.members)))
+    return clusters
+
+
+class StoryClusterIndex:
+    """StoryIndex counterpart built on embedding clusters, for the network view.
+
+    Each update re-clusters the content (headline vectors are cached, so only new
+    headlines are embedded) and returns the matches that appeared or disappeared.
+    A cluster is reported as matches from its first headline to every other member,
+    including other headlines of the first headline's source.
+    """
+
+    def __init__(self, threshold=STORY_SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.current = set()
+
+    def update(self, scraped_content):
+        matches = set()
+        for cluster in find_story_clusters(scraped_content, self.threshold):
+            # A source can run the same headline twice; each (source, headline) is one member
+            (first_source, first_article), *others = dict.fromkeys(cluster.members)
+            for source, article in others:
+                matches.add((first_source, first_article, source, article))
+        added, removed = matches - self.current, self.current - matches
+        self.current = matches
+        return list(added), list(removed)
+
+    def matches(self):
+        return list(self.current)
@@ -0,0 +1,173 @@
+import sys
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from settings import TASK_CACHE_MAX_BYTES
+
+
+def approximate_size(result, depth=3):
+    """Rough number of bytes held by a task result.
+
+    Uses the result's own approximate_size() or nbytes when it has one; containers are
+    counted with their items down to depth levels.
+    """
+    if hasattr(result, "approximate_size"):
+        return result.approximate_size()
+    if hasattr(result, "nbytes"):
+        return result.nbytes
+    size = sys.getsizeof(result)
+    if depth > 0:
+        if isinstance(result, dict):
+            size += sum(approximate_size(key, depth - 1) + approximate_size(value, depth - 1)
+                        for key, value in result.items())
+        elif isinstance(result, (list, tuple, set, frozenset)):
+            size += sum(approximate_size(item, depth - 1) for item in result)
+    return size
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task at its next checkpoint once it has been cancelled."""
+
+
+class TaskSignals(QObject):
+    """Signals of a Task; they are delivered to the GUI thread."""
+    progress = pyqtSignal(int, int, str)  # (done, total, message)
+    partial = pyqtSignal(object)  # Intermediate result, e.g. one scraped source
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()  # Emitted last, whatever the outcome
+
+
+class Task(QRunnable):
+    """Runs fn(task, *args) on a thread pool.
+
+    The function reports through task.report (progress only) or task.checkpoint
+    (progress, then stop with TaskCancelled if the task was cancelled). Its return
+    value is delivered through signals.succeeded.
+    """
+
+    def __init__(self, fn, *args, key=None):
+        super().__init__()
+        self.setAutoDelete(False)  # The TaskManager holds the reference until the task finishes
+        self.fn = fn
+        self.args = args
+        self.key = key
+        self.signals = TaskSignals()
+        self._cancelled = threading.Event()
+        self._cancel_callbacks = []
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """Ask the task to stop at its next checkpoint and run any registered cancel callbacks."""
+        with self._lock:
+            self._cancelled.set()
+            callbacks = list(self._cancel_callbacks)
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback):
+        """Call callback when the task is cancelled (at once if it already is)."""
+        with self._lock:
+            self._cancel_callbacks.append(callback)
+            cancelled = self._cancelled.is_set()
+        if cancelled:
+            callback()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def report(self, done, total, message=""):
+        self.signals.progress.emit(done, total or 0, message)
+
+    def checkpoint(self, done, total, message=""):
+        """Report progress, then raise TaskCancelled if the task has been cancelled."""
+        self.report(done, total, message)
+        if self.is_cancelled():
+            raise TaskCancelled()
+
+    def run(self):
+        try:
+            if self.is_cancelled():
+                raise TaskCancelled()
+            result = self.fn(self, *self.args)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.succeeded.emit(result)
+        self.signals.finished.emit()
+
+
+class TaskManager:
+    """Submits Tasks to a QThreadPool and caches the results of keyed tasks.
+
+    Submitting a task whose key has a cached result delivers that result through the
+    same signals, from the event loop, without running the task again. The least recently
+    used results are dropped once their approximate size passes max_cached_bytes.
+    """
+
+    def __init__(self, max_cached_bytes=TASK_CACHE_MAX_BYTES):
+        self.max_cached_bytes = max_cached_bytes
+        self.results = OrderedDict()  # key -> (result, approximate size)
+        self.cached_bytes = 0
+        self.running = set()  # Keeps tasks (and their signals) alive until they finish
+        self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = QThreadPool.globalInstance()
+        return self._pool
+
+    def _remember(self, key, result):
+        size = approximate_size(result)
+        if key in self.results:
+            self.cached_bytes -= self.results.pop(key)[1]
+        if size > self.max_cached_bytes:
+            return  # Would evict everything else; not worth keeping
+        self.results[key] = (result, size)
+        self.cached_bytes += size
+        while self.cached_bytes > self.max_cached_bytes:
+            self.cached_bytes -= self.results.popitem(last=False)[1][1]
+
+    def submit(self, fn, *args, key=None, on_result=None, on_progress=None, on_partial=None,
+               on_failed=None, on_cancelled=None):
+        """Run fn(task, *args) in the pool and return the Task; callbacks run on the GUI thread."""
+        task = Task(fn, *args, key=key)
+        for signal, callback in ((task.signals.succeeded, on_result), (task.signals.progress, on_progress),
+                                 (task.signals.partial, on_partial), (task.signals.failed, on_failed),
+                                 (task.signals.cancelled, on_cancelled)):
+            if callback is not None:
+                signal.connect(callback)
+
+        if key is not None and key in self.results:
+            self.results.move_to_end(key)
+            result = self.results[key][0]
+            self.running.add(task)
+            QTimer.singleShot(0, lambda: self._deliver_cached(task, result))
+            return task
+
+        if key is not None:
+            task.signals.succeeded.connect(lambda result: self._remember(key, result))
+        self.running.add(task)
+        task.signals.finished.connect(lambda: self.running.discard(task))
+        self.pool.start(task)
+        return task
+
+    def _deliver_cached(self, task, result):
+        self.running.discard(task)
+        if task.is_cancelled():
+            task.signals.cancelled.emit()
+        else:
+            task.signals.succeeded.emit(result)
+        task.signals.finished.emit()
+
+    def cancel_all(self):
+        for task in list(self.running):
+            task.cancel()
+
+
+# Shared by every window so cached results are reused across dialogs
+task_manager = TaskManager()
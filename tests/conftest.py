@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+# The modules live at the repository root, next to codebase.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the shared caches (HTTP, vectors, report sections, ...) out of the user's ~/.newsnet
+os.environ.setdefault("NEWSNET_CACHE_DIR", tempfile.mkdtemp(prefix="newsnet-tests-"))
+
+
+class StubServer:
+    """Local stand-in for a news site.
+
+    routes maps a path to a list of (status, headers, body) responses served in turn,
+    the last one repeating; a callable body is called with the request headers and
+    returns the response instead. requests records (path, headers, client port) per request.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, so pooled connections are reused
+
+            def do_GET(self):
+                stub.requests.append((self.path, dict(self.headers), self.client_address[1]))
+                responses = stub.routes.get(self.path, [(404, {}, b"not found")])
+                status, headers, body = responses.pop(0) if len(responses) > 1 else responses[0]
+                if callable(body):
+                    status, headers, body = body(self.headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self._server.server_port}{path}"
+
+    def hits(self, path):
+        return sum(1 for requested, _, _ in self.requests if requested == path)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def http_server():
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
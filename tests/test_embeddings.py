@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from embeddings import VectorStore, normalize_rows
+from utils import content_hash
+
+
+def hashes(*headlines):
+    return [content_hash(headline) for headline in headlines]
+
+
+def test_normalize_rows_keeps_zero_rows():
+    normalized = normalize_rows(np.array([[3, 4], [0, 0]], dtype=np.float32))
+    assert np.allclose(normalized, [[0.6, 0.8], [0, 0]])
+
+
+def test_empty_store(tmp_path):
+    store = VectorStore(str(tmp_path))
+    assert len(store) == 0
+    assert store.vectors().shape == (0, 0)
+    assert store.rows(hashes("Fire downtown")).tolist() == [-1]
+    assert store.rows([]).tolist() == []
+
+
+def test_add_and_look_up(tmp_path):
+    store = VectorStore(str(tmp_path))
+    store.add(hashes("a", "b"), [[1, 0], [0, 1]])
+    store.add(hashes("b", "c", "c"), [[9, 9], [0.6, 0.8], [9, 9]])  # Known and repeated hashes are skipped
+
+    assert len(store) == 3
+    assert store.rows(hashes("c", "missing", "a")).tolist() == [2, -1, 0]
+    assert np.allclose(store.vectors(), [[1, 0], [0, 1], [0.6, 0.8]])
+    with pytest.raises(ValueError):
+        store.add(hashes("d"), [[1, 0, 0]])
+
+
+def test_rows_appended_elsewhere_are_picked_up(tmp_path):
+    writer, reader = VectorStore(str(tmp_path)), VectorStore(str(tmp_path))
+    writer.add(hashes("a"), [[1, 0]])
+    assert reader.rows(hashes("a")).tolist() == [0]
+    writer.add(hashes("b"), [[0, 1]])
+    assert reader.rows(hashes("a", "b")).tolist() == [0, 1]
+    assert np.allclose(reader.vectors(), [[1, 0], [0, 1]])
+
+    # Both append to the same files without clobbering each other's rows
+    reader.add(hashes("c"), [[0.6, 0.8]])
+    writer.add(hashes("d"), [[0.8, 0.6]])
+    assert VectorStore(str(tmp_path)).rows(hashes("a", "b", "c", "d")).tolist() == [0, 1, 2, 3]
+
+
+def test_torn_rows_are_discarded(tmp_path):
+    store = VectorStore(str(tmp_path))
+    store.add(hashes("a"), [[1, 0]])
+    # A writer crashed after appending a vector but before its digest
+    with open(store.vectors_path, "ab") as file:
+        file.write(np.array([5, 5, 5], dtype=np.float32).tobytes())
+
+    reopened = VectorStore(str(tmp_path))
+    assert len(reopened) == 1
+    reopened.add(hashes("b"), [[0, 1]])
+    assert np.allclose(VectorStore(str(tmp_path)).vectors(), [[1, 0], [0, 1]])
+
+
+def test_sorted_digest_index(tmp_path):
+    rng = np.random.default_rng(3)
+    digests = [bytes(rng.integers(0, 256, 16, dtype=np.uint8)).hex() for _ in range(300)]
+    digests[7] = digests[7][:-2] + "00"  # Trailing zero byte, which numpy's bytes type pads with
+    store = VectorStore(str(tmp_path))
+    for start in range(0, 300, 70):  # Several appends, each merged into the sorted index
+        store.add(digests[start:start + 70], rng.random((len(digests[start:start + 70]), 2)))
+
+    reopened = VectorStore(str(tmp_path))
+    assert reopened.rows(digests[::-1]).tolist() == list(range(299, -1, -1))
+    assert reopened.rows([digests[7][:-2] + "01", "00" * 16]).tolist() == [-1, -1]
@@ -0,0 +1,126 @@
+import csv
+import gzip
+import json
+from datetime import datetime
+import pytest
+import sentiment
+import topics
+from export import export_format, export_rows, export_to_file
+
+ROWS = [
+    {"source": "CNN News", "headline": "Fire downtown, 3 hurt", "hash": "a",
+     "first_seen": datetime(2026, 10, 14, 12, 30), "last_seen": datetime(2026, 10, 14, 13, 0),
+     "sentiment": "negative", "topic": "Disaster"},
+    {"source": "Rappler", "headline": "Élection \"results\"", "hash": "b",
+     "first_seen": datetime(2026, 10, 14, 9, 0), "last_seen": datetime(2026, 10, 14, 9, 0),
+     "sentiment": None, "topic": None},
+]
+
+
+def test_export_format():
+    assert export_format("news.csv") == ".csv"
+    assert export_format("NEWS.CSV.GZ") == ".csv.gz"
+    assert export_format("news.jsonl") == ".jsonl"
+    assert export_format("news.json") == ".json"
+    assert export_format("news.parquet") == ".parquet"
+    assert export_format("news.xlsx") is None
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(Exception, match="Unsupported file format"):
+        export_to_file(iter(ROWS), str(tmp_path / "news.xlsx"))
+
+
+def test_jsonl(tmp_path):
+    path = tmp_path / "news.jsonl"
+    assert export_to_file(iter(ROWS), str(path)) == 2
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert lines[0]["first_seen"] == "2026-10-14T12:30:00"
+    assert lines[1]["headline"] == "Élection \"results\"" and lines[1]["sentiment"] is None
+
+
+def test_json(tmp_path):
+    path = tmp_path / "news.json"
+    assert export_to_file(iter(ROWS), str(path)) == 2
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert [row["source"] for row in data] == ["CNN News", "Rappler"]
+
+    empty = tmp_path / "empty.json"
+    assert export_to_file(iter([]), str(empty)) == 0
+    assert json.loads(empty.read_text(encoding="utf-8")) == []
+
+
+@pytest.mark.parametrize("name, opener", [("news.csv", open), ("news.csv.gz", gzip.open)])
+def test_csv(tmp_path, name, opener):
+    path = tmp_path / name
+    assert export_to_file(iter(ROWS), str(path)) == 2
+    with opener(path, "rt", newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert rows[0]["headline"] == "Fire downtown, 3 hurt"
+    assert rows[0]["last_seen"] == "2026-10-14T13:00:00"
+    assert rows[1]["headline"] == "Élection \"results\"" and rows[1]["topic"] == ""
+
+
+def test_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "news.parquet"
+    assert export_to_file(iter(ROWS), str(path)) == 2
+    table = pq.read_table(str(path))
+    assert table.column("headline").to_pylist() == [row["headline"] for row in ROWS]
+    assert table.column("first_seen").to_pylist()[0] == datetime(2026, 10, 14, 12, 30)
+
+
+def test_progress_and_cancellation(tmp_path):
+    rows = [dict(ROWS[0], hash=str(i)) for i in range(25)]
+    reported = []
+    assert export_to_file(iter(rows), str(tmp_path / "news.jsonl"), total=25,
+                          progress=lambda written, total: reported.append((written, total)), progress_every=10) == 25
+    assert reported == [(10, 25), (20, 25), (25, 25)]
+
+    path = tmp_path / "cancelled.csv.gz"
+    written = export_to_file(iter(rows), str(path), is_cancelled=lambda: True, progress_every=10)
+    assert written == 10
+    assert not path.exists()  # The partial file is removed
+
+
+def failing_rows(count):
+    for i in range(count):
+        yield dict(ROWS[0], hash=str(i))
+    raise RuntimeError("store went away")
+
+
+@pytest.mark.parametrize("name", ["news.jsonl", "news.csv.gz", "news.parquet"])
+def test_failed_export_keeps_the_existing_file(tmp_path, name):
+    if name.endswith(".parquet"):
+        pytest.importorskip("pyarrow")
+    path = tmp_path / name
+    path.write_bytes(b"previous export")
+    with pytest.raises(RuntimeError):
+        export_to_file(failing_rows(25), str(path), progress_every=10)
+    assert path.read_bytes() == b"previous export"
+    assert [entry.name for entry in tmp_path.iterdir()] == [name]
+
+    written = export_to_file(iter(ROWS * 10), str(path), is_cancelled=lambda: True, progress_every=10)
+    assert written == 10 and path.read_bytes() == b"previous export"
+    assert [entry.name for entry in tmp_path.iterdir()] == [name]
+
+
+def test_export_rows_keep_stored_annotations(monkeypatch):
+    scored = []
+
+    def analyze_many(headlines):
+        scored.append(list(headlines))
+        return {headline: "positive" for headline in headlines}
+
+    def categorize_many(keyword_lists):
+        raise AssertionError("every topic is stored")
+    monkeypatch.setattr(sentiment.sentiment_service, "analyze_many", analyze_many)
+    monkeypatch.setattr(topics.label_index, "categorize_many", categorize_many)
+
+    noon = datetime(2026, 10, 14, 12, 30).timestamp()
+    records = [("CNN News", "Fire downtown", "a", noon, noon, "negative", "Disaster"),
+               ("Rappler", "Election results", "b", noon, noon, None, "Politics")]
+    rows = list(export_rows(iter(records)))
+    assert scored == [["Election results"]]  # Only the article without a stored sentiment
+    assert [(row["sentiment"], row["topic"]) for row in rows] == [("negative", "Disaster"), ("positive", "Politics")]
+    assert rows[0]["first_seen"] == datetime(2026, 10, 14, 12, 30)
@@ -0,0 +1,124 @@
+import json
+import os
+import pytest
+import requests
+from fetching import Fetcher, HTTPCache
+
+PAGE = b"<h2>Fire downtown</h2><h2>Election results</h2>"
+
+
+def parse_counting(calls):
+    def parse(content):
+        calls.append(content)
+        return [line.split(b"</h2>")[0].decode() for line in content.split(b"<h2>")[1:]]
+    return parse
+
+
+def etag_page(etag='"v1"'):
+    """A page that answers 304 when the client already holds its current ETag."""
+    def respond(headers):
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag}, PAGE
+    return [(200, {}, respond)]
+
+
+def test_http_cache_round_trip(tmp_path):
+    cache = HTTPCache(str(tmp_path / "http"))
+    assert cache.get("https://example.com/") is None
+    cache.set("https://example.com/", {"etag": '"v1"', "headlines": ["Fire downtown"]})
+    assert cache.get("https://example.com/") == {"etag": '"v1"', "headlines": ["Fire downtown"]}
+    assert [name for name in os.listdir(tmp_path / "http") if name.endswith(".tmp")] == []
+
+
+def test_http_cache_ignores_unreadable_entries(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    with open(cache._path("key"), "w", encoding="utf-8") as file:
+        file.write('{"etag": ')  # Torn by a crashed writer
+    assert cache.get("key") is None
+
+
+def test_not_modified_reuses_cached_headlines(http_server, tmp_path):
+    http_server.routes["/news"] = etag_page()
+    fetcher = Fetcher(HTTPCache(str(tmp_path)))
+    calls = []
+
+    first = fetcher.fetch_headlines(http_server.url("/news"), parse_counting(calls))
+    second = fetcher.fetch_headlines(http_server.url("/news"), parse_counting(calls))
+
+    assert first == second == ["Fire downtown", "Election results"]
+    assert len(calls) == 1  # The 304 skipped parsing
+    assert "If-None-Match" not in http_server.requests[0][1]
+    assert http_server.requests[1][1]["If-None-Match"] == '"v1"'
+
+
+def test_changed_page_is_parsed_again(http_server, tmp_path):
+    fetcher = Fetcher(HTTPCache(str(tmp_path)))
+    calls = []
+    http_server.routes["/news"] = etag_page('"v1"')
+    fetcher.fetch_headlines(http_server.url("/news"), parse_counting(calls))
+    http_server.routes["/news"] = etag_page('"v2"')
+    fetcher.fetch_headlines(http_server.url("/news"), parse_counting(calls))
+    fetcher.fetch_headlines(http_server.url("/news"), parse_counting(calls))
+
+    assert len(calls) == 2
+    with open(fetcher.cache._path(http_server.url("/news")), encoding="utf-8") as file:
+        assert json.load(file)["etag"] == '"v2"'
+
+
+def test_last_modified_is_sent_back(http_server, tmp_path):
+    stamp = "Wed, 14 Oct 2026 08:00:00 GMT"
+    http_server.routes["/news"] = [(200, {"Last-Modified": stamp}, PAGE)]
+    fetcher = Fetcher(HTTPCache(str(tmp_path)))
+    fetcher.fetch_headlines(http_server.url("/news"), parse_counting([]))
+    fetcher.fetch_headlines(http_server.url("/news"), parse_counting([]))
+    assert http_server.requests[1][1]["If-Modified-Since"] == stamp
+
+
+def test_pages_without_validators_are_not_cached(http_server, tmp_path):
+    http_server.routes["/news"] = [(200, {}, PAGE)]
+    fetcher = Fetcher(HTTPCache(str(tmp_path)))
+    calls = []
+    fetcher.fetch_headlines(http_server.url("/news"), parse_counting(calls))
+    fetcher.fetch_headlines(http_server.url("/news"), parse_counting(calls))
+    assert len(calls) == 2
+    assert fetcher.cache.get(http_server.url("/news")) is None
+
+
+def test_stray_304_without_cache_entry_is_parsed(http_server, tmp_path):
+    http_server.routes["/news"] = [(304, {}, b"")]
+    fetcher = Fetcher(HTTPCache(str(tmp_path)))
+    # Nothing cached to fall back on, so the empty body is parsed as is
+    assert fetcher.fetch_headlines(http_server.url("/news"), parse_counting([])) == []
+
+
+def test_http_errors_are_raised(http_server, tmp_path):
+    fetcher = Fetcher(HTTPCache(str(tmp_path)))
+    with pytest.raises(requests.exceptions.HTTPError) as error:
+        fetcher.fetch_headlines(http_server.url("/missing"), parse_counting([]))
+    assert error.value.response.status_code == 404
+
+
+def test_connections_are_pooled(http_server, tmp_path):
+    http_server.routes["/a"] = [(200, {}, PAGE)]
+    http_server.routes["/b"] = [(200, {}, PAGE)]
+    fetcher = Fetcher(HTTPCache(str(tmp_path)))
+    for path in ("/a", "/b", "/a"):
+        fetcher.fetch_headlines(http_server.url(path), parse_counting([]))
+    assert len({port for _, _, port in http_server.requests}) == 1
+
+
+def test_sources_cache_headlines_per_extraction_rule(http_server, tmp_path, monkeypatch):
+    import sources
+    http_server.routes["/news"] = [(200, {"ETag": '"v1"'},
+                                    lambda headers: (304, {"ETag": '"v1"'}, b"") if headers.get("If-None-Match")
+                                    else (200, {"ETag": '"v1"'}, b"<h2>Fire downtown</h2><h3>Markets rally</h3>"))]
+    monkeypatch.setattr(sources, "fetcher", Fetcher(HTTPCache(str(tmp_path))))
+    h2 = sources.Source("Stub", {"url": http_server.url("/news"), "extract": {"type": "css", "selectors": ["h2"]}})
+    h3 = sources.Source("Stub", {"url": http_server.url("/news"), "extract": {"type": "css", "selectors": ["h3"]}})
+
+    assert h2.scrape() == ["Fire downtown"]
+    assert h2.scrape() == ["Fire downtown"]  # 304: served from the cache
+    # An edited rule for the same page is not handed the old rule's headlines
+    assert h3.scrape() == ["Markets rally"]
+    assert h2.cache_key != h3.cache_key
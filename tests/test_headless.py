@@ -0,0 +1,15 @@
+import headless
+import trends
+from store import ArticleStore
+
+
+def test_scrape_only_annotates_on_request(tmp_path, monkeypatch):
+    annotated = []
+    monkeypatch.setattr(headless, "SCRAPERS", {"CNN News": lambda deadline: ["Fire downtown"]})
+    monkeypatch.setattr(headless, "ArticleStore", lambda: ArticleStore(str(tmp_path / "articles.sqlite3")))
+    monkeypatch.setattr(trends, "annotate_pending", lambda store: annotated.append(store) or 0)
+
+    assert headless.main(["scrape"]) == 0
+    assert annotated == []  # Scraping alone never loads the NLP models
+    assert headless.main(["scrape", "--annotate"]) == 0
+    assert len(annotated) == 1
@@ -0,0 +1,24 @@
+from report import ReportBuilder, Section
+
+CONTENT = {"CNN News": ["Fire downtown"], "Rappler": ["Storm warning", "Fire downtown"]}
+
+
+def counting_section(renders, settings):
+    def render(content, progress):
+        renders.append(settings)
+        return f"<p>{sum(len(articles) for articles in content.values())}</p>"
+    return Section("count", "Count", lambda hashes: sorted(hashes), render, settings)
+
+
+def test_sections_are_cached_per_setting(tmp_path):
+    renders = []
+    builder = ReportBuilder([counting_section(renders, {"passes": 15})], cache_dir=str(tmp_path))
+    first = builder.build(CONTENT)
+    assert builder.build(CONTENT) == first and len(renders) == 1
+
+    # Different settings must not be served the section rendered for the old ones
+    retuned = ReportBuilder([counting_section(renders, {"passes": 5})], cache_dir=str(tmp_path))
+    retuned.build(CONTENT)
+    assert renders == [{"passes": 15}, {"passes": 5}]
+    ReportBuilder([counting_section(renders, {"passes": 15})], cache_dir=str(tmp_path)).build(CONTENT)
+    assert len(renders) == 2  # Still on disk from the first build
@@ -0,0 +1,186 @@
+import threading
+import time
+from email.utils import formatdate
+import pytest
+import requests
+from fetching import Fetcher, HTTPCache
+from scheduler import Deadline, FetchScheduler, RetryPolicy, _retry_after
+
+PAGE = b"<h2>Fire downtown</h2>"
+FAST = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.05)
+
+
+def headlines(content):
+    return [content.decode()]
+
+
+@pytest.fixture
+def fetch(http_server, tmp_path):
+    """fetch(path, scheduler, policy, deadline) runs one scheduled fetch against the stub server."""
+    fetcher = Fetcher(HTTPCache(str(tmp_path)))
+
+    def run(path, scheduler, policy=FAST, deadline=None):
+        url = http_server.url(path)
+        return scheduler.call(url, lambda timeout: fetcher.fetch_headlines(url, headlines, timeout=timeout),
+                              policy=policy, deadline=deadline, timeout=5)
+    return run
+
+
+def test_retry_delay_is_jittered_and_capped():
+    policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=4.0)
+    for attempt in range(6):
+        assert 0 <= policy.delay(attempt) <= min(4.0, 2 ** attempt)
+    assert policy.delay(0, retry_after=3) >= 3
+    assert policy.delay(0, retry_after=60) == 4.0
+
+
+def test_retry_after_header():
+    class Response:
+        def __init__(self, value):
+            self.headers = {"Retry-After": value} if value is not None else {}
+
+    assert _retry_after(None) is None
+    assert _retry_after(Response(None)) is None
+    assert _retry_after(Response("7")) == 7.0
+    assert 25 <= _retry_after(Response(formatdate(time.time() + 30, usegmt=True))) <= 30
+    assert _retry_after(Response(formatdate(time.time() - 30, usegmt=True))) == 0.0
+    assert _retry_after(Response("soon")) is None
+
+
+def test_transient_errors_are_retried(http_server, fetch):
+    http_server.routes["/news"] = [(503, {}, b""), (502, {}, b""), (200, {}, PAGE)]
+    assert fetch("/news", FetchScheduler(min_interval=0)) == ["<h2>Fire downtown</h2>"]
+    assert http_server.hits("/news") == 3
+
+
+def test_gives_up_after_max_attempts(http_server, fetch):
+    http_server.routes["/news"] = [(500, {}, b"")]
+    with pytest.raises(Exception, match="after 3 attempts"):
+        fetch("/news", FetchScheduler(min_interval=0))
+    assert http_server.hits("/news") == 3
+
+
+def test_client_errors_are_not_retried(http_server, fetch):
+    scheduler = FetchScheduler(min_interval=0, breaker_threshold=1)
+    with pytest.raises(requests.exceptions.HTTPError):
+        fetch("/missing", scheduler)
+    assert http_server.hits("/missing") == 1
+    # A 404 means the host is up, so it does not open the circuit
+    http_server.routes["/news"] = [(200, {}, PAGE)]
+    assert fetch("/news", scheduler)
+
+
+def test_parse_errors_are_not_retried(http_server, tmp_path):
+    http_server.routes["/news"] = [(200, {}, PAGE)]
+    fetcher = Fetcher(HTTPCache(str(tmp_path)))
+    url = http_server.url("/news")
+
+    def broken(content):
+        raise ValueError("unexpected markup")
+
+    with pytest.raises(ValueError):
+        FetchScheduler(min_interval=0).call(url, lambda timeout: fetcher.fetch_headlines(url, broken, timeout=timeout),
+                                            policy=FAST)
+    assert http_server.hits("/news") == 1
+
+
+def test_retry_after_is_honoured_up_to_the_cap(http_server, fetch):
+    http_server.routes["/news"] = [(429, {"Retry-After": "30"}, b""), (200, {}, PAGE)]
+    policy = RetryPolicy(max_attempts=2, base_delay=0.01, max_delay=0.3)
+    start = time.monotonic()
+    fetch("/news", FetchScheduler(min_interval=0), policy=policy)
+    assert 0.3 <= time.monotonic() - start < 5
+
+
+def test_connection_errors_are_retried(tmp_path):
+    scheduler = FetchScheduler(min_interval=0)
+    fetcher = Fetcher(HTTPCache(str(tmp_path)))
+    url = "http://127.0.0.1:9/news"  # Discard port: nothing listens there
+    with pytest.raises(Exception, match="after 2 attempts"):
+        scheduler.call(url, lambda timeout: fetcher.fetch_headlines(url, headlines, timeout=timeout),
+                       policy=RetryPolicy(max_attempts=2, base_delay=0.01, max_delay=0.01), timeout=1)
+
+
+def test_circuit_opens_after_repeated_failures(http_server, fetch):
+    scheduler = FetchScheduler(min_interval=0, breaker_threshold=2, breaker_cooldown=60)
+    once = RetryPolicy(max_attempts=1)
+    http_server.routes["/news"] = [(503, {}, b"")]
+    for _ in range(2):
+        with pytest.raises(Exception, match="after 1 attempts"):
+            fetch("/news", scheduler, policy=once)
+
+    with pytest.raises(Exception, match="circuit open"):
+        fetch("/news", scheduler, policy=once)
+    assert http_server.hits("/news") == 2
+
+    # After the cooldown a single probe goes through and a success closes the circuit
+    _, state = scheduler.host(http_server.url("/news"))
+    state.open_until = 0.0
+    http_server.routes["/news"] = [(200, {}, PAGE)]
+    assert fetch("/news", scheduler, policy=once)
+    assert state.failures == 0
+
+
+def test_deadline_stops_retries(http_server, fetch):
+    http_server.routes["/news"] = [(503, {"Retry-After": "5"}, b"")]
+    policy = RetryPolicy(max_attempts=5, base_delay=0.01, max_delay=5)
+    start = time.monotonic()
+    with pytest.raises(Exception, match="after 1 attempts"):
+        fetch("/news", FetchScheduler(min_interval=0), policy=policy, deadline=Deadline(0.5))
+    assert time.monotonic() - start < 2
+    assert http_server.hits("/news") == 1
+
+
+def test_requests_to_a_host_are_paced(http_server, fetch):
+    http_server.routes["/news"] = [(200, {}, PAGE)]
+    scheduler = FetchScheduler(min_interval=0.2)
+    start = time.monotonic()
+    for _ in range(3):
+        fetch("/news", scheduler)
+    assert time.monotonic() - start >= 0.4
+
+
+def test_callers_wait_for_a_busy_host_slot():
+    scheduler = FetchScheduler(concurrency=1, min_interval=0)
+    results = []
+
+    def slow_fetch(timeout):
+        time.sleep(0.3)
+        return "ok"
+
+    def run():
+        try:
+            results.append(scheduler.call("https://example.com/news", slow_fetch))
+        except Exception as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Without a deadline the second caller blocks for the slot instead of failing
+    assert results == ["ok", "ok"]
+    assert time.monotonic() - start >= 0.6
+
+
+def test_cancelled_deadline():
+    deadline = Deadline(60)
+    assert 0 < deadline.remaining() <= 60 and not deadline.expired()
+    deadline.cancel()
+    assert deadline.cancelled() and deadline.expired()
+    start = time.monotonic()
+    assert deadline.wait(10) is False
+    assert time.monotonic() - start < 1
+    assert Deadline().remaining() is None
+
+
+def test_expired_deadline_fails_fast(http_server, fetch):
+    http_server.routes["/news"] = [(200, {}, PAGE)]
+    scheduler = FetchScheduler(min_interval=10)
+    fetch("/news", scheduler)
+    # The next request slot is 10 s away, past the deadline
+    with pytest.raises(Exception, match="deadline"):
+        fetch("/news", scheduler, deadline=Deadline(0.2))
+    assert http_server.hits("/news") == 1
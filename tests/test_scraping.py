@@ -0,0 +1,17 @@
+from scraping import ScrapeEngine
+
+
+def test_callback_errors_are_reported_per_source():
+    reported, failed = [], []
+
+    def on_result(name, articles):
+        if name == "CNN News":
+            raise Exception("database is locked")
+        reported.append(name)
+
+    scrapers = [(name, lambda deadline, name=name: [f"{name} headline"])
+                for name in ("CNN News", "Rappler", "Inquirer")]
+    results, errors, _ = ScrapeEngine().run(scrapers, on_result=on_result,
+                                            on_error=lambda name, error: failed.append((name, error)))
+    assert sorted(reported) == ["Inquirer", "Rappler"] and sorted(results) == ["Inquirer", "Rappler"]
+    assert failed == [("CNN News", "database is locked")] and errors == {"CNN News": "database is locked"}
@@ -0,0 +1,42 @@
+from search import HeadlineIndex, search_tokens
+
+HEADLINES = [
+    "Senators can't agree on budget",
+    "U.S. reports new COVID-19 cases",
+    "Duterte’s allies rally in Davao",
+    "Budget talks resume",
+]
+
+
+def test_search_tokens():
+    assert search_tokens("Senators can't agree") == ["senators", "can", "t", "cant", "agree"]
+    assert search_tokens("COVID-19, U.S.!") == ["covid", "19", "u", "s"]
+    assert search_tokens("  ...  ") == []
+
+
+def test_contractions_and_punctuation_match():
+    index = HeadlineIndex(HEADLINES)
+    for query in ("can't", "cant", "can", "CAN'T AGREE", "senators, budget"):
+        assert index.search(query) == {0}, query
+    assert index.search("don't") == set()
+    assert index.search("covid-19") == {1}
+    assert index.search("u.s.") == {1}
+    assert index.search("duterte's") == index.search("dutertes") == {2}
+    assert index.search("!!") is None
+
+
+def test_refined_queries_match_a_fresh_search():
+    index = HeadlineIndex(HEADLINES)
+    query = ""
+    for character in "can't agree":
+        query += character
+        assert index.search(query) == HeadlineIndex(HEADLINES).search(query), query
+    assert index.search("budget") == {0, 3}
+    assert index.search("budget t") == {0, 3}  # "talks" and the "t" of "can't"
+    assert index.search("budget ta") == {3}
+
+
+def test_approximate_size_grows_with_the_headlines():
+    small = HeadlineIndex(HEADLINES)
+    large = HeadlineIndex(HEADLINES * 50 + [f"Headline number {i}" for i in range(500)])
+    assert 0 < small.approximate_size() < large.approximate_size()
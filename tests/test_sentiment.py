@@ -0,0 +1,25 @@
+from sentiment import SentimentService
+
+
+def test_labels_are_cached_on_disk_and_memory_is_bounded(tmp_path, monkeypatch):
+    inferred = []
+
+    def infer(self, texts, progress=None):
+        inferred.extend(texts)
+        return ["positive" if "rally" in text else "negative" for text in texts]
+    monkeypatch.setattr(SentimentService, "_infer", infer)
+
+    service = SentimentService(str(tmp_path / "sentiment.sqlite3"), max_memory=2)
+    headlines = ["Markets rally", "Fire downtown", "Storm warning", "Fire downtown"]
+    assert service.analyze_many(headlines) == {
+        "Markets rally": "positive", "Fire downtown": "negative", "Storm warning": "negative"
+    }
+    assert len(service._memory) == 2
+    assert sorted(inferred) == ["Fire downtown", "Markets rally", "Storm warning"]
+
+    # Labels evicted from memory are read back from disk, not scored again
+    assert service.analyze_many(headlines[:3]) == service.analyze_many(["Markets rally", "Fire downtown",
+                                                                        "Storm warning"])
+    assert len(inferred) == 3 and len(service._memory) == 2
+    assert SentimentService(service.db_path).analyze("Markets rally") == "positive"
+    assert len(inferred) == 3
@@ -0,0 +1,152 @@
+import json
+from datetime import datetime
+import pytest
+import sources
+from sources import (SOURCES, extract_css, extract_json_script, filter_todays_items, iter_json_array,
+                     load_sources)
+
+
+@pytest.fixture(params=["selectolax", "bs4"])
+def parser(request, monkeypatch):
+    """Run a test with selectolax, then with BeautifulSoup and lxml (SoupStrainer where the rule allows)."""
+    if request.param == "selectolax":
+        pytest.importorskip("selectolax")
+    else:
+        pytest.importorskip("bs4")
+        monkeypatch.setattr(sources, "HTMLParser", None)
+    return request.param
+
+
+def rule(name):
+    return SOURCES[name].extract
+
+
+PHILSTAR_PAGE = b"""
+<html><body>
+<div class="ribbon">
+  <div class="ribbon_section news_featured"><h2>Forex</h2><h2>Peso closes at 58.2</h2></div>
+</div>
+<div class="ribbon">
+  <div class="ribbon_section news_featured"><h2>Senate passes budget</h2></div>
+</div>
+<div id="newsletter-signup_content"><h2>Sign up for our newsletter</h2></div>
+<div id="lotto_past"><h2>Past lotto results</h2></div>
+<h2>Typhoon makes landfall</h2>
+</body></html>
+"""
+
+
+def test_philstar_exclusions(parser):
+    # The Forex ribbon goes as a whole (remove_closest); the other featured ribbon stays
+    assert extract_css(PHILSTAR_PAGE, rule("Philstar")) == ["Senate passes budget", "Typhoon makes landfall"]
+
+
+def test_manila_times_keeps_selector_order(parser):
+    page = b"""
+    <div class="article-title-h5">Fifth</div>
+    <div class="article-title-h4"><a href="/4">Fourth <b>story</b></a></div>
+    <div class="article-title-h1"><a href="/1">Lead story</a></div>
+    <div class="article-title-h4">Another fourth</div>
+    <span class="article-title-h1">Not a div</span>
+    """
+    assert extract_css(page, rule("Manila Times")) == ["Lead story", "Fourthstory", "Another fourth", "Fifth"]
+
+
+def test_cnn_headline_attribute(parser):
+    page = b"""
+    <span class="container__headline-text" data-editable="headline">Markets rally</span>
+    <span class="container__headline-text" data-editable="subheadline">Stocks up 2%</span>
+    <span class="container__headline-text" data-editable="byline">By a reporter</span>
+    <span class="container__text" data-editable="headline">Not a headline container</span>
+    """
+    # *= matches any attribute containing "headline", so the subheadline counts too
+    assert extract_css(page, rule("CNN News")) == ["Markets rally", "Stocks up 2%"]
+
+
+def test_simple_rules_parse_only_the_needed_tags():
+    assert sources._strainer_names(rule("Manila Times")) == {"div"}
+    assert sources._strainer_names(rule("CNN News")) == {"span"}
+    assert sources._strainer_names(rule("Philstar")) is None  # Exclusions need the surrounding tree
+    assert sources._strainer_names({"selectors": ["div h2"]}) is None
+
+
+def test_registry_matches_the_file():
+    with open(sources.SOURCES_PATH, encoding="utf-8") as file:
+        assert list(SOURCES) == list(json.load(file))
+    assert SOURCES["Philstar"].retry_policy.max_attempts == 3
+
+
+def write_sources(tmp_path, config):
+    path = tmp_path / "sources.json"
+    path.write_text(json.dumps({"Example": config}), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("config, message", [
+    ({"extract": {"type": "css", "selectors": ["h2"]}}, 'no "url"'),
+    ({"url": "https://example.com/"}, 'no "extract"'),
+    ({"url": "https://example.com/", "extract": {"type": "xpath"}}, "unknown extraction type"),
+    ({"url": "https://example.com/", "extract": {"type": "css", "selectors": []}}, 'needs "selectors"'),
+    ({"url": "https://example.com/", "extract": {"type": "json_script", "marker": "FEED"}}, 'needs "title_field"'),
+    ({"url": "https://example.com/", "extract": {"type": "css", "selectors": ["h2"], "exclude": [{"if_text": "Ad"}]}},
+     'exclusion without a "selector"'),
+    ({"url": "https://example.com/", "extract": {"type": "css", "selectors": ["h2"]}, "retry": {"max_retries": 4}},
+     "unknown retry settings: max_retries"),
+])
+def test_load_sources_rejects_invalid_entries(tmp_path, config, message):
+    with pytest.raises(Exception, match=f"Source Example .*{message}"):
+        load_sources(write_sources(tmp_path, config))
+
+
+def test_load_sources(tmp_path):
+    loaded = load_sources(write_sources(tmp_path, {
+        "url": "https://example.com/", "extract": {"type": "css", "selectors": ["h2"]}, "retry": {"max_attempts": 1}
+    }))
+    source = loaded["Example"]
+    assert source.color == sources.DEFAULT_COLOR and source.retry_policy.max_attempts == 1
+    assert source.parse(b"<h2>Fire downtown</h2>") == ["Fire downtown"]
+
+
+def gma_page(feed):
+    return (f"<html><script>var other = [1, 2];</script>"
+            f"<script>window.GLOBAL_SSR_ROBOT_JUST_IN_JSON = {feed};</script></html>").encode("utf-8")
+
+
+def test_gma_stops_at_the_first_older_item():
+    today = datetime.now().strftime("%Y-%m-%d")
+    feed = (f'[{{"title": "Fire downtown", "published_date": "{today}"}}, '
+            f'{{"title": "Budget [update]: Senate votes ]", "published_date": "{today}"}}, '
+            f'{{"published_date": "{today}"}}, '
+            f'{{"title": null, "published_date": "{today}"}}, '
+            f'{{"title": "Yesterday", "published_date": "2000-01-01"}}, '
+            f'{{"broken": ')  # Never reached, so the truncated tail is not decoded
+    items = extract_json_script(gma_page(feed), rule("GMA News"))
+    # Items without a title are skipped instead of reaching record_scrape as None
+    assert [item["title"] for item in items] == ["Fire downtown", "Budget [update]: Senate votes ]"]
+    assert filter_todays_items(items + [{"title": None, "published_date": today}], rule("GMA News")) == [
+        "Fire downtown", "Budget [update]: Senate votes ]"]
+
+
+def test_gma_empty_and_missing_feeds():
+    assert extract_json_script(gma_page("[]"), rule("GMA News")) == []
+    assert extract_json_script(gma_page("[ \n ]"), rule("GMA News")) == []
+    assert extract_json_script(b"<html><script>var feed = [];</script></html>", rule("GMA News")) == []
+
+
+@pytest.mark.parametrize("feed", [
+    '[{"title": "Fire downtown", "published_date": "9999-01-01"}',  # No closing bracket
+    '[{"title": "Fire downtown", "published_date": "9999-01-01"} {"title": "x"}]',  # Missing comma
+    '[{"title": "Fire downtown", "published_da',  # Cut off mid-item
+])
+def test_gma_malformed_feed_raises(feed):
+    with pytest.raises(ValueError):
+        extract_json_script(gma_page(feed), rule("GMA News"))
+
+
+def test_iter_json_array_decodes_lazily():
+    items = iter_json_array('[{"a": "]"}, [1, 2], "x" , oops]')
+    assert next(items) == {"a": "]"}
+    assert next(items) == [1, 2]
+    assert next(items) == "x"
+    with pytest.raises(ValueError):
+        next(items)
@@ -0,0 +1,134 @@
+import sqlite3
+from datetime import datetime
+import numpy as np
+from store import SCHEMA, ArticleStore, bucket_start, next_bucket
+from trends import load_trends
+
+NOON = datetime(2026, 10, 14, 12, 30).timestamp()
+
+
+def totals(store, granularity="day"):
+    counts = {}
+    for _, source, metric, count in store.rollups(granularity):
+        counts[source, metric] = counts.get((source, metric), 0) + count
+    return counts
+
+
+def test_buckets():
+    day = bucket_start(NOON, "day")
+    assert datetime.fromtimestamp(day) == datetime(2026, 10, 14)
+    assert datetime.fromtimestamp(bucket_start(NOON, "hour")) == datetime(2026, 10, 14, 12)
+    assert bucket_start(day, "day") == day
+    assert datetime.fromtimestamp(next_bucket(day, "day")) == datetime(2026, 10, 15)
+    # Every local day of a year, including the DST changes, starts at midnight
+    bucket = day
+    for _ in range(366):
+        bucket = next_bucket(bucket, "day")
+        assert datetime.fromtimestamp(bucket).hour == 0
+
+
+def test_record_scrape_returns_only_new_headlines(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    assert store.record_scrape("CNN News", ["Fire downtown", "Fire downtown", "Election results"],
+                               scraped_at=NOON) == ["Fire downtown", "Election results"]
+    assert store.record_scrape("CNN News", ["Fire downtown", "Storm warning"],
+                               scraped_at=NOON + 60) == ["Storm warning"]
+    # The same headline from another source is a different article
+    assert store.record_scrape("Rappler", ["Fire downtown"], scraped_at=NOON + 60) == ["Fire downtown"]
+    assert store.record_scrape("Rappler", []) == []
+
+    rows = {(source, headline): (first, last) for source, headline, _, first, last in store.iter_articles()}
+    assert rows["CNN News", "Fire downtown"] == (NOON, NOON + 60)
+    assert rows["CNN News", "Election results"] == (NOON, NOON)
+    assert store.count() == 4
+    assert store.count(sources=["Rappler"]) == 1
+    assert store.sources() == ["CNN News", "Rappler"]
+    assert totals(store) == {("CNN News", "headlines"): 3, ("Rappler", "headlines"): 1}
+
+
+def test_record_scrape_beyond_the_parameter_limit(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    headlines = [f"Headline {i}" for i in range(2500)]
+    assert len(store.record_scrape("CNN News", headlines, scraped_at=NOON)) == 2500
+    assert store.record_scrape("CNN News", headlines, scraped_at=NOON + 60) == []
+    assert totals(store, "hour") == {("CNN News", "headlines"): 2500}
+
+
+def test_annotations_are_counted_once(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    store.record_scrape("CNN News", ["Fire downtown", "Election results"], scraped_at=NOON)
+    pending = store.unannotated()
+    assert store.count_unannotated() == 2
+    annotations = [(article_id, source, first_seen, "positive", "Politics")
+                   for article_id, source, _, first_seen in pending]
+    store.record_annotations(annotations)
+    store.record_annotations(annotations)  # e.g. another process annotated them meanwhile
+
+    assert store.unannotated() == [] and store.count_unannotated() == 0
+    assert [row[5:] for row in store.iter_articles(annotations=True)] == [("positive", "Politics")] * 2
+    assert totals(store) == {("CNN News", "headlines"): 2, ("CNN News", "sentiment:positive"): 2,
+                             ("CNN News", "topic:Politics"): 2}
+
+
+def test_migration_counts_existing_headlines_once(tmp_path):
+    path = str(tmp_path / "articles.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.executemany(
+        "INSERT INTO articles (source, headline, hash, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)",
+        [("CNN News", "Fire downtown", "a", NOON, NOON), ("CNN News", "Storm warning", "b", NOON + 3600, NOON + 3600),
+         ("Rappler", "Fire downtown", "a", NOON - 86400, NOON - 86400)]
+    )
+    connection.commit()
+    connection.close()
+
+    store = ArticleStore(path)
+    assert store.count_unannotated() == 3
+    assert totals(store, "hour") == {("CNN News", "headlines"): 2, ("Rappler", "headlines"): 1}
+    assert len(store.rollups("hour", sources=["CNN News"])) == 2
+    assert len(store.rollups("day", start=bucket_start(NOON, "day"))) == 1
+
+    reopened = ArticleStore(path)
+    assert totals(reopened) == {("CNN News", "headlines"): 2, ("Rappler", "headlines"): 1}
+
+
+def test_load_window(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    store.record_scrape("CNN News", ["Old story"], scraped_at=NOON - 86400)
+    store.record_scrape("CNN News", ["Fire downtown"], scraped_at=NOON)
+    store.record_scrape("Rappler", ["Storm warning"], scraped_at=NOON)
+    assert store.load_window(start=NOON - 60) == {"CNN News": ["Fire downtown"], "Rappler": ["Storm warning"]}
+    assert store.load_window(end=NOON - 60) == {"CNN News": ["Old story"]}
+    assert store.load_window(start=NOON + 60) == {}
+
+
+def test_load_trends(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    store.record_scrape("CNN News", ["Fire downtown", "Election results"], scraped_at=NOON - 86400)
+    store.record_scrape("CNN News", ["Storm warning"], scraped_at=NOON)
+    store.record_scrape("Rappler", ["Storm warning"], scraped_at=NOON)
+    labels = {"Fire downtown": ("negative", "Disaster"), "Election results": ("positive", "Politics"),
+              "Storm warning": ("negative", "Disaster")}
+    store.record_annotations([(article_id, source, first_seen, *labels[headline])
+                              for article_id, source, headline, first_seen in store.unannotated()])
+
+    trends = load_trends(store, days=2, now=NOON)
+    assert len(trends.buckets) == 3
+    assert trends.volume["CNN News"].tolist() == [0, 2, 1]
+    assert trends.volume["Rappler"].tolist() == [0, 0, 1]
+    assert np.isnan(trends.positive_share["All Sources"][0])
+    assert trends.positive_share["All Sources"][1:].tolist() == [0.5, 0.0]
+    assert trends.topic_share["All Sources"]["Disaster"].tolist() == [0.0, 0.5, 1.0]
+    assert trends.topic_share["CNN News"]["Politics"].tolist() == [0.0, 0.5, 0.0]
+    assert list(trends.topic_share["Rappler"]) == ["Disaster"]
+
+    hourly = load_trends(store, days=1, granularity="hour", sources=["Rappler"], now=NOON, top_topics=0)
+    assert hourly.volume["Rappler"].sum() == 1 and "CNN News" not in hourly.volume
+    assert list(hourly.topic_share) == ["Rappler", "All Sources"]
+    assert hourly.topic_share["All Sources"]["Other"].sum() == 1.0
+
+
+def test_load_trends_empty_store(tmp_path):
+    trends = load_trends(ArticleStore(str(tmp_path / "articles.sqlite3")), days=7, now=NOON)
+    assert len(trends.buckets) == 8
+    assert trends.volume == {} and trends.positive_share == {} and trends.topic_share == {}
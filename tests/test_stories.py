@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+import stories
+from embeddings import normalize_rows
+from stories import (
+    StoryClusterIndex, StoryIndex, candidate_pairs, find_shared_stories, find_shared_stories_pairwise, find_story_clusters, jaccard,
+    lsh_parameters, similar_pairs
+)
+
+CONTENT = {
+    "CNN News": ["Fire downtown leaves three hurt", "Election results delayed again", "Storm warning for the coast"],
+    "Rappler": ["Three hurt as fire hits downtown", "Markets rally on rate cut"],
+    "Inquirer": ["Election results delayed again in capital", "Storm warning for the coast tonight", ""],
+}
+
+
+@pytest.fixture
+def word_tokens(monkeypatch):
+    """Tokenise headlines into lowercase word ids, without the NLTK/spaCy preprocessing pipeline."""
+    ids = {}
+
+    def tokens(text):
+        return frozenset(ids.setdefault(word, len(ids)) for word in text.lower().split())
+    monkeypatch.setattr(stories, "headline_tokens", tokens)
+    return tokens
+
+
+def test_similar_pairs_empty_matrix():
+    first, second = similar_pairs(np.zeros((0, 300), dtype=np.float32), [], 0.9)
+    assert len(first) == 0 and len(second) == 0
+
+
+def test_similar_pairs_only_across_groups():
+    matrix = normalize_rows(np.array([[1, 0], [1, 0.01], [0, 1], [1, 0.02]], dtype=np.float32))
+    first, second = similar_pairs(matrix, [0, 1, 1, 0], 0.99)
+    assert sorted(zip(first.tolist(), second.tolist())) == [(0, 1), (1, 3)]
+
+
+def test_find_story_clusters_without_vectors(monkeypatch):
+    # Headlines made only of words missing from the vectors table embed to zero rows
+    monkeypatch.setattr(stories.embedder, "embed", lambda headlines: np.zeros((len(headlines), 300), np.float32))
+    content = {"CNN News": ["zzqx vvbn"], "Rappler": ["qqpl zzqx"]}
+    assert find_story_clusters(content) == []
+
+
+def test_find_story_clusters_groups_sources(monkeypatch):
+    vectors = {"fire downtown": [1, 0], "downtown fire": [1, 0.01], "election results": [0, 1]}
+    monkeypatch.setattr(stories.embedder, "embed",
+                        lambda headlines: normalize_rows(np.array([vectors[h] for h in headlines], np.float32)))
+    content = {"CNN News": ["fire downtown", "election results"], "Rappler": ["downtown fire"]}
+    clusters = find_story_clusters(content, threshold=0.99)
+    assert len(clusters) == 1
+    assert clusters[0].sources == ["CNN News", "Rappler"]
+    assert sorted(clusters[0].members) == [("CNN News", "fire downtown"), ("Rappler", "downtown fire")]
+
+
+def test_story_cluster_index_keeps_same_source_members(monkeypatch):
+    vectors = {"fire downtown": [1, 0], "downtown fire": [1, 0.01], "fire hits downtown": [1, 0.02],
+               "election results": [0, 1]}
+    monkeypatch.setattr(stories.embedder, "embed",
+                        lambda headlines: normalize_rows(np.array([vectors[h] for h in headlines], np.float32)))
+    # CNN runs two headlines on the fire, and repeats one of them
+    content = {"CNN News": ["fire downtown", "fire hits downtown", "fire downtown", "election results"],
+               "Rappler": ["downtown fire"]}
+    index = StoryClusterIndex(threshold=0.99)
+    added, removed = index.update(content)
+    assert sorted(added) == [("CNN News", "fire downtown", "CNN News", "fire hits downtown"),
+                             ("CNN News", "fire downtown", "Rappler", "downtown fire")]
+    assert removed == []
+    members = {(source, article) for match in added for source, article in (match[:2], match[2:])}
+    assert members == set(find_story_clusters(content, threshold=0.99)[0].members)
+
+
+def test_jaccard():
+    assert jaccard(frozenset(), frozenset({1})) == 0.0
+    assert jaccard(frozenset({1, 2}), frozenset({2, 3})) == 1 / 3
+
+
+def test_lsh_parameters_fit_the_signature():
+    for threshold in (0.25, 0.5, 0.8):
+        bands, rows = lsh_parameters(128, threshold)
+        assert bands * rows <= 128
+
+
+def test_candidate_pairs_only_across_groups():
+    token_sets = [frozenset({1, 2, 3}), frozenset({1, 2, 3}), frozenset({1, 2, 3}), frozenset()]
+    assert sorted(candidate_pairs(token_sets, [0, 0, 1, 1], 0.5)) == [(0, 2), (1, 2)]
+
+
+def test_lsh_matches_the_exact_pairs(word_tokens):
+    expected = find_shared_stories_pairwise(CONTENT)
+    assert sorted(find_shared_stories(CONTENT)) == sorted(expected)
+    assert ("CNN News", "Storm warning for the coast", "Inquirer", "Storm warning for the coast tonight") in expected
+    assert find_shared_stories({}) == []
+    assert find_shared_stories({"CNN News": CONTENT["CNN News"]}) == []
+
+
+def test_story_index_tracks_changes(word_tokens):
+    index = StoryIndex(min_rebuild_size=2)
+    added, removed = index.update(CONTENT)
+    assert sorted(added) == sorted(find_shared_stories_pairwise(CONTENT)) and removed == []
+    assert sorted(index.matches()) == sorted(added)
+
+    # A new scrape drops one CNN headline; Rappler's new headline only resembles its own
+    content = dict(CONTENT, **{
+        "CNN News": CONTENT["CNN News"][1:],
+        "Rappler": CONTENT["Rappler"] + ["Markets rally after rate cut"],
+    })
+    added, removed = index.update(content)
+    assert removed == [("CNN News", "Fire downtown leaves three hurt", "Rappler", "Three hurt as fire hits downtown")]
+    assert added == []
+    assert sorted(index.matches()) == sorted(find_shared_stories_pairwise(content))
+
+    remaining = index.matches()
+    added, removed = index.update({})
+    assert added == [] and sorted(removed) == sorted(remaining)
+    assert index.matches() == [] and index.docs == {} and index.buckets == {}
@@ -0,0 +1,127 @@
+import threading
+import pytest
+import topics
+from topics import TopicModelCache, perplexity_sample
+
+PARAMS = (5, 15, 0.001)
+
+ARTICLES = [
+    "Senate passes budget bill after long debate",
+    "President signs budget bill into law",
+    "Typhoon makes landfall in northern provinces",
+    "Flooding forces evacuations after typhoon",
+    "Central bank raises interest rates again",
+    "Stocks fall as interest rates climb",
+    "Senate debate on budget continues",
+    "Typhoon death toll rises in provinces",
+]
+
+
+def cache_with(*hash_sets, params=PARAMS, **options):
+    cache = TopicModelCache(**options)
+    for index, hashes in enumerate(hash_sets):
+        cache._store(f"model{index}", {"model": None, "dictionary": None, "hashes": frozenset(hashes),
+                                       "params": params, "run": {}})
+    return cache
+
+
+def test_perplexity_sample():
+    corpus = list(range(1000))
+    assert perplexity_sample(corpus[:10], 500) == corpus[:10]
+    sample = perplexity_sample(corpus, 100)
+    assert len(sample) == 100 and len(set(sample)) == 100
+    assert sample == perplexity_sample(corpus, 100)  # Fixed, so passes are compared on the same documents
+
+
+def test_find_base_picks_the_largest_subset():
+    cache = cache_with(range(8), range(10), range(5, 15))
+    assert cache._find_base(frozenset(range(12)), PARAMS) == "model1"
+    assert cache._find_base(frozenset(range(10)), PARAMS) == "model1"
+    assert cache._find_base(frozenset(range(12)), (10, 15, 0.001)) is None
+
+
+def test_find_base_refuses_large_additions():
+    cache = cache_with(range(100), max_new_fraction=0.25)
+    assert cache._find_base(frozenset(range(125)), PARAMS) == "model0"
+    # A week of history on top of one scrape is retrained rather than updated
+    assert cache._find_base(frozenset(range(126)), PARAMS) is None
+    assert cache._find_base(frozenset(range(1, 101)), PARAMS) is None
+
+
+def test_models_are_reused_and_updated(monkeypatch):
+    pytest.importorskip("gensim")
+    monkeypatch.setattr(topics, "preprocess_articles",
+                        lambda articles: [article.lower().split() for article in articles])
+    cache = TopicModelCache()
+    options = dict(num_topics=2, passes=2, workers=1)
+
+    model, run = cache.get_model(ARTICLES, **options)
+    assert run["cached"] is False and run["backend"] == "LdaModel"
+    same, run = cache.get_model(list(reversed(ARTICLES)), **options)
+    assert same is model and run["cached"] is True
+
+    # One more article in known words: the model is updated, not retrained, and the base stays cached
+    updated, run = cache.get_model(ARTICLES + ["Senate budget debate on typhoon"], **options)
+    assert updated is not model and run["backend"] == "LdaModel update" and run["passes"] == 1
+    assert cache.get_model(ARTICLES, **options)[0] is model
+
+    # New words the dictionary has never seen need a retrain
+    _, run = cache.get_model(ARTICLES + ["Quarterfinal penalty shootout thriller"], **options)
+    assert run["backend"] == "LdaModel"
+
+
+def test_concurrent_requests_share_one_build(monkeypatch):
+    pytest.importorskip("gensim")
+    monkeypatch.setattr(topics, "preprocess_articles",
+                        lambda articles: [article.lower().split() for article in articles])
+    started, release = threading.Event(), threading.Event()
+    trained = []
+
+    def train_lda(corpus, dictionary, *args):
+        trained.append(len(corpus))
+        started.set()
+        release.wait(5)
+        return object(), {"backend": "LdaModel", "passes": 1}
+
+    monkeypatch.setattr(topics, "train_lda", train_lda)
+    cache = TopicModelCache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_model(ARTICLES, workers=1)))
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+    # The lock is free while a model trains: a different set of articles starts its own build
+    other = threading.Thread(target=cache.get_model, args=(ARTICLES[:4],), kwargs={"workers": 1})
+    other.start()
+    for _ in range(100):
+        if len(trained) == 2:
+            break
+        threading.Event().wait(0.01)
+    assert sorted(trained) == [4, 8]
+    release.set()
+    for thread in threads + [other]:
+        thread.join(5)
+    assert sorted(trained) == [4, 8]  # The three requests for ARTICLES trained once
+    assert len({id(model) for model, _ in results}) == 1
+    assert sorted(run.get("cached", False) for _, run in results) == [False, True, True]
+
+
+def test_small_corpora_train_in_process():
+    pytest.importorskip("gensim")
+    from gensim.corpora.dictionary import Dictionary
+    texts = [article.lower().split() for article in ARTICLES]
+    dictionary = Dictionary(texts)
+    corpus = [dictionary.doc2bow(text) for text in texts]
+
+    _, run = topics.train_lda(corpus, dictionary, num_topics=2, passes=3, workers=4, convergence_tol=-1)
+    assert run["backend"] == "LdaModel" and run["workers"] == 1 and run["passes"] == 3 and run["early_stop"]
+
+    passes = []
+    _, run = topics.train_lda(corpus, dictionary, num_topics=2, passes=3, workers=2, multicore_min_docs=1,
+                              progress=lambda done, total: passes.append(done))
+    # All passes run in one LdaMulticore call, so its worker pool starts once
+    assert run["backend"] == "LdaMulticore" and run["workers"] == 2 and run["passes"] == 3
+    assert passes == []
+    # It cannot stop early, which the run and its description say
+    assert not run["early_stop"] and "all 3 passes" in topics.describe_topic_run(run)
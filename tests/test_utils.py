@@ -0,0 +1,50 @@
+import os
+import numpy as np
+import pytest
+from utils import atomic_path, atomic_write, content_hash
+
+
+def test_content_hash_ignores_surrounding_whitespace():
+    assert content_hash(" Fire downtown\n") == content_hash("Fire downtown")
+    assert len(content_hash("Fire downtown")) == 32
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = tmp_path / "entry.json"
+    path.write_text("old", encoding="utf-8")
+    with atomic_write(str(path)) as file:
+        file.write("new")
+        assert path.read_text(encoding="utf-8") == "old"  # Not visible until the block ends
+    assert path.read_text(encoding="utf-8") == "new"
+    assert os.listdir(tmp_path) == ["entry.json"]
+
+
+def test_atomic_write_keeps_the_old_file_on_error(tmp_path):
+    path = tmp_path / "entry.json"
+    path.write_text("old", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as file:
+            file.write("half")
+            raise RuntimeError("crashed mid-write")
+    assert path.read_text(encoding="utf-8") == "old"
+    assert os.listdir(tmp_path) == ["entry.json"]
+
+
+def test_atomic_write_binary(tmp_path):
+    path = tmp_path / "index.npz"
+    with atomic_write(str(path), "wb") as file:
+        np.savez(file, matrix=np.eye(2))
+    with np.load(str(path)) as cached:
+        assert np.array_equal(cached["matrix"], np.eye(2))
+
+
+def test_atomic_path_keeps_the_old_file_on_error(tmp_path):
+    path = tmp_path / "news.csv.gz"
+    path.write_text("old", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with atomic_path(str(path)) as tmp:
+            with open(tmp, "w", encoding="utf-8") as file:
+                file.write("half")
+            raise RuntimeError("crashed mid-write")
+    assert path.read_text(encoding="utf-8") == "old"
+    assert os.listdir(tmp_path) == ["news.csv.gz"]
@@ -0,0 +1,308 @@
+import copy
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from embeddings import normalize_rows
+from models import get_nlp
+from preprocessing import preprocess_articles
+from settings import (
+    CACHE_DIR, LDA_NUM_TOPICS, LDA_PASSES, LDA_WORKERS, LDA_CONVERGENCE_TOL, LDA_PERPLEXITY_SAMPLE,
+    LDA_MULTICORE_MIN_DOCS
+)
+from utils import atomic_write, content_hash
+
+TOPIC_LABELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "topic_labels.json")
+INDEX_CACHE_DIR = os.path.join(CACHE_DIR, "topic_index")
+
+
+class TopicLabelIndex:
+    """Label centroid vectors for topic_labels.json, computed once and cached on disk.
+
+    The cache file is keyed by the hash of topic_labels.json and the spaCy model,
+    so editing the labels or switching models rebuilds it automatically.
+    """
+
+    def __init__(self, labels_path=TOPIC_LABELS_PATH, cache_dir=INDEX_CACHE_DIR):
+        self.labels_path = labels_path
+        self.cache_dir = cache_dir
+        self.labels = None
+        self.matrix = None  # (num_labels, dim) unit-length centroids
+        self._lock = threading.Lock()
+
+    def _cache_path(self, labels_bytes, nlp):
+        digest = hashlib.sha256(labels_bytes)
+        digest.update(f"{nlp.meta.get('name')}-{nlp.meta.get('version')}".encode("utf-8"))
+        return os.path.join(self.cache_dir, f"labels-{digest.hexdigest()[:16]}.npz")
+
+    def load(self):
+        """Load the centroids from the disk cache, computing them on the first run."""
+        if self.matrix is not None:
+            return
+        with self._lock:
+            if self.matrix is not None:
+                return
+            nlp = get_nlp()
+            with open(self.labels_path, "rb") as file:
+                labels_bytes = file.read()
+            cache_path = self._cache_path(labels_bytes, nlp)
+
+            if os.path.exists(cache_path):
+                with np.load(cache_path) as cached:
+                    self.labels = [str(label) for label in cached["labels"]]
+                    self.matrix = cached["matrix"]
+                return
+
+            topic_labels = json.loads(labels_bytes)
+            labels = list(topic_labels)
+            # A Doc vector is the mean of its token vectors, same as the old label_doc.similarity
+            docs = nlp.pipe(" ".join(topic_labels[label]) for label in labels)
+            matrix = normalize_rows(np.array([doc.vector for doc in docs], dtype=np.float32))
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with atomic_write(cache_path, "wb") as file:
+                np.savez(file, labels=np.array(labels), matrix=matrix)
+            self.labels, self.matrix = labels, matrix
+
+    def keyword_matrix(self, keywords):
+        """Unit-length keyword vectors looked up straight from the vocab, without running the pipeline."""
+        vocab = get_nlp().vocab
+        vectors = []
+        for keyword in keywords:
+            words = keyword.split() or [keyword]
+            vectors.append(np.mean([vocab[word].vector for word in words], axis=0))
+        return normalize_rows(np.array(vectors, dtype=np.float32))
+
+    def categorize(self, keywords, default="Miscellaneous"):
+        """Return the label most similar to any of the keywords, scored as one matrix product."""
+        if not keywords:
+            return default
+        self.load()
+        similarities = self.keyword_matrix(keywords) @ self.matrix.T  # (num_keywords, num_labels)
+        _, label_index = np.unravel_index(np.argmax(similarities), similarities.shape)
+        if similarities.max() <= 0:
+            return default
+        return self.labels[label_index]
+
+    def categorize_many(self, keyword_lists, default="Miscellaneous"):
+        """Label many texts at once from the mean vector of each one's keywords."""
+        if not keyword_lists:
+            return []
+        self.load()
+        dim = self.matrix.shape[1]
+        means = np.zeros((len(keyword_lists), dim), dtype=np.float32)
+        for row, keywords in enumerate(keyword_lists):
+            if keywords:
+                means[row] = self.keyword_matrix(keywords).mean(axis=0)
+        similarities = normalize_rows(means) @ self.matrix.T  # (num_texts, num_labels)
+        best = similarities.argmax(axis=1)
+        return [self.labels[index] if similarities[row, index] > 0 else default
+                for row, index in enumerate(best)]
+
+
+label_index = TopicLabelIndex()
+
+
+def categorize_topic_dynamic(keywords):
+    """Categorize a topic using semantic similarity with spaCy."""
+    return label_index.categorize(keywords)
+
+
+def perplexity_sample(corpus, size=LDA_PERPLEXITY_SAMPLE, seed=42):
+    """A fixed random sample of at most size documents for the convergence check."""
+    if len(corpus) <= size:
+        return corpus
+    return random.Random(seed).sample(corpus, size)
+
+
+def train_lda(corpus, dictionary, num_topics=LDA_NUM_TOPICS, passes=LDA_PASSES,
+              workers=LDA_WORKERS, convergence_tol=LDA_CONVERGENCE_TOL, progress=None,
+              sample_size=LDA_PERPLEXITY_SAMPLE, multicore_min_docs=LDA_MULTICORE_MIN_DOCS):
+    """Train an LDA model and return (model, run).
+
+    Corpora of at least multicore_min_docs documents train with LdaMulticore (when
+    workers > 1) in a single call for all passes, so the worker pool is started once;
+    that backend always runs every pass and ignores convergence_tol. Smaller corpora
+    train in-process with LdaModel one pass at a time, stopping early once perplexity
+    improves by less than convergence_tol. Perplexity is measured on a fixed sample of
+    sample_size documents, since log_perplexity is single-threaded and over the full
+    corpus costs about as much as a training pass. run records the backend, workers,
+    passes actually run, whether early stopping applied, wall time and final (sample)
+    perplexity. progress(passes_run, passes) is called after every pass run on its own.
+    """
+    from gensim.models import LdaModel, LdaMulticore
+
+    start = time.perf_counter()
+    sample = perplexity_sample(corpus, sample_size)
+    if workers > 1 and len(corpus) >= multicore_min_docs:
+        backend = "LdaMulticore"
+        model = LdaMulticore(corpus, num_topics=num_topics, id2word=dictionary, passes=passes, workers=workers)
+        passes_run = passes
+        # log_perplexity returns the per-word likelihood bound; perplexity is 2 ** -bound
+        perplexity = 2 ** -model.log_perplexity(sample)
+    else:
+        backend = "LdaModel"
+        workers = 1
+        model = LdaModel(corpus, num_topics=num_topics, id2word=dictionary, passes=1)
+        perplexity = 2 ** -model.log_perplexity(sample)
+        passes_run = 1
+        while passes_run < passes:
+            if progress:
+                progress(passes_run, passes)
+            model.update(corpus)  # One more pass; the model was built with passes=1
+            passes_run += 1
+            new_perplexity = 2 ** -model.log_perplexity(sample)
+            improvement = (perplexity - new_perplexity) / perplexity
+            perplexity = new_perplexity
+            if improvement < convergence_tol:
+                break
+
+    run = {
+        "backend": backend,
+        "workers": workers,
+        "passes": passes_run,
+        "early_stop": backend == "LdaModel",
+        "seconds": time.perf_counter() - start,
+        "perplexity": perplexity,
+    }
+    return model, run
+
+
+class TopicModelCache:
+    """Trained LDA models keyed by the set of articles and the training parameters.
+
+    Asking again for the same articles returns the cached model. Asking for a slightly
+    larger superset of a cached set (the same source after a new scrape) updates a copy
+    of that model with only the new articles via LdaModel.update instead of retraining.
+    A much larger set (e.g. a week of history after the current scrape) is retrained,
+    as is one whose new words mostly fall outside the model's vocabulary, since update
+    cannot learn words its dictionary has never seen.
+    """
+
+    def __init__(self, max_models=8, max_unknown_fraction=0.5, max_new_fraction=0.25):
+        self.max_models = max_models
+        self.max_unknown_fraction = max_unknown_fraction
+        self.max_new_fraction = max_new_fraction  # New articles allowed, relative to the base model's
+        self._entries = OrderedDict()  # key -> {"model", "dictionary", "hashes", "params", "run"}
+        self._building = {}  # key -> Event set when the thread building that model finishes
+        self._lock = threading.Lock()
+
+    def _key(self, hashes, params):
+        digest = hashlib.sha256("\n".join(sorted(hashes)).encode("utf-8"))
+        digest.update(repr(params).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _find_base(self, hashes, params):
+        """Largest cached model with the same parameters trained on a subset of these articles
+        that leaves at most max_new_fraction of its size to add."""
+        best = None
+        for key, entry in self._entries.items():
+            new_count = len(hashes) - len(entry["hashes"])
+            if (entry["params"] == params and new_count <= self.max_new_fraction * len(entry["hashes"])
+                    and entry["hashes"] <= hashes):
+                if best is None or len(entry["hashes"]) > len(self._entries[best]["hashes"]):
+                    best = key
+        return best
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_models:
+            self._entries.popitem(last=False)
+
+    def get_model(self, articles, num_topics=LDA_NUM_TOPICS, passes=LDA_PASSES,
+                  workers=LDA_WORKERS, convergence_tol=LDA_CONVERGENCE_TOL, progress=None):
+        """Return (model, run) for the articles, reusing or updating a cached model when possible.
+
+        run describes how the model was last trained, with "cached" set when it was reused as is.
+        progress is passed on to train_lda when a model has to be trained. The lock is only
+        held to look up and store models; a request for articles whose model is already being
+        built waits for that build instead of starting another.
+        """
+        params = (num_topics, passes, convergence_tol)
+        hashes = frozenset(content_hash(article) for article in articles)
+        key = self._key(hashes, params)
+
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    entry = self._entries[key]
+                    return entry["model"], dict(entry["run"], cached=True)
+                building = self._building.get(key)
+                if building is None:
+                    building = self._building[key] = threading.Event()
+                    base_key = self._find_base(hashes, params)
+                    base = self._entries[base_key] if base_key is not None else None
+                    break
+            # Another thread is building this model: use it once stored, or build it here if that failed
+            building.wait()
+
+        try:
+            entry = self._build(articles, hashes, params, base, workers, progress)
+            with self._lock:
+                self._store(key, entry)
+            return entry["model"], entry["run"]
+        finally:
+            with self._lock:
+                del self._building[key]
+            building.set()
+
+    def _build(self, articles, hashes, params, base, workers, progress):
+        """Update a copy of base (if the new articles suit it) or train a new model; returns the cache entry."""
+        from gensim.corpora.dictionary import Dictionary
+
+        if base is not None:
+            new_articles = [article for article in articles if content_hash(article) not in base["hashes"]]
+            new_texts = preprocess_articles(new_articles)
+            total_tokens = sum(len(text) for text in new_texts)
+            known_tokens = sum(1 for text in new_texts for word in text if word in base["dictionary"].token2id)
+            if not total_tokens or known_tokens / total_tokens >= 1 - self.max_unknown_fraction:
+                model = base["model"]
+                run = dict(base["run"], cached=False, passes=0, seconds=0.0)
+                if total_tokens:
+                    start = time.perf_counter()
+                    # Update a copy so the base model stays cached for its own articles
+                    model = copy.deepcopy(model)
+                    new_corpus = [base["dictionary"].doc2bow(text) for text in new_texts]
+                    model.update(new_corpus)
+                    run.update(backend=f"{base['run']['backend']} update", passes=1,
+                               seconds=time.perf_counter() - start,
+                               perplexity=2 ** -model.log_perplexity(new_corpus))
+                return dict(base, model=model, hashes=hashes, run=run)
+
+        num_topics, passes, convergence_tol = params
+        processed_articles = preprocess_articles(articles)
+        dictionary = Dictionary(processed_articles)
+        corpus = [dictionary.doc2bow(text) for text in processed_articles]
+        model, run = train_lda(corpus, dictionary, num_topics, passes, workers, convergence_tol, progress)
+        run["cached"] = False
+        return {"model": model, "dictionary": dictionary, "hashes": hashes, "params": params, "run": run}
+
+
+topic_model_cache = TopicModelCache()
+
+
+def label_topics(lda_model, num_topics=LDA_NUM_TOPICS, num_words=5):
+    """Return (label, weight sum, keywords) for the model's top topics."""
+    topics = lda_model.show_topics(num_topics=num_topics, num_words=num_words, formatted=False)
+    labeled_topics = []
+    for idx, topic in topics:
+        keywords = [word for word, _ in topic]
+        label = categorize_topic_dynamic(keywords)
+        weight_sum = sum(weight for _, weight in topic)
+        labeled_topics.append((label, weight_sum, keywords))
+    return labeled_topics
+
+
+def describe_topic_run(run):
+    """One-line summary of how a topic model was trained, for display."""
+    if run.get("cached"):
+        return f"Cached model ({run['backend']}, perplexity {run['perplexity']:.1f})"
+    passes = f"{run['passes']} passes" if run.get("early_stop", True) else f"all {run['passes']} passes"
+    return (f"{run['backend']} with {run['workers']} workers: {passes} in "
+            f"{run['seconds']:.2f}s, perplexity {run['perplexity']:.1f}")
@@ -0,0 +1,92 @@
+"""Trend analytics over the scrape history, read from the article store's rollups.
+
+Headline counts are added to the hourly and daily rollups as scrapes are recorded;
+annotate_pending adds the sentiment and topic of each new headline once. Trends are
+then built from the pre-aggregated counters alone, so a 90-day chart reads a few
+thousand rows however many headlines were scraped.
+"""
+from collections import namedtuple
+import time
+import numpy as np
+from store import bucket_start, next_bucket
+
+TREND_TOP_TOPICS = 6  # Topics charted separately; the rest are summed as "Other"
+
+# buckets: bucket start times; volume: {source: headlines per bucket};
+# positive_share: {source: share of scored headlines that are positive, NaN without any}, "All Sources" included;
+# topic_share: {source: {topic: share of the bucket's annotated headlines}}, "All Sources" included
+Trends = namedtuple("Trends", ["granularity", "buckets", "volume", "positive_share", "topic_share"])
+
+
+def annotate_pending(store, batch_size=500, progress=None, is_cancelled=None):
+    """Score the sentiment and topic of headlines not counted in the rollups yet; return how many were.
+
+    After a scrape only its new headlines are pending. progress(done, total) is called per batch;
+    once is_cancelled() returns True the rest are left pending for the next call.
+    """
+    from preprocessing import preprocessor
+    from sentiment import sentiment_service
+    from topics import label_index
+
+    total = store.count_unannotated()
+    done = 0
+    while not (is_cancelled and is_cancelled()):
+        rows = store.unannotated(batch_size)
+        if not rows:
+            return done
+        headlines = [headline for _, _, headline, _ in rows]
+        sentiments = sentiment_service.analyze_many(headlines)
+        keyword_lists = [preprocessor.words(processed.content_ids)
+                         for processed in preprocessor.process_many(headlines)]
+        topic_labels = label_index.categorize_many(keyword_lists)
+        store.record_annotations([
+            (article_id, source, first_seen, sentiments[headline], topic)
+            for (article_id, source, headline, first_seen), topic in zip(rows, topic_labels)
+        ])
+        done += len(rows)
+        if progress:
+            progress(done, max(total, done))
+    return done
+
+
+def load_trends(store, days=90, granularity="day", sources=None, now=None, top_topics=TREND_TOP_TOPICS):
+    """Return Trends for the last days, one point per hour or day, from the rollups alone."""
+    now = time.time() if now is None else now
+    first = bucket_start(now - days * 86400, granularity)
+    buckets = [first]
+    while buckets[-1] < bucket_start(now, granularity):
+        buckets.append(next_bucket(buckets[-1], granularity))
+    position = {bucket: index for index, bucket in enumerate(buckets)}
+
+    def series():
+        return np.zeros(len(buckets))
+
+    volume, positive, scored, topics = {}, {}, {}, {}
+    for bucket, source, metric, count in store.rollups(granularity, start=first, sources=sources):
+        index = position.get(bucket)
+        if index is None:
+            continue
+        if metric == "headlines":
+            volume.setdefault(source, series())[index] += count
+        elif metric.startswith("sentiment:"):
+            for key in (source, "All Sources"):
+                scored.setdefault(key, series())[index] += count
+                if metric == "sentiment:positive":
+                    positive.setdefault(key, series())[index] += count
+        elif metric.startswith("topic:"):
+            for key in (source, "All Sources"):
+                topics.setdefault(key, {}).setdefault(metric[len("topic:"):], series())[index] += count
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        positive_share = {source: positive.get(source, series()) / counts for source, counts in scored.items()}
+
+        topic_share = {}
+        for source, source_topics in topics.items():
+            ranked = sorted(source_topics, key=lambda topic: source_topics[topic].sum(), reverse=True)
+            topic_counts = {topic: source_topics[topic] for topic in ranked[:top_topics]}
+            if len(ranked) > top_topics:
+                topic_counts["Other"] = sum(source_topics[topic] for topic in ranked[top_topics:])
+            annotated = sum(topic_counts.values(), series())
+            topic_share[source] = {topic: np.nan_to_num(counts / annotated) for topic, counts in topic_counts.items()}
+
+    return Trends(granularity, buckets, volume, positive_share, topic_share)
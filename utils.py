@@ -0,0 +1,39 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+
+
+def content_hash(text):
+    """Stable hash of a headline, used as the key of every persistent cache."""
+    return hashlib.blake2b(text.strip().encode("utf-8"), digest_size=16).hexdigest()
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a temporary path to write instead of path; it replaces path only once the block succeeds.
+
+    For writers that open the file themselves (gzip, pyarrow). If the block raises, the
+    temporary file is removed and path is left as it was.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def atomic_write(path, mode="w", encoding="utf-8", newline=None):
+    """Write path through a temporary file that replaces it only once the block succeeds.
+
+    Readers in any process see the old file or the new one, never a half-written one.
+    """
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, mode, encoding=None if "b" in mode else encoding, newline=newline) as file:
+            yield file